@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+SQLORM Benchmark: asyncio API
+=============================
+
+Compares ``Model.aio`` against wrapping the sync ORM in asgiref's
+``sync_to_async`` for many concurrent ``get(pk)`` calls.
+
+A local SQLite file answers in microseconds, so each query is delayed by
+``latency`` milliseconds to stand in for a network round trip to a database
+server. The delay releases the GIL like a socket read does.
+
+Run with: python benchmarks/bench_aio.py [requests] [latency_ms]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def add_latency(seconds):
+    from django.db.backends.signals import connection_created
+
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        connection.execute_wrappers.append(wrapper)
+
+    connection_created.connect(install, weak=False)
+
+
+async def run_case(name, get_one, pks, concurrency=64):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(pk):
+        async with semaphore:
+            return await get_one(pk)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(pk) for pk in pks))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<38}{elapsed:>10.3f}s{len(pks) / elapsed:>14,.0f}/s")
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.002
+
+    from asgiref.sync import sync_to_async
+
+    from sqlorm import Model, aio, configure, create_tables, fields
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": os.path.join(tmpdir, "bench.sqlite3"),
+            },
+            sqlite_profile="fast-wal",
+        )
+
+        class Item(Model):
+            name = fields.CharField(max_length=50)
+            value = fields.IntegerField()
+
+        create_tables(verbosity=0)
+        Item.objects.bulk_create(
+            [Item(name=f"item {i}", value=i) for i in range(10_000)], batch_size=1000
+        )
+        add_latency(latency)
+        pks = random.Random(0).choices(
+            list(Item.objects.values_list("pk", flat=True)), k=requests
+        )
+
+        def get_sync(pk):
+            return Item.objects.get(pk=pk)
+
+        sensitive = sync_to_async(get_sync)
+        insensitive = sync_to_async(get_sync, thread_sensitive=False)
+
+        async def bench():
+            print(f"{requests:,} concurrent get(pk), {latency * 1000:g} ms per query\n")
+            await run_case("sync_to_async (thread_sensitive)", sensitive, pks)
+            await run_case("sync_to_async (thread_sensitive=False)", insensitive, pks)
+            for workers in (4, 16):
+                aio.shutdown()
+                aio.set_workers(workers)
+                await run_case(
+                    f"Model.aio ({workers} workers)",
+                    lambda pk: Item.aio.get(pk=pk),
+                    pks,
+                )
+
+        asyncio.run(bench())
+        aio.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+SQLORM Benchmark: cold start
+============================
+
+Time from process launch to the first query completing, with the default
+``configure()`` and with ``configure(minimal=True)``. Each run is a fresh
+interpreter that configures SQLORM, defines a model, creates its table and
+runs one query.
+
+Run with: python benchmarks/bench_cold_start.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CHILD = """
+import sys
+from sqlorm import Model, configure, create_tables, fields
+
+configure(
+    {"ENGINE": "django.db.backends.sqlite3", "NAME": sys.argv[1]},
+    minimal=sys.argv[2] == "minimal",
+)
+
+class Job(Model):
+    name = fields.CharField(max_length=50)
+
+create_tables(verbosity=0)
+Job.objects.filter(name="x").exists()
+"""
+
+MODES = ("default", "minimal")
+
+
+def launch(mode, db_path):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", CHILD, db_path, mode], check=True)
+    return time.perf_counter() - start
+
+
+def launch_python():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Interpreter alone, as a floor
+        baseline = [launch_python() for _ in range(max(runs // 3, 3))]
+        timings = {mode: [] for mode in MODES}
+        for i in range(runs):
+            # Alternate modes so disk and CPU noise hits both alike
+            for mode in MODES:
+                db_path = os.path.join(tmpdir, f"{mode}-{i}.sqlite3")
+                timings[mode].append(launch(mode, db_path))
+
+    print(f"Process launch to first query ({runs} runs, median)\n")
+    print(f"{'python -c pass':<16}{statistics.median(baseline) * 1000:>10.1f} ms")
+    for mode, values in timings.items():
+        print(f"{mode:<16}{statistics.median(values) * 1000:>10.1f} ms")
+    default, minimal = (statistics.median(timings[m]) for m in MODES)
+    print(f"\nminimal saves {(default - minimal) * 1000:.1f} ms per start")
+
+
+if __name__ == "__main__":
+    main()
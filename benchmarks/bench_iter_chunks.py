@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+SQLORM Benchmark: keyset vs offset pagination
+=============================================
+
+Time to fetch one page of ``size`` rows at increasing depths of a table,
+with ``qs[offset:offset + size]`` and with ``Model.iter_chunks()``'s keyset
+query (``WHERE key > last ORDER BY key LIMIT size``), for the primary key and
+for a composite ``(created_at, pk)`` key. Then a full walk of the table both
+ways.
+
+Run with: python benchmarks/bench_iter_chunks.py [rows] [size]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlorm import Model, configure, create_tables, fields
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+SIZE = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+configure({"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"})
+
+
+class Event(Model):
+    kind = fields.CharField(max_length=20)
+    created_at = fields.DateTimeField(db_index=True)
+    payload = fields.TextField()
+
+
+def best(func, repeat=3):
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed
+
+
+def main():
+    from sqlorm.queryset import _after, _key_columns
+
+    create_tables(verbosity=0)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    batch = 50_000
+    for offset in range(0, ROWS, batch):
+        Event.objects.bulk_create(
+            Event(
+                kind=f"k{i % 7}",
+                created_at=start + timedelta(seconds=i // 3),
+                payload="x" * 40,
+            )
+            for i in range(offset, min(offset + batch, ROWS))
+        )
+
+    qs = Event.objects.values_list("id", "kind", "created_at")
+    by_pk = qs.order_by("pk")
+    composite = _key_columns(Event, ["created_at"])
+    by_time = qs.order_by("created_at", "pk")
+
+    print(f"One page of {SIZE:,} rows ({ROWS:,} row table), ms\n")
+    print(f"{'depth':>10} {'offset':>10} {'keyset pk':>10} {'keyset (t,pk)':>14}")
+    for depth in (0, ROWS // 10, ROWS // 2, ROWS - SIZE):
+        depth = max(depth, 0)
+        pk_last = depth  # ids are 1..ROWS
+        row = Event.objects.order_by("created_at", "pk").values_list(
+            "created_at", "pk"
+        )[depth]
+        offset = best(lambda: list(by_pk[depth : depth + SIZE]))
+        keyset = best(lambda: list(by_pk.filter(pk__gt=pk_last)[:SIZE]))
+        keyset_composite = best(
+            lambda: list(by_time.filter(_after(composite, row))[:SIZE])
+        )
+        print(
+            f"{depth:>10,} {offset * 1000:>10.1f} {keyset * 1000:>10.1f} "
+            f"{keyset_composite * 1000:>14.1f}"
+        )
+
+    def walk_offset():
+        for offset in range(0, ROWS, SIZE):
+            list(by_pk[offset : offset + SIZE])
+
+    def walk_keyset():
+        for _ in Event.iter_chunks(qs, size=SIZE):
+            pass
+
+    print("\nFull walk, s")
+    print(f"{'offset':<10} {best(walk_offset, 1):>8.2f}")
+    print(f"{'keyset':<10} {best(walk_keyset, 1):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
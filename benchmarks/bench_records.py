@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+SQLORM Benchmark: records vs model instances
+============================================
+
+Memory held per row and time to iterate a table, reading it as model
+instances (``list(qs)``, ``qs.iterator()``), ``values()`` dicts,
+``values_list()`` tuples and ``Model.records()``. Memory is what the
+materialized list keeps alive, measured with ``tracemalloc``; the overhead
+column leaves out the column values, which all approaches share.
+
+Run with: python benchmarks/bench_records.py [rows]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from sqlorm import Model, configure, create_tables, fields
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+configure({"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"})
+
+
+class Order(Model):
+    customer = fields.CharField(max_length=50)
+    status = fields.CharField(
+        max_length=10, choices=[("new", "New"), ("paid", "Paid"), ("sent", "Sent")]
+    )
+    quantity = fields.IntegerField()
+    total = fields.FloatField()
+    created_at = fields.DateTimeField()
+
+
+def best(func, repeat=3):
+    elapsed = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed
+
+
+def retained(func):
+    """Bytes still allocated by the list ``func`` returns."""
+    gc.collect()
+    tracemalloc.start()
+    rows = func()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return size
+
+
+def main():
+    create_tables(verbosity=0)
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    Order.objects.bulk_create(
+        Order(
+            customer=f"customer-{i % 1000}",
+            status=("new", "paid", "sent")[i % 3],
+            quantity=i % 10,
+            total=i * 1.5,
+            created_at=created,
+        )
+        for i in range(ROWS)
+    )
+    qs = Order.objects.order_by("pk")
+
+    def each(rows):
+        for row in rows:
+            row.quantity
+
+    cases = [
+        ("instances", lambda: list(qs.all()), lambda: each(qs.all())),
+        ("iterator()", None, lambda: each(qs.iterator(chunk_size=2000))),
+        (
+            "values()",
+            lambda: list(qs.values()),
+            lambda: [row["quantity"] for row in qs.values().iterator(2000)],
+        ),
+        (
+            "values_list()",
+            lambda: list(qs.values_list()),
+            lambda: [row[3] for row in qs.values_list().iterator(2000)],
+        ),
+        ("records()", lambda: list(Order.records(qs)), lambda: each(Order.records(qs))),
+    ]
+
+    # The column values themselves are the same objects whichever way rows
+    # are read; what differs is the container around them
+    bare_row = retained(lambda: list(qs.values_list())) / ROWS
+    values = bare_row - sys.getsizeof(next(iter(qs.values_list()))) - 8
+
+    print(f"{ROWS:,} rows, 6 columns; row values take ~{values:.0f} bytes\n")
+    print(f"{'read as':<15} {'bytes/row':>10} {'overhead':>9} {'iterate, s':>11}")
+    results = {}
+    for name, materialize, iterate in cases:
+        per_row = retained(materialize) / ROWS if materialize else None
+        seconds = best(iterate)
+        results[name] = (per_row, seconds)
+        if per_row is None:
+            print(f"{name:<15} {'-':>10} {'-':>9} {seconds:>11.3f}")
+        else:
+            overhead = per_row - values
+            print(f"{name:<15} {per_row:>10.0f} {overhead:>9.0f} {seconds:>11.3f}")
+
+    instance_bytes, instance_time = results["instances"]
+    record_bytes, record_time = results["records()"]
+    print(
+        f"\nrecords() vs instances: {instance_bytes / record_bytes:.1f}x less memory "
+        f"({(instance_bytes - values) / (record_bytes - values):.1f}x less "
+        f"overhead), {instance_time / record_time:.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    main()
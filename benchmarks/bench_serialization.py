@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+SQLORM Benchmark: to_dict() / to_json()
+=======================================
+
+Compares the precompiled serializer plan used by ``Model.to_dict()`` with the
+previous implementation, which introspected ``_meta.get_fields()`` for every
+instance.
+
+At 50,000 rows the plan is about 1.2x faster end to end. Most of what is
+left is ``datetime.isoformat()`` for the three date/time columns, which both
+versions pay; the plan cuts the per-row overhead around it by about a third.
+
+Run with: python benchmarks/bench_serialization.py [rows]
+"""
+
+import gc
+import json
+import sys
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+
+from sqlorm import Model, configure, create_tables, fields
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+configure({"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"})
+
+
+class Task(Model):
+    title = fields.CharField(max_length=200)
+    description = fields.TextField(blank=True, default="")
+    is_completed = fields.BooleanField(default=False)
+    priority = fields.IntegerField(default=2)
+    due_date = fields.DateTimeField(null=True, blank=True)
+    created_at = fields.DateTimeField(auto_now_add=True)
+    updated_at = fields.DateTimeField(auto_now=True)
+
+
+def legacy_to_dict(self, fields=None, exclude=None):
+    """The per-instance introspecting to_dict() shipped before 3.1."""
+    exclude = exclude or []
+    result = {}
+    for field in self._meta.get_fields():
+        if not hasattr(field, "attname"):
+            continue
+        if fields and field.name not in fields:
+            continue
+        if field.name in exclude:
+            continue
+        value = getattr(self, field.name, None)
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        result[field.name] = value
+    return result
+
+
+def timed(label, func, rows, repeat=3):
+    """Best-of-``repeat`` wall time with the GC paused, like ``timeit``."""
+    elapsed = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(rows)
+            elapsed = min(elapsed, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    print(f"{label:<28} {elapsed:8.3f}s  {len(rows) / elapsed:>12,.0f} rows/s")
+    return elapsed
+
+
+def main():
+    create_tables(verbosity=0)
+    now = timezone.now()
+    Task.objects.bulk_create(
+        Task(title=f"Task {i}", priority=i % 3 + 1, due_date=now + timedelta(i))
+        for i in range(ROWS)
+    )
+    rows = list(Task.objects.all())
+    assert legacy_to_dict(rows[0]) == rows[0].to_dict()
+
+    print(f"Serializing {ROWS:,} rows\n")
+    legacy = timed("to_dict (legacy)", lambda r: [legacy_to_dict(t) for t in r], rows)
+    plan = timed("to_dict (plan)", lambda r: [t.to_dict() for t in r], rows)
+    timed(
+        "to_dict exclude (legacy)",
+        lambda r: [legacy_to_dict(t, exclude=["description"]) for t in r],
+        rows,
+    )
+    timed(
+        "to_dict exclude (plan)",
+        lambda r: [t.to_dict(exclude=["description"]) for t in r],
+        rows,
+    )
+    timed(
+        "to_json (legacy)",
+        lambda r: [json.dumps(legacy_to_dict(t), default=str) for t in r],
+        rows,
+    )
+    timed("to_json (plan)", lambda r: [t.to_json() for t in r], rows)
+
+    print(f"\nto_dict speedup: {legacy / plan:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+SQLORM Benchmark: snapshot lookups
+==================================
+
+Random key lookups against a lookup table, through ``objects.get()``, a
+``values()`` query, and a memory-mapped ``Snapshot``; plus the time to open
+the snapshot and the bytes it maps.
+
+Run with: python benchmarks/bench_snapshot.py [rows] [lookups]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlorm import Model, configure, create_tables, fields
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+LOOKUPS = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+
+tmpdir = tempfile.mkdtemp()
+configure(
+    {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(tmpdir, "bench.sqlite3"),
+    }
+)
+
+
+class Sku(Model):
+    code = fields.CharField(max_length=20, unique=True)
+    name = fields.CharField(max_length=100)
+    price = fields.DecimalField(max_digits=10, decimal_places=2)
+    weight = fields.FloatField()
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    from sqlorm.snapshot import Snapshot, build_snapshot
+
+    create_tables(verbosity=0)
+    Sku.objects.bulk_create(
+        Sku(code=f"SKU-{i:08d}", name=f"Item {i}", price=i % 500, weight=i * 0.01)
+        for i in range(ROWS)
+    )
+    codes = [f"SKU-{random.randrange(ROWS):08d}" for _ in range(LOOKUPS)]
+    path = os.path.join(tmpdir, "sku.snapshot")
+    result = build_snapshot(Sku, "code", path)
+    print(
+        f"{ROWS:,} rows, {LOOKUPS:,} random lookups; snapshot "
+        f"{os.path.getsize(path) / 1e6:.1f} MB built in {result.seconds:.2f}s\n"
+    )
+
+    values = Sku.objects.values()
+    opened = []
+    results = [
+        ("objects.get()", timed(lambda: [Sku.objects.get(code=c) for c in codes])),
+        ("values().get()", timed(lambda: [values.get(code=c) for c in codes])),
+        ("Snapshot.open()", timed(lambda: opened.append(Snapshot.open(path)))),
+    ]
+    snapshot = opened[0]
+    results.append(("Snapshot.get()", timed(lambda: [snapshot.get(c) for c in codes])))
+
+    print(f"{'':<18} {'total, s':>9} {'per lookup, us':>15}")
+    for name, seconds in results:
+        per = "" if name == "Snapshot.open()" else f"{seconds / LOOKUPS * 1e6:>15.1f}"
+        print(f"{name:<18} {seconds:>9.4f} {per}")
+    snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+SQLORM Benchmark: in-memory SQLite mirror
+=========================================
+
+Runtime of a read/modify/write batch job against a SQLite file, with the
+default settings, the "fast-wal" profile, and ``sqlite_in_memory_mirror``
+(including its load at start-up and final flush). The job loads a table,
+then updates rows one autocommit ``save()`` at a time, reading each first,
+and finishes with an aggregate. Every mode runs in a fresh process against
+its own copy of the same seeded file.
+
+Run with: python benchmarks/bench_sqlite_mirror.py [rows] [updates]
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {
+    "file (default)": {},
+    "file (fast-wal)": {"sqlite_profile": "fast-wal"},
+    "in-memory mirror": {"sqlite_in_memory_mirror": {"flush_interval": 5}},
+}
+
+
+def define_models():
+    from sqlorm import Model, fields
+
+    class Account(Model):
+        owner = fields.CharField(max_length=50)
+        balance = fields.IntegerField()
+        updates = fields.IntegerField(default=0)
+
+    return Account
+
+
+def seed(db_path, rows):
+    from sqlorm import configure, create_tables
+
+    configure({"ENGINE": "django.db.backends.sqlite3", "NAME": db_path})
+    Account = define_models()
+    create_tables(verbosity=0)
+    Account.objects.bulk_create(
+        (Account(owner=f"owner {i}", balance=i % 1000) for i in range(rows)),
+        batch_size=1000,
+    )
+
+
+def run_job(mode, db_path, rows, updates):
+    """Child process: the whole job, from configure() to the final flush."""
+    started = time.perf_counter()
+    from sqlorm import configure, flush
+
+    configure({"ENGINE": "django.db.backends.sqlite3", "NAME": db_path}, **MODES[mode])
+    from django.db.models import Sum
+
+    Account = define_models()
+    for i in range(updates):
+        account = Account.objects.get(pk=(i * 7919) % rows + 1)
+        account.balance += 10
+        account.updates += 1
+        account.save(update_fields=["balance", "updates"])
+    total = Account.objects.aggregate(total=Sum("balance"))["total"]
+    if "sqlite_in_memory_mirror" in MODES[mode]:
+        flush()
+    return {"seconds": time.perf_counter() - started, "total": total}
+
+
+def child(*args):
+    return subprocess.run(
+        [sys.executable, __file__, *map(str, args)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--seed":
+        seed(sys.argv[2], int(sys.argv[3]))
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        mode, db_path, rows, updates = sys.argv[2:6]
+        print(json.dumps(run_job(mode, db_path, int(rows), int(updates))))
+        return
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    updates = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    with tempfile.TemporaryDirectory() as tmpdir:
+        seeded = os.path.join(tmpdir, "seed.sqlite3")
+        child("--seed", seeded, rows)
+        print(f"{rows:,} rows, {updates:,} read/modify/write updates\n")
+        print(f"{'mode':<20} {'job, s':>8} {'updates/s':>10}")
+        totals = set()
+        for number, mode in enumerate(MODES):
+            db_path = os.path.join(tmpdir, f"job-{number}.sqlite3")
+            shutil.copy(seeded, db_path)
+            output = child("--child", mode, db_path, rows, updates)
+            result = json.loads(output.strip().splitlines()[-1])
+            totals.add(result["total"])
+            print(
+                f"{mode:<20} {result['seconds']:>8.2f} "
+                f"{updates / result['seconds']:>10,.0f}"
+            )
+        assert len(totals) == 1, "modes disagree on the result"
+
+
+if __name__ == "__main__":
+    main()
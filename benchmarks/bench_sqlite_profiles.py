@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+SQLORM Benchmark: SQLite profiles
+=================================
+
+Compares insert and read throughput for each ``sqlite_profile``. Every
+profile runs in a fresh process against a fresh database file.
+
+Run with: python benchmarks/bench_sqlite_profiles.py [rows]
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+PROFILES = [None, "safe", "fast-wal", "bulk-load", "read-only-analytics"]
+
+
+def run_profile(profile, db_path, rows):
+    """Child process: time inserts and reads under one profile."""
+    from sqlorm import Model, configure, create_tables, fields
+
+    read_only = profile == "read-only-analytics"
+    if read_only:
+        # Seed with the default profile; the analytics profile rejects writes
+        configure({"ENGINE": "django.db.backends.sqlite3", "NAME": db_path})
+    else:
+        configure(
+            {"ENGINE": "django.db.backends.sqlite3", "NAME": db_path},
+            sqlite_profile=profile,
+        )
+
+    class Item(Model):
+        name = fields.CharField(max_length=50)
+        value = fields.IntegerField()
+
+    create_tables(verbosity=0)
+    results = {}
+
+    # Autocommit inserts pay one sync per row, which is what profiles change
+    single = max(rows // 20, 1)
+    start = time.perf_counter()
+    for i in range(single):
+        Item.objects.create(name=f"item {i}", value=i)
+    results["insert (autocommit)"] = single / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    Item.objects.bulk_create(
+        (Item(name=f"item {i}", value=i) for i in range(rows)), batch_size=1000
+    )
+    results["bulk_create"] = rows / (time.perf_counter() - start)
+
+    if read_only:
+        from django.db import connection
+
+        from sqlorm.sqlite import resolve_pragmas, set_pragmas
+
+        set_pragmas("default", resolve_pragmas(profile))
+        connection.close()
+        for name in ("insert (autocommit)", "bulk_create"):
+            results[name] = None
+
+    total = Item.objects.count()
+    pks = list(Item.objects.values_list("pk", flat=True))
+    sample = random.Random(0).sample(pks, min(len(pks), rows // 10))
+    start = time.perf_counter()
+    for pk in sample:
+        Item.objects.get(pk=pk)
+    results["get(pk)"] = len(sample) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(5):
+        sum(1 for _ in Item.objects.values_list("name", "value").iterator())
+    results["full scan"] = 5 * total / (time.perf_counter() - start)
+    return results
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        profile = None if sys.argv[2] == "default" else sys.argv[2]
+        print(json.dumps(run_profile(profile, sys.argv[3], int(sys.argv[4]))))
+        return
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    table = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for profile in PROFILES:
+            name = profile or "default"
+            db_path = os.path.join(tmpdir, f"{name}.sqlite3")
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", name, db_path, str(rows)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            table[name] = json.loads(output.strip().splitlines()[-1])
+
+    cases = list(next(iter(table.values())))
+    print(f"Rows per second ({rows:,} rows)\n")
+    print(f"{'profile':<22}" + "".join(f"{case:>22}" for case in cases))
+    for name, results in table.items():
+        cells = (
+            f"{results[case]:>22,.0f}" if results[case] else f"{'n/a':>22}"
+            for case in cases
+        )
+        print(f"{name:<22}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+SQLORM Benchmark: test isolation
+================================
+
+Wall-clock time of a generated pytest suite written two ways:
+
+- "clean_env": the style of tests/test_sqlorm.py, where every test drops the
+  cached sqlorm/django modules, calls ``configure()``, defines its models and
+  runs ``create_tables()``
+- "sqlorm.testing": the plugin, which configures and creates the schema once
+  per session and rolls every test back
+
+Each test creates a few rows and queries them. Both suites run in a fresh
+pytest process; the timings include interpreter and pytest start-up.
+
+Run with: python benchmarks/bench_test_isolation.py [tests]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODELS = """
+    from sqlorm import Model, fields
+
+    class Author(Model):
+        name = fields.CharField(max_length=50)
+
+    class Book(Model):
+        title = fields.CharField(max_length=100)
+        author = fields.ForeignKey(Author, on_delete=fields.CASCADE)
+"""
+
+BODY = """
+    author = Author.objects.create(name="a")
+    Book.objects.bulk_create(Book(title=str(i), author=author) for i in range(20))
+    assert Book.objects.filter(author__name="a").count() == 20
+"""
+
+SUITES = {
+    "clean_env": {
+        "conftest.py": """
+            import sys
+
+            import pytest
+
+            @pytest.fixture(autouse=True)
+            def clean_env():
+                prefixes = ("sqlorm", "django")
+                for mod in [m for m in sys.modules if m.startswith(prefixes)]:
+                    del sys.modules[mod]
+                yield
+        """,
+        "test_suite.py": """
+            import pytest
+
+            @pytest.mark.parametrize("n", range({tests}))
+            def test_case(n):
+                from sqlorm import configure, create_tables
+                configure(
+                    {{"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
+                )
+{models}
+                create_tables(verbosity=0)
+{body}
+        """,
+    },
+    "sqlorm.testing": {
+        "pytest.ini": """
+            [pytest]
+            sqlorm_models = bench_models
+        """,
+        "conftest.py": """
+            pytest_plugins = ["sqlorm.testing"]
+        """,
+        "bench_models.py": MODELS,
+        "test_suite.py": """
+            import pytest
+
+            from bench_models import Author, Book
+
+            @pytest.mark.parametrize("n", range({tests}))
+            def test_case(sqlorm_db, n):
+{body}
+        """,
+    },
+}
+
+
+def write_suite(directory, files, tests):
+    models = textwrap.indent(textwrap.dedent(MODELS), " " * 16)
+    body = textwrap.indent(textwrap.dedent(BODY), " " * 16)
+    for name, content in files.items():
+        if name == "test_suite.py":
+            content = content.format(tests=tests, models=models, body=body)
+        with open(os.path.join(directory, name), "w") as f:
+            f.write(textwrap.dedent(content))
+
+
+def run_suite(directory):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider"],
+        cwd=directory,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join([REPO, directory])},
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise SystemExit(result.stdout + result.stderr)
+    return elapsed
+
+
+def main():
+    tests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{tests} tests\n")
+    print(f"{'suite':<16} {'total, s':>9} {'per test, ms':>13}")
+    for name, files in SUITES.items():
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_suite(tmpdir, files, tests)
+            seconds = run_suite(tmpdir)
+        print(f"{name:<16} {seconds:>9.2f} {seconds / tests * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+SQLORM Benchmark: upsert
+========================
+
+Insert-or-update ``rows`` records keyed on a natural key, half of which
+already exist, with:
+
+- ``update_or_create()`` in a loop (the pattern ``upsert_many()`` replaces)
+- ``bulk_create(update_conflicts=True)`` (no inserted/updated counts)
+- ``Model.upsert_many()`` from dicts and from tuples
+
+Each run starts from the same table in a fresh SQLite file.
+
+Run with: python benchmarks/bench_upsert.py [rows]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from django.db import connection
+
+from sqlorm import Model, configure, create_tables, fields
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+TMPDIR = tempfile.mkdtemp()
+DB_PATH = os.path.join(TMPDIR, "bench.sqlite3")
+SEED_PATH = os.path.join(TMPDIR, "seed.sqlite3")
+
+configure({"ENGINE": "django.db.backends.sqlite3", "NAME": DB_PATH})
+
+
+class Product(Model):
+    sku = fields.CharField(max_length=20, unique=True)
+    name = fields.CharField(max_length=100)
+    price = fields.IntegerField()
+    updated_at = fields.DateTimeField(auto_now=True)
+
+
+def incoming():
+    # Odd SKUs exist already; even ones are new
+    return [
+        {"sku": f"SKU{i:08d}", "name": f"Product {i}", "price": i % 997}
+        for i in range(ROWS)
+    ]
+
+
+def loop(rows):
+    for row in rows:
+        Product.objects.update_or_create(
+            sku=row["sku"], defaults={"name": row["name"], "price": row["price"]}
+        )
+
+
+def bulk_create(rows):
+    Product.objects.bulk_create(
+        [Product(**row) for row in rows],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["sku"],
+        update_fields=["name", "price", "updated_at"],
+    )
+
+
+def upsert_dicts(rows):
+    return Product.upsert_many(rows, unique_fields=["sku"])
+
+
+def upsert_tuples(rows):
+    return Product.upsert_many(
+        [(row["sku"], row["name"], row["price"]) for row in rows],
+        unique_fields=["sku"],
+        fields=["sku", "name", "price"],
+    )
+
+
+def run(label, func, rows):
+    connection.close()
+    shutil.copy(SEED_PATH, DB_PATH)
+    start = time.perf_counter()
+    result = func(rows)
+    elapsed = time.perf_counter() - start
+    assert Product.objects.count() == ROWS
+    counts = (
+        f"  ({result.inserted:,} inserted, {result.updated:,} updated)"
+        if result is not None
+        else ""
+    )
+    print(f"{label:<34} {elapsed:8.3f}s {ROWS / elapsed:>12,.0f} rows/s{counts}")
+    return elapsed
+
+
+def main():
+    create_tables(verbosity=0)
+    Product.objects.bulk_create(
+        Product(sku=f"SKU{i:08d}", name="old", price=0) for i in range(1, ROWS, 2)
+    )
+    connection.close()
+    shutil.copy(DB_PATH, SEED_PATH)
+
+    rows = incoming()
+    print(f"Upserting {ROWS:,} rows, {ROWS // 2:,} of them existing\n")
+    baseline = run("update_or_create() loop", loop, rows)
+    for label, func in (
+        ("bulk_create(update_conflicts=True)", bulk_create),
+        ("upsert_many() dicts", upsert_dicts),
+        ("upsert_many() tuples", upsert_tuples),
+    ):
+        elapsed = run(label, func, rows)
+        print(f"{'':<34} {baseline / elapsed:7.1f}x faster than the loop")
+    shutil.rmtree(TMPDIR)
+
+
+if __name__ == "__main__":
+    main()
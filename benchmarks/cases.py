@@ -0,0 +1,540 @@
+"""
+SQLORM Benchmark Suite: cases
+=============================
+
+Each case times one hot path twice: through SQLORM (``sqlorm``) and with
+the standard library's ``sqlite3`` module doing the equivalent work
+(``sqlite3``), for reference. ``benchmarks/run.py`` runs every side of every
+case in a fresh interpreter, so one-off costs (imports, ``configure()``,
+model creation) are measured cold.
+
+A side is a function of ``(rows, tmpdir)`` that returns
+``(seconds, operations)`` for the timed section only; setup runs before the
+clock starts. Cases without an ``sqlite3`` equivalent register ``None``.
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+CASES = {}
+
+TABLES = 10
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+RAW_DDL = (
+    'CREATE TABLE "{table}" ('
+    '"id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, '
+    '"title" varchar(200) NOT NULL, '
+    '"body" text NOT NULL, '
+    '"done" bool NOT NULL, '
+    '"priority" integer NOT NULL, '
+    '"due" datetime NULL, '
+    '"created" datetime NOT NULL)'
+)
+RAW_COLUMNS = ("title", "body", "done", "priority", "due", "created")
+RAW_INSERT = 'INSERT INTO "bench" ({}) VALUES ({})'.format(
+    ", ".join(f'"{c}"' for c in RAW_COLUMNS), ", ".join("?" * len(RAW_COLUMNS))
+)
+
+
+def register(name, description, sqlorm_side, sqlite3_side=None):
+    CASES[name] = {
+        "description": description,
+        "sqlorm": sqlorm_side,
+        "sqlite3": sqlite3_side,
+    }
+
+
+def _db(tmpdir):
+    return os.path.join(tmpdir, "bench.sqlite3")
+
+
+def _configure(tmpdir, **options):
+    from sqlorm import configure
+
+    configure({"ENGINE": "django.db.backends.sqlite3", "NAME": _db(tmpdir)}, **options)
+
+
+def _model(name="Bench"):
+    from sqlorm import Model, fields
+
+    attrs = {
+        "__module__": __name__,
+        "title": fields.CharField(max_length=200),
+        "body": fields.TextField(),
+        "done": fields.BooleanField(default=False),
+        "priority": fields.IntegerField(default=2),
+        "due": fields.DateTimeField(null=True),
+        "created": fields.DateTimeField(),
+    }
+    return type(Model)(name, (Model,), attrs)
+
+
+def _row(i):
+    return {
+        "title": f"Item {i}",
+        "body": "lorem ipsum " * 8,
+        "done": i % 3 == 0,
+        "priority": i % 3 + 1,
+        "due": START + timedelta(days=i % 365) if i % 2 else None,
+        "created": START + timedelta(seconds=i),
+    }
+
+
+def _raw_row(i):
+    row = _row(i)
+    return (
+        row["title"],
+        row["body"],
+        row["done"],
+        row["priority"],
+        row["due"].isoformat(" ") if row["due"] else None,
+        row["created"].isoformat(" "),
+    )
+
+
+def _seeded(tmpdir, rows):
+    """Configure, create the bench table and fill it; returns the model."""
+    from sqlorm import create_tables
+
+    _configure(tmpdir)
+    model = _model()
+    create_tables(verbosity=0)
+    model.objects.bulk_create(model(**_row(i)) for i in range(rows))
+    return model
+
+
+def _raw_seeded(tmpdir, rows):
+    db = sqlite3.connect(_db(tmpdir), isolation_level=None)
+    db.execute(RAW_DDL.format(table="bench"))
+    db.execute("BEGIN")
+    db.executemany(RAW_INSERT, (_raw_row(i) for i in range(rows)))
+    db.execute("COMMIT")
+    return db
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+# import ----------------------------------------------------------------------
+
+
+def _cold_import(statement):
+    # This module has imported sqlite3 already, so time it in a clean process
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return float(output), 1
+
+
+def import_sqlorm(rows, tmpdir):
+    return _cold_import("from sqlorm import Model, configure, fields")
+
+
+def import_sqlite3(rows, tmpdir):
+    return _cold_import("import sqlite3")
+
+
+register(
+    "import",
+    "from sqlorm import configure, Model, fields",
+    import_sqlorm,
+    import_sqlite3,
+)
+
+
+# configure -------------------------------------------------------------------
+
+
+def configure_sqlorm(rows, tmpdir):
+    import sqlorm  # noqa: F401
+
+    def run():
+        from django.db import connection
+
+        _configure(tmpdir)
+        connection.ensure_connection()
+
+    return _timed(run)[0], 1
+
+
+def configure_sqlite3(rows, tmpdir):
+    def run():
+        sqlite3.connect(_db(tmpdir)).execute("SELECT 1").fetchone()
+
+    return _timed(run)[0], 1
+
+
+register(
+    "configure",
+    "configure() and open the first connection",
+    configure_sqlorm,
+    configure_sqlite3,
+)
+
+
+# model classes ---------------------------------------------------------------
+
+
+def model_class_sqlorm(rows, tmpdir):
+    _configure(tmpdir)
+    elapsed, _ = _timed(lambda: [_model(f"Bench{i}") for i in range(TABLES)])
+    return elapsed, TABLES
+
+
+register("model_class", f"define {TABLES} models through ModelMeta", model_class_sqlorm)
+
+
+# create_tables ---------------------------------------------------------------
+
+
+def create_tables_sqlorm(rows, tmpdir):
+    from sqlorm import create_tables
+
+    _configure(tmpdir)
+    for i in range(TABLES):
+        _model(f"Bench{i}")
+    elapsed, _ = _timed(lambda: create_tables(verbosity=0))
+    return elapsed, TABLES
+
+
+def create_tables_sqlite3(rows, tmpdir):
+    db = sqlite3.connect(_db(tmpdir), isolation_level=None)
+
+    def run():
+        for i in range(TABLES):
+            db.execute(RAW_DDL.format(table=f"bench{i}"))
+
+    return _timed(run)[0], TABLES
+
+
+register(
+    "create_tables",
+    f"create_tables() for {TABLES} models",
+    create_tables_sqlorm,
+    create_tables_sqlite3,
+)
+
+
+# single-row CRUD -------------------------------------------------------------
+
+
+def create_sqlorm(rows, tmpdir):
+    from django.db import transaction
+
+    model = _seeded(tmpdir, 0)
+    data = [_row(i) for i in range(rows)]
+
+    def run():
+        with transaction.atomic():
+            for row in data:
+                model.objects.create(**row)
+
+    return _timed(run)[0], rows
+
+
+def create_sqlite3(rows, tmpdir):
+    db = _raw_seeded(tmpdir, 0)
+    data = [_row(i) for i in range(rows)]
+
+    def run():
+        db.execute("BEGIN")
+        for row in data:
+            # Same per-row work as the ORM: convert, then insert
+            db.execute(
+                RAW_INSERT,
+                (
+                    row["title"],
+                    row["body"],
+                    row["done"],
+                    row["priority"],
+                    row["due"].isoformat(" ") if row["due"] else None,
+                    row["created"].isoformat(" "),
+                ),
+            )
+        db.execute("COMMIT")
+
+    return _timed(run)[0], rows
+
+
+register(
+    "create",
+    "objects.create() per row, in one transaction",
+    create_sqlorm,
+    create_sqlite3,
+)
+
+
+def get_sqlorm(rows, tmpdir):
+    model = _seeded(tmpdir, rows)
+
+    def run():
+        for pk in range(1, rows + 1):
+            model.objects.get(pk=pk)
+
+    return _timed(run)[0], rows
+
+
+def get_sqlite3(rows, tmpdir):
+    db = _raw_seeded(tmpdir, rows)
+    sql = 'SELECT * FROM "bench" WHERE "id" = ? LIMIT 21'
+
+    def run():
+        for pk in range(1, rows + 1):
+            db.execute(sql, (pk,)).fetchall()
+
+    return _timed(run)[0], rows
+
+
+register("get", "objects.get(pk=...) per row", get_sqlorm, get_sqlite3)
+
+
+def save_sqlorm(rows, tmpdir):
+    from django.db import transaction
+
+    model = _seeded(tmpdir, rows)
+    objs = list(model.objects.all())
+
+    def run():
+        with transaction.atomic():
+            for obj in objs:
+                obj.priority = 3
+                obj.save()
+
+    return _timed(run)[0], rows
+
+
+def save_sqlite3(rows, tmpdir):
+    db = _raw_seeded(tmpdir, rows)
+    sql = (
+        'UPDATE "bench" SET "title" = ?, "body" = ?, "done" = ?, "priority" = ?, '
+        '"due" = ?, "created" = ? WHERE "id" = ?'
+    )
+    data = db.execute(f'SELECT {", ".join(RAW_COLUMNS)}, id FROM "bench"').fetchall()
+
+    def run():
+        db.execute("BEGIN")
+        for row in data:
+            db.execute(sql, row[:3] + (3,) + row[4:])
+        db.execute("COMMIT")
+
+    return _timed(run)[0], rows
+
+
+register(
+    "save", "instance.save() per row, in one transaction", save_sqlorm, save_sqlite3
+)
+
+
+def delete_sqlorm(rows, tmpdir):
+    from django.db import transaction
+
+    model = _seeded(tmpdir, rows)
+    objs = list(model.objects.all())
+
+    def run():
+        with transaction.atomic():
+            for obj in objs:
+                obj.delete()
+
+    return _timed(run)[0], rows
+
+
+def delete_sqlite3(rows, tmpdir):
+    db = _raw_seeded(tmpdir, rows)
+
+    def run():
+        db.execute("BEGIN")
+        for pk in range(1, rows + 1):
+            db.execute('DELETE FROM "bench" WHERE "id" IN (?)', (pk,))
+        db.execute("COMMIT")
+
+    return _timed(run)[0], rows
+
+
+register(
+    "delete",
+    "instance.delete() per row, in one transaction",
+    delete_sqlorm,
+    delete_sqlite3,
+)
+
+
+# bulk CRUD -------------------------------------------------------------------
+
+
+def bulk_create_sqlorm(rows, tmpdir):
+    model = _seeded(tmpdir, 0)
+    data = [_row(i) for i in range(rows)]
+    elapsed, _ = _timed(lambda: model.objects.bulk_create(model(**r) for r in data))
+    return elapsed, rows
+
+
+def bulk_create_sqlite3(rows, tmpdir):
+    db = _raw_seeded(tmpdir, 0)
+
+    def run():
+        db.execute("BEGIN")
+        db.executemany(RAW_INSERT, (_raw_row(i) for i in range(rows)))
+        db.execute("COMMIT")
+
+    return _timed(run)[0], rows
+
+
+register(
+    "bulk_create",
+    "objects.bulk_create() of N rows",
+    bulk_create_sqlorm,
+    bulk_create_sqlite3,
+)
+
+
+def read_all_sqlorm(rows, tmpdir):
+    model = _seeded(tmpdir, rows)
+    return _timed(lambda: list(model.objects.all()))[0], rows
+
+
+def read_all_sqlite3(rows, tmpdir):
+    db = _raw_seeded(tmpdir, rows)
+    return _timed(lambda: db.execute('SELECT * FROM "bench"').fetchall())[0], rows
+
+
+register("read_all", "list(objects.all()) of N rows", read_all_sqlorm, read_all_sqlite3)
+
+
+def bulk_update_sqlorm(rows, tmpdir):
+    model = _seeded(tmpdir, rows)
+    return _timed(lambda: model.objects.filter(done=False).update(done=True))[0], rows
+
+
+def bulk_update_sqlite3(rows, tmpdir):
+    db = _raw_seeded(tmpdir, rows)
+    sql = 'UPDATE "bench" SET "done" = 1 WHERE NOT "done"'
+    return _timed(lambda: db.execute(sql))[0], rows
+
+
+register(
+    "bulk_update",
+    "objects.filter().update() over N rows",
+    bulk_update_sqlorm,
+    bulk_update_sqlite3,
+)
+
+
+def bulk_delete_sqlorm(rows, tmpdir):
+    model = _seeded(tmpdir, rows)
+    return _timed(lambda: model.objects.all().delete())[0], rows
+
+
+def bulk_delete_sqlite3(rows, tmpdir):
+    db = _raw_seeded(tmpdir, rows)
+    return _timed(lambda: db.execute('DELETE FROM "bench"'))[0], rows
+
+
+register(
+    "bulk_delete",
+    "objects.all().delete() of N rows",
+    bulk_delete_sqlorm,
+    bulk_delete_sqlite3,
+)
+
+
+# serialization ---------------------------------------------------------------
+
+
+def _raw_dicts(db):
+    cursor = db.execute('SELECT * FROM "bench"')
+    names = [d[0] for d in cursor.description]
+    return names, cursor.fetchall()
+
+
+def to_dict_sqlorm(rows, tmpdir):
+    model = _seeded(tmpdir, rows)
+    objs = list(model.objects.all())
+    return _timed(lambda: [obj.to_dict() for obj in objs])[0], rows
+
+
+def to_dict_sqlite3(rows, tmpdir):
+    names, data = _raw_dicts(_raw_seeded(tmpdir, rows))
+    return _timed(lambda: [dict(zip(names, row)) for row in data])[0], rows
+
+
+register("to_dict", "instance.to_dict() over N rows", to_dict_sqlorm, to_dict_sqlite3)
+
+
+def to_json_sqlorm(rows, tmpdir):
+    model = _seeded(tmpdir, rows)
+    objs = list(model.objects.all())
+    return _timed(lambda: [obj.to_json() for obj in objs])[0], rows
+
+
+def to_json_sqlite3(rows, tmpdir):
+    names, data = _raw_dicts(_raw_seeded(tmpdir, rows))
+    dumps = json.dumps
+    return _timed(lambda: [dumps(dict(zip(names, row))) for row in data])[0], rows
+
+
+register("to_json", "instance.to_json() over N rows", to_json_sqlorm, to_json_sqlite3)
+
+
+# migrations ------------------------------------------------------------------
+
+
+def migrate_noop_sqlorm(rows, tmpdir):
+    from django.core.management import call_command
+
+    _configure(tmpdir, migrations_dir=os.path.join(tmpdir, "migrations"))
+    _model()
+    call_command("makemigrations", "sqlorm_app", verbosity=0)
+    call_command("migrate", verbosity=0)
+    return _timed(lambda: call_command("migrate", verbosity=0))[0], 1
+
+
+def migrate_noop_sqlite3(rows, tmpdir):
+    db = sqlite3.connect(_db(tmpdir), isolation_level=None)
+    db.execute(
+        "CREATE TABLE django_migrations (id integer PRIMARY KEY, app varchar(255), "
+        "name varchar(255), applied datetime)"
+    )
+    db.execute("INSERT INTO django_migrations VALUES (1, 'sqlorm_app', '0001', '')")
+    sql = "SELECT app, name FROM django_migrations"
+    return _timed(lambda: db.execute(sql).fetchall())[0], 1
+
+
+register(
+    "migrate_noop",
+    "migrate with nothing to apply",
+    migrate_noop_sqlorm,
+    migrate_noop_sqlite3,
+)
+
+
+def ensure_schema_noop_sqlorm(rows, tmpdir):
+    from sqlorm import ensure_schema
+
+    _configure(tmpdir, migrations_dir=os.path.join(tmpdir, "migrations"))
+    _model()
+    ensure_schema()
+    return _timed(ensure_schema)[0], 1
+
+
+register(
+    "ensure_schema_noop",
+    "ensure_schema() with unchanged models",
+    ensure_schema_noop_sqlorm,
+    migrate_noop_sqlite3,
+)
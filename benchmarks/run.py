@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+SQLORM Benchmark Suite
+======================
+
+Times SQLORM's hot paths, each next to the equivalent raw ``sqlite3`` work
+(see ``benchmarks/cases.py``). Every side of every case runs ``--repeat``
+times, each time in a fresh interpreter with a fresh SQLite file, entirely
+offline.
+
+Run with:
+    python benchmarks/run.py                          # all cases, print a table
+    python benchmarks/run.py -o results.json          # also save the results
+    python benchmarks/run.py --baseline results.json  # compare with a saved run
+    python benchmarks/run.py -k create,get,to_json --rows 2000
+
+With ``--baseline``, cases whose SQLORM median got slower by more than
+``--threshold`` are flagged and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+SIDES = ("sqlorm", "sqlite3")
+
+
+def run_child(case: str, side: str, rows: int) -> dict:
+    """Run one side of a case in this file's ``--child`` mode."""
+    # Children (and the interpreters they start) import this checkout's
+    # sqlorm, whether or not it is installed
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (ROOT, os.environ.get("PYTHONPATH")) if path
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", case, side, str(rows), tmpdir],
+            capture_output=True,
+            text=True,
+            cwd=tmpdir,
+            env=env,
+        )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        sys.exit(f"Case {case!r} ({side}) failed with exit status {result.returncode}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def child(case: str, side: str, rows: int, tmpdir: str) -> None:
+    sys.path.insert(0, HERE)
+    from cases import CASES
+
+    seconds, ops = CASES[case][side](rows, tmpdir)
+    print(json.dumps({"seconds": seconds, "ops": ops}))
+
+
+def summarize(runs: list, ops: int) -> dict:
+    median = statistics.median(runs)
+    return {
+        "median": median,
+        "min": min(runs),
+        "per_op": median / ops if ops else None,
+        "runs": runs,
+    }
+
+
+def environment(rows: int, repeat: int) -> dict:
+    import django
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "rows": rows,
+        "repeat": repeat,
+    }
+
+
+def run_suite(names: list, rows: int, repeat: int) -> dict:
+    sys.path.insert(0, HERE)
+    from cases import CASES
+
+    results = {}
+    for name in names:
+        entry = {"description": CASES[name]["description"]}
+        for side in SIDES:
+            if CASES[name][side] is None:
+                entry[side] = None
+                continue
+            runs, ops = [], 1
+            for _ in range(repeat):
+                result = run_child(name, side, rows)
+                runs.append(result["seconds"])
+                ops = result["ops"]
+            entry[side] = summarize(runs, ops)
+            entry["ops"] = ops
+        results[name] = entry
+        print(f"  {name:<20} {format_row(entry)}", file=sys.stderr)
+    return results
+
+
+def fmt_time(seconds) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.3f}s"
+
+
+def format_row(entry: dict) -> str:
+    ours, raw = entry["sqlorm"], entry["sqlite3"]
+    ratio = f"{ours['median'] / raw['median']:.1f}x" if raw else "-"
+    return (
+        f"{fmt_time(ours['median']):>10} {fmt_time(raw and raw['median']):>10} "
+        f"{ratio:>8} {fmt_time(ours['per_op']):>10}"
+    )
+
+
+def report(results: dict, baseline: dict = None, threshold: float = 0.1) -> list:
+    """Print a results table; returns the names of regressed cases."""
+    header = f"{'case':<20} {'sqlorm':>10} {'sqlite3':>10} {'ratio':>8} {'per op':>10}"
+    if baseline:
+        header += f" {'baseline':>10} {'change':>8}"
+    print(header)
+    print("-" * len(header))
+    regressions = []
+    for name, entry in results.items():
+        line = f"{name:<20} {format_row(entry)}"
+        previous = (baseline or {}).get(name)
+        if previous and previous.get("sqlorm"):
+            before = previous["sqlorm"]["median"]
+            change = entry["sqlorm"]["median"] / before - 1
+            flag = ""
+            if change > threshold:
+                regressions.append(name)
+                flag = "  SLOWER"
+            elif change < -threshold:
+                flag = "  faster"
+            line += f" {fmt_time(before):>10} {change:>+8.0%}{flag}"
+        elif baseline:
+            line += f" {'-':>10} {'new':>8}"
+        print(line)
+    return regressions
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        case, side, rows, tmpdir = sys.argv[2:6]
+        child(case, side, int(rows), tmpdir)
+        return
+
+    sys.path.insert(0, HERE)
+    from cases import CASES
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("-k", help="Comma-separated case names to run")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per case")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per side")
+    parser.add_argument("-o", "--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Slowdown (fraction of the baseline median) reported as a regression",
+    )
+    parser.add_argument("--list", action="store_true", help="List the cases")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, entry in CASES.items():
+            print(f"{name:<20} {entry['description']}")
+        return
+
+    names = list(CASES)
+    if args.k:
+        wanted = [name.strip() for name in args.k.split(",") if name.strip()]
+        unknown = [name for name in wanted if name not in CASES]
+        if unknown:
+            parser.error(f"unknown case(s): {', '.join(unknown)}")
+        names = wanted
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    print(
+        f"Running {len(names)} cases, {args.repeat} runs per side, "
+        f"{args.rows} rows",
+        file=sys.stderr,
+    )
+    results = run_suite(names, args.rows, args.repeat)
+    print(file=sys.stderr)
+    regressions = report(results, baseline, args.threshold)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "environment": environment(args.rows, args.repeat),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nResults written to {args.output}")
+    if regressions:
+        print(f"\nSlower than the baseline: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
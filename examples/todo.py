@@ -9,7 +9,7 @@ around Django's ORM for standalone Python scripts.
 Features covered:
 1. Configuration (Database setup)
 2. Model Definition (Fields, Meta options)
-3. Programmatic Migrations (makemigrations/migrate)
+3. Programmatic Migrations (ensure_schema)
 4. CRUD Operations (Create, Read, Update, Delete)
 5. Advanced Querying (Filtering, Ordering, Q objects)
 """
@@ -92,13 +92,15 @@ def run_demo():
     # --------------------------------------
     # In a real app, you might run these via CLI, but here we do it programmatically
     # to make this script self-contained.
-    from sqlorm.cli import makemigrations, migrate
+    from sqlorm import ensure_schema
 
     print("\n--> Checking schema...")
-    # Create migration files based on Model changes
-    makemigrations(name="auto_update")
-    # Apply migrations to the database
-    migrate()
+    # Create and apply migrations only if the models changed since the last
+    # run; otherwise this returns after comparing a stored fingerprint
+    if ensure_schema(name="auto_update", verbosity=1):
+        print("Schema updated")
+    else:
+        print("Schema unchanged")
 
     # --------------------------------------
     # B. Create (Data Seeding)
@@ -33,16 +33,70 @@ Quick Start:
 __version__ = "3.0.0"
 __author__ = "S.S.B"
 
-from .base import Model, create_tables, get_models
-from .config import configure, configure_from_file, get_migrations_dir, is_configured
-from .exceptions import ConfigurationError, MigrationError, ModelError
-from .fields import fields
+import importlib
+
+# Public names, resolved on first access so that ``import sqlorm`` stays cheap
+# and Django is only imported once it is needed: name -> (module, attribute)
+_LAZY_ATTRS = {
+    # Config
+    "configure": (".config", "configure"),
+    "configure_from_file": (".config", "configure_from_file"),
+    "is_configured": (".config", "is_configured"),
+    "get_migrations_dir": (".config", "get_migrations_dir"),
+    "get_database_roles": (".config", "get_database_roles"),
+    "use_sqlite_profile": (".sqlite", "use_sqlite_profile"),
+    "connection_scope": (".pool", "connection_scope"),
+    "pool_stats": (".pool", "pool_stats"),
+    "flush": (".mirror", "flush"),
+    # Models
+    "Model": (".base", "Model"),
+    "fields": (".fields", "fields"),
+    "create_tables": (".base", "create_tables"),
+    "get_models": (".base", "get_models"),
+    "ensure_schema": (".schema", "ensure_schema"),
+    # Data
+    "bulk_load": (".bulk", "bulk_load"),
+    "run_backfill": (".backfill", "run_backfill"),
+    "RunBackfill": (".backfill", "RunBackfill"),
+    "parallel_map": (".parallel", "parallel_map"),
+    "Snapshot": (".snapshot", "Snapshot"),
+    "build_snapshot": (".snapshot", "build_snapshot"),
+    # Diagnostics
+    "profile": (".profiler", "profile"),
+    "cache_stats": (".cache", "cache_stats"),
+    # Exceptions
+    "ConfigurationError": (".exceptions", "ConfigurationError"),
+    "ModelError": (".exceptions", "ModelError"),
+    "MigrationError": (".exceptions", "MigrationError"),
+    "BulkLoadError": (".exceptions", "BulkLoadError"),
+    "BackfillError": (".exceptions", "BackfillError"),
+    "SnapshotError": (".exceptions", "SnapshotError"),
+    "PoolTimeout": (".exceptions", "PoolTimeout"),
+    # Django
+    "Q": ("django.db.models", "Q"),
+    "F": ("django.db.models", "F"),
+    "Count": ("django.db.models", "Count"),
+    "Sum": ("django.db.models", "Sum"),
+    "Avg": ("django.db.models", "Avg"),
+    "Max": ("django.db.models", "Max"),
+    "Min": ("django.db.models", "Min"),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    # Cache it; later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
-# Re-export Django utilities
-try:
-    from django.db.models import Avg, Count, F, Max, Min, Q, Sum
-except ImportError:
-    pass
 
 __all__ = [
     # Config
@@ -50,15 +104,35 @@ __all__ = [
     "configure_from_file",
     "is_configured",
     "get_migrations_dir",
+    "get_database_roles",
+    "use_sqlite_profile",
+    "connection_scope",
+    "pool_stats",
+    "flush",
     # Models
     "Model",
     "fields",
     "create_tables",
     "get_models",
+    "ensure_schema",
+    # Data
+    "bulk_load",
+    "run_backfill",
+    "RunBackfill",
+    "parallel_map",
+    "Snapshot",
+    "build_snapshot",
+    # Diagnostics
+    "profile",
+    "cache_stats",
     # Exceptions
     "ConfigurationError",
     "ModelError",
     "MigrationError",
+    "BulkLoadError",
+    "BackfillError",
+    "PoolTimeout",
+    "SnapshotError",
     # Django
     "Q",
     "F",
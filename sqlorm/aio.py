@@ -0,0 +1,343 @@
+"""
+SQLORM asyncio API
+==================
+
+Async counterparts of the ORM, run on a bounded thread pool per database
+alias.
+
+Independent queries run in parallel on the alias's worker threads; each
+worker keeps its own connection. Transactions and streams reserve one worker
+for their whole duration, so every query inside them runs on the same
+thread and connection.
+
+Example:
+    >>> from sqlorm import aio
+    >>>
+    >>> task = await Task.aio.get(pk=1)
+    >>> count = await Task.aio.filter(is_completed=False).count()
+    >>> async for task in Task.aio.filter(priority=1).stream():
+    ...     print(task.title)
+    >>> async with aio.atomic():
+    ...     await Task.aio.create(title="A")
+    ...     await Task.aio.filter(title="B").delete()
+    >>> await aio.bulk_create([Task(title="C"), Task(title="D")])
+
+Note that every worker thread opens its own connection, so in-memory SQLite
+databases are not shared between them; use a file database.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import queue
+import threading
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+DEFAULT_WORKERS = 4
+DEFAULT_CHUNK_SIZE = 2000
+
+_workers: Dict[str, int] = {}
+_executors: Dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+_session: ContextVar[Optional["_Session"]] = ContextVar(
+    "sqlorm_aio_session", default=None
+)
+
+
+def set_workers(max_workers: int, using: str = "default") -> None:
+    """
+    Set the number of worker threads (and connections) for a database alias.
+
+    Takes effect the next time the alias's executor is created; call before
+    the first query, or after ``shutdown()``.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    _workers[using] = max_workers
+
+
+def get_executor(using: str = "default") -> concurrent.futures.ThreadPoolExecutor:
+    """Get (or create) the thread pool of a database alias."""
+    executor = _executors.get(using)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(using)
+            if executor is None:
+                executor = _executors[using] = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=_workers.get(using, DEFAULT_WORKERS),
+                    thread_name_prefix=f"sqlorm-aio-{using}",
+                )
+    return executor
+
+
+def _close_thread_connections():
+    from django.db import connections
+
+    connections.close_all()
+
+
+def shutdown(wait: bool = True) -> None:
+    """Close worker connections and stop every executor."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        workers = getattr(executor, "_max_workers", 1)
+        barrier = threading.Barrier(workers, timeout=5)
+
+        def close():
+            # Hold each worker until all have run, so every thread closes once
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                pass
+            _close_thread_connections()
+
+        for _ in range(workers):
+            executor.submit(close)
+        executor.shutdown(wait=wait)
+
+
+class _Session:
+    """One worker thread reserved for an atomic block or a stream."""
+
+    def __init__(self, using: str):
+        self.using = using
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        get_executor(using).submit(self._serve)
+
+    def _serve(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            func, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, func: Callable[[], Any]) -> concurrent.futures.Future:
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._queue.put((func, future))
+        return future
+
+    async def run(self, func: Callable[[], Any]) -> Any:
+        return await asyncio.wrap_future(self.submit(func))
+
+    def close(self):
+        self._queue.put(None)
+
+
+async def run(func: Callable, *args, using: str = "default", **kwargs) -> Any:
+    """
+    Run a blocking ORM call on the alias's worker threads.
+
+    Inside ``atomic()`` or a stream the call runs on the reserved thread.
+
+    Example:
+        >>> await aio.run(task.save)
+    """
+    call = functools.partial(func, *args, **kwargs)
+    session = _session.get()
+    if session is not None:
+        return await session.run(call)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(using), call)
+
+
+class atomic:
+    """
+    Async ``transaction.atomic()``.
+
+    The whole block runs on one reserved worker thread, so every query inside
+    it uses the same connection and transaction. Blocks can be nested.
+    """
+
+    def __init__(self, using: str = "default", savepoint: bool = True):
+        self.using = using
+        self.savepoint = savepoint
+        self._atomic = None
+        self._session = None
+        self._token = None
+
+    async def __aenter__(self):
+        from django.db import transaction
+
+        self._session = _session.get()
+        if self._session is None:
+            self._session = _Session(self.using)
+            self._token = _session.set(self._session)
+        self._atomic = transaction.atomic(using=self.using, savepoint=self.savepoint)
+        try:
+            await self._session.run(self._atomic.__enter__)
+        except BaseException:
+            self._release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            await self._session.run(
+                functools.partial(self._atomic.__exit__, exc_type, exc, tb)
+            )
+        finally:
+            self._release()
+        return False
+
+    def _release(self):
+        if self._token is not None:
+            _session.reset(self._token)
+            self._session.close()
+            self._token = None
+
+
+async def bulk_create(objs: List[Any], batch_size: Optional[int] = None, **kwargs):
+    """Async ``Model.objects.bulk_create()``; the model is taken from ``objs``."""
+    from .routers import write_alias
+
+    objs = list(objs)
+    if not objs:
+        return []
+    model = type(objs[0])
+    return await run(
+        model._default_manager.bulk_create,
+        objs,
+        batch_size=batch_size,
+        using=write_alias(model),
+        **kwargs,
+    )
+
+
+def _chain(method):
+    def wrapper(self, *args, **kwargs):
+        return AsyncQuerySet(getattr(self._queryset, method)(*args, **kwargs))
+
+    wrapper.__name__ = method
+    wrapper.__doc__ = f"Lazy; same as ``QuerySet.{method}()``."
+    return wrapper
+
+
+def _read(method):
+    async def wrapper(self, *args, **kwargs):
+        qs = self._queryset
+        return await run(getattr(qs, method), *args, using=qs.db, **kwargs)
+
+    wrapper.__name__ = method
+    wrapper.__doc__ = f"Async ``QuerySet.{method}()``."
+    return wrapper
+
+
+def _write(method):
+    async def wrapper(self, *args, **kwargs):
+        from .routers import write_alias
+
+        qs = self._queryset
+        using = qs._db or write_alias(qs.model)
+        return await run(getattr(qs, method), *args, using=using, **kwargs)
+
+    wrapper.__name__ = method
+    wrapper.__doc__ = f"Async ``QuerySet.{method}()``."
+    return wrapper
+
+
+class AsyncQuerySet:
+    """Lazy wrapper around a QuerySet whose evaluating methods are awaitable."""
+
+    def __init__(self, queryset):
+        self._queryset = queryset
+
+    @property
+    def queryset(self):
+        """The wrapped synchronous QuerySet."""
+        return self._queryset
+
+    all = _chain("all")
+    filter = _chain("filter")
+    exclude = _chain("exclude")
+    order_by = _chain("order_by")
+    select_related = _chain("select_related")
+    prefetch_related = _chain("prefetch_related")
+    annotate = _chain("annotate")
+    values = _chain("values")
+    values_list = _chain("values_list")
+    only = _chain("only")
+    defer = _chain("defer")
+    distinct = _chain("distinct")
+    using = _chain("using")
+
+    def __getitem__(self, key):
+        return AsyncQuerySet(self._queryset[key])
+
+    get = _read("get")
+    first = _read("first")
+    last = _read("last")
+    count = _read("count")
+    exists = _read("exists")
+    aggregate = _read("aggregate")
+    in_bulk = _read("in_bulk")
+
+    create = _write("create")
+    get_or_create = _write("get_or_create")
+    update_or_create = _write("update_or_create")
+    update = _write("update")
+    delete = _write("delete")
+    bulk_update = _write("bulk_update")
+
+    async def list(self) -> List[Any]:
+        """Evaluate the queryset into a list."""
+        return await run(list, self._queryset, using=self._queryset.db)
+
+    async def stream(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[Any]:
+        """
+        Yield rows as they are read, ``chunk_size`` rows per worker round trip.
+
+        The cursor lives on one reserved worker thread for the whole stream.
+        """
+        session = _session.get()
+        owned = session is None
+        if owned:
+            session = _Session(self._queryset.db)
+        rows = self._queryset.iterator(chunk_size=chunk_size)
+        try:
+            next_chunk = functools.partial(_take, rows, chunk_size)
+            while True:
+                chunk = await session.run(next_chunk)
+                for row in chunk:
+                    yield row
+                if len(chunk) < chunk_size:
+                    break
+        finally:
+            # Close the cursor on the thread that opened it
+            session.submit(functools.partial(_close, rows))
+            if owned:
+                session.close()
+
+    def __aiter__(self):
+        return self.stream().__aiter__()
+
+
+def _take(iterator, n):
+    chunk = []
+    for row in iterator:
+        chunk.append(row)
+        if len(chunk) >= n:
+            break
+    return chunk
+
+
+def _close(iterator):
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        close()
+
+
+class AsyncManager(AsyncQuerySet):
+    """``Model.aio``: async counterpart of ``Model.objects``."""
+
+    def __init__(self, model):
+        super().__init__(model._default_manager.all())
+        self.model = model
@@ -0,0 +1 @@
+"""SQLORM database backends."""
@@ -0,0 +1,32 @@
+"""
+SQLite backend with process-wide connection pooling.
+
+Selected by ``configure(pool={...})`` for file databases. Connections are
+checked out of a ``sqlorm.pool.ConnectionPool`` instead of being opened, and
+returned to it instead of being closed.
+"""
+
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+from sqlorm.pool import get_pool
+
+
+class DatabaseWrapper(SQLiteDatabaseWrapper):
+    def _pool(self, conn_params=None):
+        return get_pool(
+            self.alias,
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+        )
+
+    def get_new_connection(self, conn_params):
+        return self._pool(conn_params).getconn()
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = get_pool(self.alias)
+        if pool is None:
+            # Its pool was closed by configure() being called again
+            self.connection.close()
+        else:
+            pool.putconn(self.connection)
@@ -0,0 +1,290 @@
+"""
+SQLORM Backfills
+================
+
+Update a large table in small, primary-key ordered batches.
+
+A single ``UPDATE`` over millions of rows holds its locks (on SQLite, the
+whole database) until it finishes. A backfill instead walks the table in
+``pk > last ORDER BY pk LIMIT batch_size`` pages and commits each page in its
+own short transaction, optionally sleeping between batches so other writers
+get a turn. After every batch the last primary key is written to a
+checkpoint file, so an interrupted run resumes where it stopped.
+
+Example:
+    >>> from sqlorm.backfill import run_backfill
+    >>> run_backfill(
+    ...     Task,
+    ...     values={"priority": 2},
+    ...     where={"priority__isnull": True},
+    ...     batch_size=1000,
+    ...     sleep=0.05,
+    ...     checkpoint="task-priority.json",
+    ... )
+    <BackfillResult rows=250000 batches=250 ...>
+
+In a migration, use ``RunBackfill`` in a non-atomic migration so each batch
+commits on its own:
+
+    >>> class Migration(migrations.Migration):
+    ...     atomic = False
+    ...     operations = [
+    ...         RunBackfill("task", values={"description": ""}, batch_size=1000),
+    ...     ]
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from django.db.migrations.operations.base import Operation
+
+from .cache import invalidate
+from .exceptions import BackfillError, ConfigurationError
+
+logger = logging.getLogger("sqlorm")
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class BackfillResult:
+    """Outcome of a backfill."""
+
+    def __init__(
+        self,
+        rows: int,
+        batches: int,
+        seconds: float,
+        last_pk: Any,
+        resumed_from: Any = None,
+    ):
+        self.rows = rows
+        self.batches = batches
+        self.seconds = seconds
+        self.last_pk = last_pk
+        self.resumed_from = resumed_from
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def __repr__(self):
+        return (
+            f"<BackfillResult rows={self.rows} batches={self.batches} "
+            f"seconds={self.seconds:.2f} last_pk={self.last_pk!r}>"
+        )
+
+
+def read_checkpoint(path: str, model) -> Optional[Dict[str, Any]]:
+    """
+    The checkpoint stored at ``path`` for a model, or ``None``.
+
+    Raises ``ConfigurationError`` if the file belongs to another model.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("model") != model._meta.label_lower:
+        raise ConfigurationError(
+            f"Checkpoint {path} belongs to {data.get('model')!r}, "
+            f"not {model._meta.label_lower!r}"
+        )
+    data["last_pk"] = model._meta.pk.to_python(data["last_pk"])
+    return data
+
+
+def _write_checkpoint(path: str, model, last_pk: Any, rows: int) -> None:
+    data = {"model": model._meta.label_lower, "last_pk": last_pk, "rows": rows}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, default=str)
+    # Atomic: a crash leaves either the previous or the new checkpoint
+    os.replace(tmp_path, path)
+
+
+def run_backfill(
+    model,
+    values: Optional[Dict[str, Any]] = None,
+    function: Optional[Callable] = None,
+    where: Optional[Dict[str, Any]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sleep: float = 0.0,
+    checkpoint: Optional[str] = None,
+    using: Optional[str] = None,
+    progress=None,
+) -> BackfillResult:
+    """
+    Update a model's rows in primary-key ordered batches.
+
+    Args:
+        model: Model class (SQLORM or a migration's historical model)
+        values: Field values for ``update()``; may hold ``F()`` expressions
+        function: Called with each batch's queryset instead of ``values``,
+            for changes ``update()`` can't express
+        where: Filter selecting the rows to backfill
+        batch_size: Rows per batch (and per transaction)
+        sleep: Seconds to pause after each batch to let other writers in
+        checkpoint: JSON file recording the last committed primary key; an
+            existing checkpoint is resumed and the file is removed once the
+            backfill completes
+        using: Database alias (default: the model's write database)
+        progress: Optional ``sqlorm.export.Progress`` reporter; its ``total``
+            is set to the number of rows left
+
+    Returns a ``BackfillResult``. Raises ``BackfillError`` if a batch fails;
+    earlier batches stay committed and are skipped when run again.
+    """
+    from django.db import router, transaction
+
+    if (values is None) == (function is None):
+        raise ValueError("Pass exactly one of values or function")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    alias = using or router.db_for_write(model)
+    pk = model._meta.pk.attname
+    base = model._base_manager.db_manager(alias).filter(**(where or {}))
+
+    state = read_checkpoint(checkpoint, model)
+    last = resumed_from = state["last_pk"] if state else None
+    if state:
+        logger.info(f"Resuming backfill of {model.__name__} after pk {last!r}")
+
+    def remaining():
+        return base if last is None else base.filter(**{f"{pk}__gt": last})
+
+    if progress is not None:
+        progress.total = remaining().count()
+
+    rows = batches = 0
+    started = time.monotonic()
+    while True:
+        pks = list(remaining().order_by(pk).values_list(pk, flat=True)[:batch_size])
+        if not pks:
+            break
+        batch = remaining().filter(**{f"{pk}__lte": pks[-1]})
+        try:
+            with transaction.atomic(using=alias):
+                if function is not None:
+                    function(batch)
+                    count = len(pks)
+                else:
+                    count = batch.update(**values)
+        except Exception as e:
+            raise BackfillError(
+                f"Backfill of {model.__name__} failed in the batch after pk "
+                f"{last!r}: {e}",
+                last_pk=last,
+            ) from e
+        # Only now are the new values visible to other connections
+        invalidate(model)
+
+        last = pks[-1]
+        rows += count
+        batches += 1
+        if checkpoint:
+            _write_checkpoint(
+                checkpoint, model, last, (state or {}).get("rows", 0) + rows
+            )
+        if progress is not None:
+            progress.update(len(pks))
+        if len(pks) < batch_size:
+            break
+        if sleep:
+            time.sleep(sleep)
+
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    result = BackfillResult(
+        rows, batches, time.monotonic() - started, last, resumed_from
+    )
+    logger.debug(f"Backfilled {model.__name__}: {result}")
+    return result
+
+
+class RunBackfill(Operation):
+    """
+    Migration operation that runs ``run_backfill()`` on a historical model.
+
+    Put it in a migration with ``atomic = False``; inside an atomic migration
+    every batch would share the migration's single transaction. Reversing it
+    is a no-op (the schema operations around it undo the data).
+    """
+
+    reduces_to_sql = False
+    reversible = True
+    atomic = False
+
+    def __init__(
+        self,
+        model_name: str,
+        values: Optional[Dict[str, Any]] = None,
+        function: Optional[Callable] = None,
+        where: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        sleep: float = 0.0,
+        checkpoint: Optional[str] = None,
+    ):
+        if (values is None) == (function is None):
+            raise ValueError("Pass exactly one of values or function")
+        self.model_name = model_name
+        self.values = values
+        self.function = function
+        self.where = where
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self.checkpoint = checkpoint
+
+    def deconstruct(self):
+        kwargs = {"model_name": self.model_name}
+        if self.values is not None:
+            kwargs["values"] = self.values
+        if self.function is not None:
+            kwargs["function"] = self.function
+        if self.where:
+            kwargs["where"] = self.where
+        if self.batch_size != DEFAULT_BATCH_SIZE:
+            kwargs["batch_size"] = self.batch_size
+        if self.sleep:
+            kwargs["sleep"] = self.sleep
+        if self.checkpoint:
+            kwargs["checkpoint"] = self.checkpoint
+        return (self.__class__.__qualname__, [], kwargs)
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        alias = schema_editor.connection.alias
+        if not self.allow_migrate_model(alias, model):
+            return
+        if schema_editor.connection.in_atomic_block:
+            logger.warning(
+                f"RunBackfill on {model.__name__} runs inside the migration's "
+                "transaction; set atomic = False on the Migration to commit "
+                "each batch separately"
+            )
+        run_backfill(
+            model,
+            values=self.values,
+            function=self.function,
+            where=self.where,
+            batch_size=self.batch_size,
+            sleep=self.sleep,
+            checkpoint=self.checkpoint,
+            using=alias,
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        pass
+
+    def describe(self):
+        return f"Backfill {self.model_name} in batches of {self.batch_size}"
+
+    @property
+    def migration_name_fragment(self):
+        return f"backfill_{self.model_name.lower()}"
@@ -13,14 +13,22 @@ Example:
     ...     email = fields.EmailField(unique=True)
 """
 
+import json
 import logging
-from typing import Any, Dict, List, Optional, Type
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Type
 
 from .exceptions import ConfigurationError
+from .serializers import get_plan
 
 logger = logging.getLogger("sqlorm")
 
 _model_registry: Dict[str, Type] = {}
+# Placeholders of models defined before configure(), in definition order
+_deferred_models: List[Type] = []
+# Placeholders being materialized, to break foreign key cycles
+_materializing: set = set()
 
 
 def _ensure_django():
@@ -46,9 +54,145 @@ def _register_model(model_class, name):
         logger.debug(f"Could not register model: {e}")
 
 
+class _DeferredOptions:
+    """
+    Stand-in ``_meta`` of a deferred model.
+
+    Carries just enough for Django's relation fields to accept the
+    placeholder as a target before the model exists.
+    """
+
+    abstract = False
+    swapped = False
+
+    def __init__(self, placeholder, name: str):
+        self._placeholder = placeholder
+        self.app_label = "sqlorm_app"
+        self.object_name = name
+        self.model_name = name.lower()
+        self.label = f"sqlorm_app.{name}"
+        self.label_lower = self.label.lower()
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        if not _ensure_django():
+            if attr == "pk":
+                # Read by ForeignKey() when the target is a model class
+                return None
+            raise AttributeError(attr)
+        return getattr(materialize(self._placeholder)._meta, attr)
+
+
+def materialize(placeholder) -> Type:
+    """
+    Build the Django model of a deferred placeholder (once).
+
+    Models it points to through relation fields are built first, and
+    deferred models it names by string right after it, so every relation
+    of the returned model is resolved.
+    """
+    model = placeholder.__dict__.get("_materialized")
+    if model is not None:
+        return model
+    name, bases, namespace = placeholder.__dict__["_sqlorm_spec"]
+    if not _ensure_django():
+        raise ConfigurationError(
+            f"Model {name} was used before sqlorm.configure() was called"
+        )
+    _materializing.add(placeholder)
+    try:
+        model = ModelMeta(name, bases, dict(namespace))
+    finally:
+        _materializing.discard(placeholder)
+    type.__setattr__(placeholder, "_materialized", model)
+    type.__setattr__(placeholder, "_meta", model._meta)
+    # Drop the class body's fields and methods so lookups reach the model's
+    # descriptors (``Book.author`` is then Django's, not the raw ForeignKey)
+    for attr in namespace:
+        if not attr.startswith("__") and attr in placeholder.__dict__:
+            type.__delattr__(placeholder, attr)
+    if placeholder in _deferred_models:
+        _deferred_models.remove(placeholder)
+    logger.debug(f"Materialized deferred model {name}")
+    # Django resolves a relation given by name only once its target is
+    # registered. Targets being built further up the stack (cycles) are
+    # registered when that finishes.
+    for target in _deferred_string_targets(namespace):
+        if target not in _materializing:
+            materialize(target)
+    return model
+
+
+def _deferred_string_targets(namespace: Dict[str, Any]) -> List[Type]:
+    """Unbuilt placeholders named by string in relation fields of a class body."""
+    targets = []
+    for value in namespace.values():
+        target = getattr(getattr(value, "remote_field", None), "model", None)
+        if not isinstance(target, str):
+            continue
+        app_label, _, model_name = target.rpartition(".")
+        if app_label not in ("", "sqlorm_app"):
+            continue
+        for placeholder in _deferred_models:
+            if placeholder.__name__.lower() == model_name.lower():
+                targets.append(placeholder)
+    return targets
+
+
+def materialize_deferred() -> List[Type]:
+    """
+    Build every model that was defined before ``configure()``, in one batch.
+
+    Returns the new Django models. Does nothing until Django is configured.
+    """
+    if not _deferred_models or not _ensure_django():
+        return []
+    return [materialize(placeholder) for placeholder in list(_deferred_models)]
+
+
+def _resolve_deferred_relations(fields: Dict[str, Any]) -> None:
+    """Point relation fields that target placeholders at the real models."""
+    for field in fields.values():
+        remote = getattr(field, "remote_field", None)
+        target = getattr(remote, "model", None)
+        if target is None or not isinstance(target, ModelMeta):
+            continue
+        if "_sqlorm_spec" not in target.__dict__:
+            continue
+        if target in _materializing:
+            # Cycle: let Django resolve it once the target is registered
+            remote.model = target._meta.label
+        else:
+            remote.model = materialize(target)
+
+
 class ModelMeta(type):
     """Metaclass that creates Django models from SQLORM model definitions."""
 
+    def __getattr__(cls, attr):
+        # Only reached for attributes a deferred placeholder doesn't have
+        if attr.startswith("__") or "_sqlorm_spec" not in cls.__dict__:
+            raise AttributeError(attr)
+        return getattr(materialize(cls), attr)
+
+    def __call__(cls, *args, **kwargs):
+        if "_sqlorm_spec" in cls.__dict__:
+            return materialize(cls)(*args, **kwargs)
+        return super().__call__(*args, **kwargs)
+
+    def __instancecheck__(cls, instance):
+        model = cls.__dict__.get("_materialized")
+        if model is not None:
+            return isinstance(instance, model)
+        return super().__instancecheck__(instance)
+
+    def __subclasscheck__(cls, subclass):
+        model = cls.__dict__.get("_materialized")
+        if model is not None:
+            return issubclass(subclass, model)
+        return super().__subclasscheck__(subclass)
+
     def __new__(mcs, name: str, bases: tuple, namespace: dict):
         # Skip the base Model class
         if name == "Model" and not any(hasattr(b, "_is_sqlorm") for b in bases):
@@ -61,10 +205,16 @@ class ModelMeta(type):
         is_abstract = getattr(meta, "abstract", False) if meta else False
 
         if not _ensure_django():
-            # Defer if Django not ready
-            cls = super().__new__(mcs, name, bases, namespace)
+            # Django isn't configured yet: keep a lightweight placeholder that
+            # records the definition and is built on first use (or by
+            # configure()). Its class body is not executed again.
+            cls = super().__new__(mcs, name, bases, dict(namespace))
             cls._deferred = True
-            _model_registry[name] = cls
+            cls._sqlorm_spec = (name, bases, dict(namespace))
+            cls._meta = _DeferredOptions(cls, name)
+            if not is_abstract:
+                _model_registry[name] = cls
+                _deferred_models.append(cls)
             return cls
 
         from django.apps import apps
@@ -76,9 +226,13 @@ class ModelMeta(type):
         for attr_name, attr_value in namespace.items():
             if isinstance(attr_value, django_models.Field):
                 fields[attr_name] = attr_value
+            elif attr_name == "Meta":
+                continue
             elif callable(attr_value) or attr_name == "__str__":
                 methods[attr_name] = attr_value
 
+        _resolve_deferred_relations(fields)
+
         # Build Meta
         meta_attrs = {"app_label": "sqlorm_app"}
         if namespace.get("_db_table"):
@@ -87,15 +241,26 @@ class ModelMeta(type):
             for attr in dir(meta):
                 if not attr.startswith("_"):
                     meta_attrs[attr] = getattr(meta, attr)
+        # SQLORM-only options, which Django's Meta would reject
+        cache_options = meta_attrs.pop("cache", None)
         if is_abstract:
             meta_attrs["abstract"] = True
+        elif cache_options:
+            # Django's internal writes (save(), related updates and deletes)
+            # and ``_base_manager`` users then go through SqlormQuerySet too,
+            # which keeps the query cache in step. Only cached models get
+            # this, as it is part of their migration state.
+            meta_attrs.setdefault("base_manager_name", "objects")
 
         NewMeta = type("Meta", (), meta_attrs)
 
         # Create Django model
+        from .queryset import SqlormManager
+
         model_attrs = {
             "__module__": "sqlorm.app.models",
             "Meta": NewMeta,
+            "objects": SqlormManager(),
             **fields,
             **methods,
         }
@@ -109,10 +274,18 @@ class ModelMeta(type):
         # Add convenience methods
         mcs._add_methods(django_model)
 
+        if cache_options and not is_abstract:
+            from .cache import install_cache
+
+            install_cache(django_model, cache_options)
+
         # Store database routing
         if "_using" in namespace:
             django_model._default_using = namespace["_using"]
 
+        # Module defining the model, imported by worker processes
+        django_model._sqlorm_module = namespace.get("__module__")
+
         # Register
         if not is_abstract:
             try:
@@ -132,30 +305,93 @@ class ModelMeta(type):
         """Add convenience methods to the model."""
 
         def to_dict(self, fields=None, exclude=None) -> Dict[str, Any]:
-            """Convert instance to dictionary."""
-            exclude = exclude or []
-            result = {}
-            for field in self._meta.get_fields():
-                if not hasattr(field, "attname"):
-                    continue
-                if fields and field.name not in fields:
-                    continue
-                if field.name in exclude:
-                    continue
-                value = getattr(self, field.name, None)
-                if hasattr(value, "isoformat"):
-                    value = value.isoformat()
-                result[field.name] = value
-            return result
+            """Convert instance to dictionary (foreign keys as their raw ids)."""
+            return get_plan(type(self), fields, exclude).to_dict(self)
 
         def to_json(self, indent=None) -> str:
             """Convert instance to JSON string."""
-            import json
-
-            return json.dumps(self.to_dict(), indent=indent, default=str)
+            return json.dumps(
+                get_plan(type(self)).to_dict(self), indent=indent, default=str
+            )
+
+        def iter_chunks(
+            cls, queryset=None, key="pk", size=5000, values=False, prefetch=()
+        ) -> Iterator[list]:
+            """
+            Yield the model's rows in lists of up to ``size``, paging by keyset.
+
+            Args:
+                queryset: Rows to walk (default: all)
+                key: Key field(s) to page by (see ``sqlorm.queryset.iter_chunks``)
+                size: Rows per chunk
+                values: Yield ``values()`` dicts instead of instances; a list
+                    of field names selects the fields
+                prefetch: ``prefetch_related()`` lookups, run once per chunk
+            """
+            from .queryset import iter_chunks
+
+            if queryset is None:
+                queryset = cls._default_manager.all()
+            if values:
+                queryset = queryset.values(*([] if values is True else values))
+            if prefetch:
+                queryset = queryset.prefetch_related(*prefetch)
+            return iter_chunks(queryset, key, size)
+
+        def records(cls, queryset=None, fields=None, chunk_size=2000):
+            """
+            Yield compact read-only records instead of model instances.
+
+            Args:
+                queryset: Rows to read (default: all)
+                fields: Field names to include (default: all concrete fields)
+                chunk_size: Rows fetched from the cursor at a time
+
+            See ``sqlorm.records``.
+            """
+            from .records import records
+
+            if queryset is None:
+                queryset = cls._default_manager.all()
+            return records(queryset, fields, chunk_size)
+
+        def upsert_many(
+            cls,
+            rows,
+            unique_fields,
+            update_fields=None,
+            fields=None,
+            batch_size=1000,
+            using=None,
+        ):
+            """
+            Insert rows or update the existing ones sharing their unique key.
+
+            Rows may be instances, dicts or tuples ordered as ``fields``.
+            Returns an ``UpsertResult`` with inserted/updated counts (see
+            ``sqlorm.bulk.upsert_many``).
+            """
+            from .bulk import upsert_many
+
+            return upsert_many(
+                cls, rows, unique_fields, update_fields, fields, batch_size, using
+            )
 
         model.to_dict = to_dict
         model.to_json = to_json
+        model.iter_chunks = classmethod(iter_chunks)
+        model.records = classmethod(records)
+        model.upsert_many = classmethod(upsert_many)
+        model.aio = _AsyncAccessor()
+
+
+class _AsyncAccessor:
+    """``Model.aio``: async manager, imported on first use."""
+
+    def __get__(self, instance, owner):
+        from .aio import AsyncManager
+
+        return AsyncManager(owner)
 
 
 class Model(metaclass=ModelMeta):
@@ -175,32 +411,144 @@ class Model(metaclass=ModelMeta):
 
 
 def get_models() -> Dict[str, Type]:
-    """Get all registered models."""
+    """Get all registered models (building deferred ones once configured)."""
+    materialize_deferred()
     return _model_registry.copy()
 
 
+class CreateTablesResult(list):
+    """
+    Names of the tables created by ``create_tables()``.
+
+    ``timings`` maps each database alias to the seconds spent per phase
+    (``introspect``, ``order``, ``create``); ``total`` is the wall time of the
+    whole call.
+    """
+
+    def __init__(self, tables=(), timings=None, total=0.0):
+        super().__init__(tables)
+        self.timings = timings or {}
+        self.total = total
+
+
+def _dependency_order(models: List[Type]) -> List[Type]:
+    """Order models so that foreign key targets come before their referrers."""
+    pending = {model: None for model in models}
+    ordered = []
+    visiting = set()
+
+    def visit(model):
+        if model not in pending or model in visiting:
+            return
+        visiting.add(model)
+        for field in model._meta.concrete_fields:
+            related = field.related_model
+            if related is not None and related is not model:
+                visit(related)
+        visiting.discard(model)
+        del pending[model]
+        ordered.append(model)
+
+    for model in models:
+        visit(model)
+    return ordered
+
+
+def _create_alias_tables(alias: str, models: List[Type], close: bool = False):
+    """Create the missing tables of one database alias in one transaction."""
+    from django.db import connections
+
+    conn = connections[alias]
+    timings = {}
+    try:
+        started = time.perf_counter()
+        existing = set(conn.introspection.table_names())
+        timings["introspect"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        missing = _dependency_order(
+            [m for m in models if m._meta.db_table not in existing]
+        )
+        timings["order"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if missing:
+            with conn.schema_editor() as editor:
+                for model in missing:
+                    editor.create_model(model)
+        timings["create"] = time.perf_counter() - started
+
+        return [model._meta.db_table for model in missing], timings
+    finally:
+        if close:
+            conn.close()
+
+
 def create_tables(verbosity: int = 1) -> List[str]:
     """
     Create database tables for all registered models.
 
-    Returns list of created table names.
+    Table names are read once per database alias, and each alias creates its
+    missing tables in a single schema-editor transaction, ordered by foreign
+    key dependencies. Separate aliases are handled concurrently.
+
+    Returns list of created table names (a ``CreateTablesResult`` with
+    per-phase ``timings``).
     """
     from django.db import connections
 
-    created = []
+    from .routers import write_alias
+
+    started = time.perf_counter()
+    materialize_deferred()
+    by_alias: Dict[str, List[Type]] = {}
     for name, model in _model_registry.items():
+        opts = getattr(model, "_meta", None)
+        if opts is None:
+            logger.error(f"Failed to create {name}: model is not configured")
+            continue
+        if opts.abstract or opts.proxy or not opts.managed:
+            continue
+        db = write_alias(model)
+        by_alias.setdefault(db, []).append(model)
+
+    # In-memory SQLite databases are private to a connection, and connections
+    # are per thread, so those are always created from the calling thread.
+    inline = [
+        alias
+        for alias in by_alias
+        if len(by_alias) == 1
+        or (
+            connections[alias].vendor == "sqlite"
+            and connections[alias].is_in_memory_db()
+        )
+    ]
+    threaded = [alias for alias in by_alias if alias not in inline]
+
+    def run(alias, close=False):
         try:
-            db = getattr(model, "_default_using", "default")
-            conn = connections[db]
-            table = model._meta.db_table
-
-            if table not in conn.introspection.table_names():
-                with conn.schema_editor() as editor:
-                    editor.create_model(model)
-                created.append(table)
-                if verbosity:
-                    print(f"Created table: {table}")
+            return _create_alias_tables(alias, by_alias[alias], close)
         except Exception as e:
-            logger.error(f"Failed to create {name}: {e}")
-
+            logger.error(f"Failed to create tables on {alias!r}: {e}")
+            return [], {}
+
+    with ThreadPoolExecutor(max_workers=len(threaded) or 1) as executor:
+        futures = {alias: executor.submit(run, alias, True) for alias in threaded}
+        results = {alias: run(alias) for alias in inline}
+        results.update((alias, future.result()) for alias, future in futures.items())
+
+    created = CreateTablesResult()
+    for alias, (tables, timings) in results.items():
+        created.extend(tables)
+        created.timings[alias] = timings
+        if verbosity:
+            for table in tables:
+                print(f"Created table: {table}")
+    created.total = time.perf_counter() - started
+
+    if verbosity > 1:
+        for alias, timings in created.timings.items():
+            phases = ", ".join(f"{k} {v * 1000:.1f}ms" for k, v in timings.items())
+            print(f"create_tables[{alias}]: {phases}")
+        print(f"create_tables: total {created.total * 1000:.1f}ms")
     return created
@@ -0,0 +1,556 @@
+"""
+SQLORM Bulk Loader
+==================
+
+Load rows into a model's table as fast as the backend allows.
+
+Rows are plain dicts (as read from NDJSON or CSV) and are converted with the
+model's fields, then written in batches without building model instances:
+
+- PostgreSQL: ``COPY ... FROM STDIN``
+- SQLite: ``executemany`` with relaxed durability pragmas for the load
+- Others: ``executemany``
+
+Each batch is committed in its own transaction, so an interrupted load can
+be resumed with ``start=`` (see ``BulkLoadError.committed``). Bulk loading
+bypasses ``save()`` and model signals.
+
+``upsert_many()`` (also ``Model.upsert_many()``) inserts or updates rows
+keyed on unique fields with the backend's upsert statement:
+``INSERT ... ON CONFLICT (...) DO UPDATE`` on SQLite and PostgreSQL,
+``INSERT ... ON DUPLICATE KEY UPDATE`` on MySQL.
+
+Example:
+    >>> from sqlorm import bulk_load
+    >>> from sqlorm.bulk import read_ndjson
+    >>> with open("tasks.ndjson") as f:
+    ...     result = bulk_load(Task, read_ndjson(f), batch_size=10000)
+    >>> print(f"{result.rows} rows at {result.rows_per_sec:,.0f}/s")
+"""
+
+import csv
+import datetime
+import decimal
+import gzip
+import io
+import itertools
+import json
+import logging
+import sys
+import time
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .cache import invalidate
+from .exceptions import BulkLoadError, ConfigurationError
+from .sqlite import use_sqlite_profile
+
+logger = logging.getLogger("sqlorm")
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_UPSERT_BATCH_SIZE = 1000
+
+# Pragmas applied for the duration of a SQLite load and restored afterwards.
+# Unlike the "bulk-load" profile this leaves journal_mode alone, since
+# switching out of WAL fails while other connections are reading.
+SQLITE_LOAD_PRAGMAS = {
+    "synchronous": "OFF",
+    "temp_store": "MEMORY",
+    "cache_size": -262144,
+}
+
+_MISSING = object()
+
+
+class LoadResult:
+    """
+    Outcome of a bulk load.
+
+    ``rows_done`` counts input rows (records, not file lines) from the start
+    of the input, skipped ones included: the ``start`` to resume after it.
+    """
+
+    def __init__(self, rows: int, batches: int, seconds: float, rows_done: int):
+        self.rows = rows
+        self.batches = batches
+        self.seconds = seconds
+        self.rows_done = rows_done
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def __repr__(self):
+        return (
+            f"<LoadResult rows={self.rows} batches={self.batches} "
+            f"seconds={self.seconds:.2f} rows_per_sec={self.rows_per_sec:.0f}>"
+        )
+
+
+class UpsertResult:
+    """Outcome of an upsert."""
+
+    def __init__(self, inserted: int, updated: int, batches: int, seconds: float):
+        self.inserted = inserted
+        self.updated = updated
+        self.batches = batches
+        self.seconds = seconds
+
+    @property
+    def rows(self) -> int:
+        return self.inserted + self.updated
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def __repr__(self):
+        return (
+            f"<UpsertResult inserted={self.inserted} updated={self.updated} "
+            f"batches={self.batches} seconds={self.seconds:.2f}>"
+        )
+
+
+def read_ndjson(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per non-blank line of an NDJSON stream."""
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_csv(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per CSV row, keyed by the header row."""
+    yield from csv.DictReader(stream)
+
+
+def open_input(path: Optional[str] = None) -> IO[str]:
+    """Open a text stream to load from (stdin for ``None``/``"-"``, gunzip ``.gz``)."""
+    if path in (None, "-"):
+        return sys.stdin
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+class _RowConverter:
+    """Turn input dicts into tuples of database values for one model."""
+
+    def __init__(self, model, connection, first_row: Dict[str, Any]):
+        from django.db import models
+
+        self.model = model
+        self.connection = connection
+        self.fields = []
+        self._names = set()
+        pk = model._meta.pk
+        for field in model._meta.concrete_fields:
+            self._names.update((field.name, field.attname))
+        self.check(first_row)
+        for field in model._meta.concrete_fields:
+            provided = field.name in first_row or field.attname in first_row
+            if field is pk and isinstance(field, models.AutoField) and not provided:
+                continue
+            self.fields.append(field)
+        self.columns = [field.column for field in self.fields]
+        self._auto_now = {
+            field
+            for field in self.fields
+            if getattr(field, "auto_now", False)
+            or getattr(field, "auto_now_add", False)
+        }
+        self._text_fields = {
+            field
+            for field in self.fields
+            if isinstance(field, (models.CharField, models.TextField))
+        }
+
+    def check(self, row: Dict[str, Any]) -> None:
+        """Reject keys that name no concrete field, e.g. a misspelt CSV header."""
+        unknown = row.keys() - self._names
+        if unknown:
+            raise ValueError(
+                f"Unknown field(s) for {self.model.__name__}: "
+                f"{', '.join(sorted(map(str, unknown)))}"
+            )
+
+    def convert(self, row: Dict[str, Any], now) -> tuple:
+        self.check(row)
+        values = []
+        for field in self.fields:
+            value = row.get(field.name, _MISSING)
+            if value is _MISSING:
+                value = row.get(field.attname, _MISSING)
+            if value is _MISSING:
+                value = now if field in self._auto_now else field.get_default()
+            elif value == "" and field.null and field not in self._text_fields:
+                # CSV has no NULL; an empty cell in a nullable column means NULL
+                value = None
+            elif value is not None:
+                value = field.to_python(value)
+            values.append(field.get_db_prep_save(value, self.connection))
+        return tuple(values)
+
+
+def _copy_rows(cursor, table: str, columns: List[str], rows: List[tuple]):
+    """Write a batch with PostgreSQL ``COPY FROM STDIN``."""
+    raw = cursor.cursor
+    sql = "COPY {} ({}) FROM STDIN".format(table, ", ".join(columns))
+    if hasattr(raw, "copy"):
+        # psycopg 3
+        with raw.copy(sql) as copy:
+            for row in rows:
+                copy.write_row(row)
+        return
+
+    # psycopg2
+    raw.copy_expert(sql + " WITH (FORMAT csv)", _copy_csv(rows))
+
+
+def _copy_text(value: Any) -> str:
+    """
+    A database value in PostgreSQL's text input format, for psycopg2 COPY.
+
+    Values have already been through ``get_db_prep_save()``, so this only
+    has to spell out what the driver's adapters would otherwise send.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if hasattr(value, "adapted") and hasattr(value, "dumps"):
+        # psycopg2.extras.Json, as returned for JSONField on Django 4.2+
+        return value.dumps(value.adapted)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if isinstance(value, (list, tuple)):
+        # ArrayField
+        return "{%s}" % ",".join(map(_copy_array_item, value))
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return format(value, "f")
+    return str(value)
+
+
+def _copy_array_item(item: Any) -> str:
+    if item is None:
+        return "NULL"
+    text = _copy_text(item).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def _copy_csv(rows: List[tuple]) -> io.StringIO:
+    """
+    A batch as CSV for ``COPY ... WITH (FORMAT csv)``.
+
+    COPY reads an unquoted empty field as NULL and a quoted one as an empty
+    string, so ``None`` is written unquoted and every other value quoted.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(
+            ",".join(
+                (
+                    ""
+                    if value is None
+                    else '"' + _copy_text(value).replace('"', '""') + '"'
+                )
+                for value in row
+            )
+        )
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def bulk_load(
+    model,
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    start: int = 0,
+    using: Optional[str] = None,
+    progress=None,
+) -> LoadResult:
+    """
+    Insert rows into a model's table in batches.
+
+    Args:
+        model: SQLORM model class
+        rows: Iterable of dicts keyed by field name or attname; missing
+            fields get their default
+        batch_size: Rows per batch (and per transaction)
+        start: Number of input rows to skip, e.g. to resume after a failure
+        using: Database alias (default: the model's write database)
+        progress: Optional ``sqlorm.export.Progress`` reporter
+
+    Returns a ``LoadResult``. Raises ``BulkLoadError`` on failure, with the
+    number of committed input rows to resume from.
+    """
+    from django.db import connections, router, transaction
+    from django.utils import timezone
+
+    alias = using or router.db_for_write(model)
+    connection = connections[alias]
+    qn = connection.ops.quote_name
+
+    rows = iter(rows)
+    skipped = sum(1 for _ in itertools.islice(rows, start))
+    first = next(rows, None)
+    started = time.monotonic()
+    if first is None:
+        return LoadResult(0, 0, 0.0, skipped)
+    rows = itertools.chain([first], rows)
+
+    converter = _RowConverter(model, connection, first)
+    table = qn(model._meta.db_table)
+    columns = [qn(column) for column in converter.columns]
+    insert_sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        table, ", ".join(columns), ", ".join(["%s"] * len(columns))
+    )
+    use_copy = connection.vendor == "postgresql"
+
+    loaded = batches = 0
+    with use_sqlite_profile(SQLITE_LOAD_PRAGMAS, using=alias):
+        with connection.cursor() as cursor:
+            while True:
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                try:
+                    now = timezone.now()
+                    values = [converter.convert(row, now) for row in batch]
+                    with transaction.atomic(using=alias):
+                        if use_copy:
+                            _copy_rows(cursor, table, columns, values)
+                        else:
+                            cursor.executemany(insert_sql, values)
+                except Exception as e:
+                    committed = start + loaded
+                    invalidate(model)
+                    raise BulkLoadError(
+                        f"Bulk load failed in the batch after input row "
+                        f"{committed}: {e}",
+                        committed=committed,
+                    ) from e
+                loaded += len(batch)
+                batches += 1
+                if progress is not None:
+                    progress.update(len(batch))
+
+    invalidate(model)
+    result = LoadResult(loaded, batches, time.monotonic() - started, start + loaded)
+    logger.debug(f"Bulk loaded {model.__name__}: {result}")
+    return result
+
+
+def _upsert_rows(
+    model, rows: Iterable[Any], fields: Optional[Sequence[str]], keep_pk: bool
+):
+    """Turn instances, tuples (ordered as ``fields``) and dicts into dicts."""
+    from django.db import models
+    from django.utils import timezone
+
+    now = timezone.now()
+
+    # Auto primary keys of instances are left to the database unless they
+    # are the upsert key
+    skip_pk = isinstance(model._meta.pk, models.AutoField) and not keep_pk
+    for row in rows:
+        if isinstance(row, dict):
+            yield row
+        elif isinstance(row, models.Model):
+            values = {}
+            for field in model._meta.concrete_fields:
+                value = getattr(row, field.attname)
+                if (field.primary_key and skip_pk) or getattr(field, "auto_now", False):
+                    continue
+                if value is None and getattr(field, "auto_now_add", False):
+                    # Filled in rather than left out, so every instance row
+                    # names the same fields
+                    value = now
+                values[field.attname] = value
+            yield values
+        elif fields is None:
+            raise ValueError("upsert_many() needs fields= to read tuple rows")
+        else:
+            yield dict(zip(fields, row))
+
+
+def upsert_many(
+    model,
+    rows: Iterable[Any],
+    unique_fields: Sequence[str],
+    update_fields: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None,
+    batch_size: int = DEFAULT_UPSERT_BATCH_SIZE,
+    using: Optional[str] = None,
+) -> UpsertResult:
+    """
+    Insert rows, updating the existing ones that share their unique key.
+
+    Args:
+        model: SQLORM model class
+        rows: Model instances, dicts keyed by field name or attname, or
+            tuples ordered as ``fields``
+        unique_fields: Fields of the unique constraint that identifies a row
+        update_fields: Fields overwritten on existing rows (default: every
+            field given in the rows except ``unique_fields``, plus
+            ``auto_now`` fields). When there are none, existing rows are
+            left unchanged and only inserts are counted.
+        fields: Field names of tuple rows
+        batch_size: Rows per batch, written with one multi-row statement
+            (more where the backend limits query parameters) in one
+            transaction
+        using: Database alias (default: the model's write database)
+
+    Every row must name the same fields as the first one; a field missing
+    from some rows would otherwise be overwritten with its default there.
+    Rows repeating a key within a batch are merged, the last one winning.
+    The inserted/updated split is counted from the keys already present at
+    the start of each batch, so concurrent writers can skew it. Like
+    ``bulk_load()``, upserts bypass ``save()`` and model signals.
+
+    Returns an ``UpsertResult``. Raises ``BulkLoadError`` on failure, with
+    the number of input rows committed before the failing batch. Needs
+    Django 4.1 or later.
+    """
+    import django
+
+    if django.VERSION < (4, 1):
+        raise ConfigurationError("upsert_many() needs Django 4.1 or later")
+
+    from django.db import connections, router, transaction
+    from django.db.models.constants import OnConflict
+    from django.utils import timezone
+
+    alias = using or router.db_for_write(model)
+    connection = connections[alias]
+    qn = connection.ops.quote_name
+    if not connection.features.supports_update_conflicts:
+        raise ConfigurationError(f"{connection.vendor} does not support upserts")
+    if not unique_fields:
+        raise ValueError("upsert_many() needs unique_fields")
+
+    opts = model._meta
+    unique = [
+        opts.pk if name == "pk" else opts.get_field(name) for name in unique_fields
+    ]
+    rows = _upsert_rows(model, rows, fields, keep_pk=opts.pk in unique)
+    first = next(rows, None)
+    started = time.monotonic()
+    if first is None:
+        return UpsertResult(0, 0, 0, 0.0)
+    rows = itertools.chain([first], rows)
+    keys = first.keys()
+
+    converter = _RowConverter(model, connection, first)
+    missing = [field.name for field in unique if field not in converter.fields]
+    if missing:
+        raise ValueError(f"Rows lack unique field(s): {', '.join(missing)}")
+    if update_fields is None:
+        update = [
+            field
+            for field in converter.fields
+            if (
+                field.name in first
+                or field.attname in first
+                or getattr(field, "auto_now", False)
+            )
+            and field not in unique
+            and not field.primary_key
+            and not getattr(field, "auto_now_add", False)
+        ]
+    else:
+        given = {}
+        for field in converter.fields:
+            given[field.name] = given[field.attname] = field
+        unknown = [name for name in update_fields if name not in given]
+        if unknown:
+            raise ValueError(
+                f"update_fields must be concrete fields of {model.__name__} "
+                f"given in the rows, not: {', '.join(unknown)}"
+            )
+        update = [given[name] for name in update_fields]
+
+    table = qn(opts.db_table)
+    columns = [qn(column) for column in converter.columns]
+    # With nothing to update (rows of only the key, or update_fields=[]),
+    # existing rows are left alone rather than sending an empty SET
+    mode = OnConflict.UPDATE if update else OnConflict.IGNORE
+    insert = connection.ops.insert_statement(on_conflict=mode)
+    on_conflict = connection.ops.on_conflict_suffix_sql(
+        converter.fields,
+        mode,
+        [field.column for field in update],
+        [field.column for field in unique],
+    )
+    statements: Dict[int, str] = {}
+
+    def upsert_sql(rows: int) -> str:
+        # One multi-row statement, so a batch is one round trip on any driver
+        sql = statements.get(rows)
+        if sql is None:
+            values = connection.ops.bulk_insert_sql(
+                converter.fields, [["%s"] * len(columns)] * rows
+            )
+            sql = statements[rows] = "{} {} ({}) {} {}".format(
+                insert, table, ", ".join(columns), values, on_conflict
+            )
+        return sql
+
+    positions = [converter.fields.index(field) for field in unique]
+
+    def count_sql(keys: int) -> str:
+        if len(unique) == 1:
+            where = "{} IN ({})".format(qn(unique[0].column), ", ".join(["%s"] * keys))
+        else:
+            match = " AND ".join(f"{qn(field.column)} = %s" for field in unique)
+            where = " OR ".join([f"({match})"] * keys)
+        return f"SELECT COUNT(*) FROM {table} WHERE {where}"
+
+    consumed = inserted = updated = batches = 0
+    with connection.cursor() as cursor:
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            try:
+                now = timezone.now()
+                values = {}
+                for row in batch:
+                    if row.keys() != keys:
+                        raise ValueError(
+                            f"Row fields {sorted(row)} differ from the first "
+                            f"row's {sorted(keys)}"
+                        )
+                    value = converter.convert(row, now)
+                    values[tuple(value[i] for i in positions)] = value
+                rows_values = list(values.values())
+                # Statements stay under the backend's query parameter limit
+                step = max(
+                    connection.ops.bulk_batch_size(converter.fields, rows_values), 1
+                )
+                existing = 0
+                with transaction.atomic(using=alias):
+                    for i in range(0, len(rows_values), step):
+                        chunk = rows_values[i : i + step]
+                        params = [row[p] for row in chunk for p in positions]
+                        cursor.execute(count_sql(len(chunk)), params)
+                        existing += cursor.fetchone()[0]
+                        cursor.execute(
+                            upsert_sql(len(chunk)),
+                            [param for row in chunk for param in row],
+                        )
+            except Exception as e:
+                invalidate(model)
+                raise BulkLoadError(
+                    f"Upsert failed in the batch after input row {consumed}: {e}",
+                    committed=consumed,
+                ) from e
+            consumed += len(batch)
+            inserted += len(values) - existing
+            if update:
+                updated += existing
+            batches += 1
+
+    invalidate(model)
+    result = UpsertResult(inserted, updated, batches, time.monotonic() - started)
+    logger.debug(f"Upserted {model.__name__}: {result}")
+    return result
@@ -0,0 +1,386 @@
+"""
+SQLORM Query Cache
+==================
+
+Opt-in, per-model cache of query results.
+
+Enable it with ``Meta.cache``; repeated lookups such as ``get(pk=...)``,
+unique-field gets and small filtered lists are then served from the cache
+instead of the database:
+
+    >>> class Country(Model):
+    ...     code = fields.CharField(max_length=2, unique=True)
+    ...
+    ...     class Meta:
+    ...         cache = {"ttl": 300, "max_entries": 10000}
+    >>>
+    >>> Country.objects.get(code="NL")   # database
+    >>> Country.objects.get(code="NL")   # cache
+    >>> cache_stats()
+    {'Country': {'hits': 1, 'misses': 1, 'evictions': 0, ...}}
+
+Only single-table queries are cached (no joins, subqueries,
+``select_related()``, ``prefetch_related()`` or ``select_for_update()``),
+and only results of at most ``max_rows`` rows. Queries inside a transaction
+bypass the cache.
+
+A model's entries are dropped whenever it changes through this process:
+``save()``, ``delete()``, ``update()``, ``bulk_create()``, ``bulk_update()``
+and ``bulk_load()``. Writes by other processes or raw SQL are only picked up
+after ``ttl`` seconds, or after ``invalidate(Model)``.
+
+Backends:
+
+- ``memory``: process-local LRU (default)
+- ``sqlite-file``: LRU in a SQLite file (``path``), which survives restarts
+  and is shared by processes on one machine. The default file is private to
+  the user (``$XDG_CACHE_HOME/sqlorm/cache.sqlite3`` or
+  ``~/.cache/sqlorm/cache.sqlite3``): entries are unpickled, so only point
+  ``path`` at a file no other user can write.
+
+Keys include the database's name, host and port, so models of the same name
+in other databases or projects never share entries.
+"""
+
+import copy
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .exceptions import ConfigurationError
+
+CACHE_DEFAULTS = {
+    "ttl": 60.0,
+    "max_entries": 10000,
+    "max_rows": 100,
+    "backend": "memory",
+    "path": None,
+}
+BACKENDS = ("memory", "sqlite-file")
+
+_MISS = object()
+
+# Model caches by model name
+_caches: Dict[str, "ModelCache"] = {}
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry (``ModelCache`` holds the lock)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, now: float) -> Tuple[Any, bool]:
+        """Return ``(value or _MISS, expired)``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISS, False
+        expires, value = entry
+        if expires and expires <= now:
+            del self._entries[key]
+            return _MISS, True
+        self._entries.move_to_end(key)
+        # Callers may modify what they get back
+        return [copy.copy(obj) for obj in value], False
+
+    def set(self, key: Hashable, value: list, expires: float) -> int:
+        """Store an entry; returns the number of entries evicted."""
+        self._entries[key] = (expires, [copy.copy(obj) for obj in value])
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _default_cache_path() -> str:
+    """Per-user cache file, created readable and writable by its owner only."""
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    directory = os.path.join(root, "sqlorm")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    path = os.path.join(directory, "cache.sqlite3")
+    # SQLite gives its -wal and -shm files the database file's permissions
+    os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+    return path
+
+
+class SQLiteFileBackend:
+    """LRU stored in a SQLite file, one namespace per model."""
+
+    def __init__(self, max_entries: int, path: Optional[str], namespace: str):
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.path = path or _default_cache_path()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = OFF")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sqlorm_cache ("
+            "namespace TEXT, key TEXT, value BLOB, expires REAL, used REAL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS sqlorm_cache_used "
+            "ON sqlorm_cache (namespace, used)"
+        )
+        self._db.commit()
+
+    def get(self, key: Hashable, now: float) -> Tuple[Any, bool]:
+        db_key = repr(key)
+        row = self._db.execute(
+            "SELECT value, expires FROM sqlorm_cache WHERE namespace = ? AND key = ?",
+            (self.namespace, db_key),
+        ).fetchone()
+        if row is None:
+            return _MISS, False
+        value, expires = row
+        if expires and expires <= now:
+            self._db.execute(
+                "DELETE FROM sqlorm_cache WHERE namespace = ? AND key = ?",
+                (self.namespace, db_key),
+            )
+            self._db.commit()
+            return _MISS, True
+        self._db.execute(
+            "UPDATE sqlorm_cache SET used = ? WHERE namespace = ? AND key = ?",
+            (time.time(), self.namespace, db_key),
+        )
+        self._db.commit()
+        return pickle.loads(value), False
+
+    def set(self, key: Hashable, value: list, expires: float) -> int:
+        try:
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            # e.g. values_list(named=True) rows
+            return 0
+        self._db.execute(
+            "INSERT OR REPLACE INTO sqlorm_cache VALUES (?, ?, ?, ?, ?)",
+            (
+                self.namespace,
+                repr(key),
+                data,
+                # Wall clock: entries outlive this process
+                time.time() + (expires - time.monotonic()) if expires else 0,
+                time.time(),
+            ),
+        )
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM sqlorm_cache WHERE rowid IN (SELECT rowid FROM "
+                "sqlorm_cache WHERE namespace = ? ORDER BY used LIMIT ?)",
+                (self.namespace, excess),
+            )
+        self._db.commit()
+        return max(excess, 0)
+
+    def clear(self) -> None:
+        self._db.execute(
+            "DELETE FROM sqlorm_cache WHERE namespace = ?", (self.namespace,)
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM sqlorm_cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
+
+class ModelCache:
+    """Query result cache of one model."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl: Optional[float] = 60.0,
+        max_entries: int = 10000,
+        max_rows: int = 100,
+        backend: str = "memory",
+        path: Optional[str] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.backend_name = backend
+        if backend == "memory":
+            self.backend = MemoryBackend(max_entries)
+        else:
+            self.backend = SQLiteFileBackend(max_entries, path, name)
+        # Bumped on every invalidation so a query that started before a write
+        # cannot store its (now stale) result afterwards
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, key: Hashable) -> Any:
+        """Cached rows for ``key``, or ``_MISS``."""
+        now = time.monotonic() if self.backend_name == "memory" else time.time()
+        with self._lock:
+            value, expired = self.backend.get(key, now)
+            if value is _MISS:
+                self._stats["misses"] += 1
+                if expired:
+                    self._stats["expirations"] += 1
+            else:
+                self._stats["hits"] += 1
+            return value
+
+    def set(self, key: Hashable, rows: list, generation: int) -> None:
+        """Store rows read while the cache was at ``generation``."""
+        expires = time.monotonic() + self.ttl if self.ttl else 0
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._stats["evictions"] += self.backend.set(key, rows, expires)
+            self._stats["stores"] += 1
+
+    def invalidate(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self.generation += 1
+            self.backend.clear()
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and the current number of entries."""
+        with self._lock:
+            return {
+                **self._stats,
+                "size": len(self.backend),
+                "backend": self.backend_name,
+            }
+
+
+def _on_change(sender, **kwargs):
+    invalidate(sender)
+
+
+def install_cache(model, options: Any) -> ModelCache:
+    """Attach a cache built from ``Meta.cache`` options to a model."""
+    from django.db.models.signals import post_delete, post_save
+
+    if options is True:
+        options = {}
+    if not isinstance(options, dict):
+        raise ConfigurationError(
+            f"{model.__name__}.Meta.cache must be a dict of options or True"
+        )
+    unknown = set(options) - set(CACHE_DEFAULTS)
+    if unknown:
+        raise ConfigurationError(
+            f"Unknown cache option(s) on {model.__name__}: {', '.join(sorted(unknown))}"
+        )
+    config = {**CACHE_DEFAULTS, **options}
+    if config["backend"] not in BACKENDS:
+        raise ConfigurationError(
+            f"Unknown cache backend {config['backend']!r}. "
+            f"Choose from: {', '.join(BACKENDS)}"
+        )
+
+    cache = ModelCache(model.__name__, **config)
+    model._sqlorm_cache = cache
+    _caches[model.__name__] = cache
+    uid = f"sqlorm.cache.{model._meta.label}"
+    post_save.connect(_on_change, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(_on_change, sender=model, weak=False, dispatch_uid=uid)
+    return cache
+
+
+def get_cache(model) -> Optional[ModelCache]:
+    """The cache of a model, or ``None`` if it has none."""
+    return model.__dict__.get("_sqlorm_cache")
+
+
+def invalidate(model) -> None:
+    """Drop a model's cached results (no-op for models without a cache)."""
+    cache = get_cache(model)
+    if cache is not None:
+        cache.invalidate()
+
+
+def invalidate_related(model) -> None:
+    """
+    Drop the caches of a model and of models pointing at it.
+
+    Deletes can change those through ``on_delete`` (``SET_NULL``,
+    ``CASCADE``...) without sending signals for them.
+    """
+    invalidate(model)
+    for relation in model._meta.related_objects:
+        invalidate(relation.related_model)
+
+
+def cache_stats(model=None) -> Dict[str, Dict[str, Any]]:
+    """Cache counters per model name (only models with a cache)."""
+    if model is not None:
+        cache = get_cache(model)
+        return {model.__name__: cache.stats()} if cache else {}
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def _database_identity(connection) -> Tuple:
+    """Which database an alias points at, beyond its (reusable) alias name."""
+    settings = connection.settings_dict
+    name = str(settings["NAME"])
+    if connection.vendor == "sqlite" and not connection.is_in_memory_db():
+        name = os.path.abspath(name)
+    return (connection.vendor, settings.get("HOST"), settings.get("PORT"), name)
+
+
+def cache_key(queryset) -> Optional[Tuple]:
+    """Cache key of a queryset, or ``None`` if its results can't be cached."""
+    from django.core.exceptions import EmptyResultSet
+    from django.db import connections
+
+    query = queryset.query
+    if (
+        queryset._prefetch_related_lookups
+        or query.select_related
+        or query.select_for_update
+        or query.combinator
+    ):
+        return None
+    try:
+        sql, params = query.get_compiler(using=queryset.db).as_sql()
+    except EmptyResultSet:
+        return None
+    if " JOIN " in sql or sql.count("SELECT ") > 1:
+        return None
+    connection = connections[queryset.db]
+    if connection.in_atomic_block:
+        # May read uncommitted rows that a rollback would leave cached
+        return None
+    key = (
+        queryset.db,
+        _database_identity(connection),
+        queryset._iterable_class.__name__,
+        sql,
+        tuple(params),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
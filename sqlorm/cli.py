@@ -2,14 +2,18 @@
 SQLORM CLI
 ==========
 
-Command-line interface for migrations.
+Command-line interface for migrations, data export and bulk import.
 
 Usage:
     sqlorm makemigrations --models mymodels.py
     sqlorm migrate --models mymodels.py
+    sqlorm export --models mymodels.py --model Task --format csv -o tasks.csv.gz
+    sqlorm import --models mymodels.py --model Task --format csv -i tasks.csv.gz
+    sqlorm backfill --models mymodels.py --model Task --set priority=2 --sleep 0.05
 """
 
 import argparse
+import json
 import sys
 from pathlib import Path
 
@@ -25,6 +29,30 @@ def _import_models(script_path: str):
         spec.loader.exec_module(module)
 
 
+def _get_model(name: str):
+    """Look up a registered model by class name (case-insensitive)."""
+    from sqlorm.base import get_models
+
+    models = get_models()
+    if name in models:
+        return models[name]
+    for model_name, model in models.items():
+        if model_name.lower() == name.lower():
+            return model
+    raise LookupError(f"Unknown model: {name}")
+
+
+def _parse_assignment(item: str) -> tuple:
+    """Parse a ``key=value`` argument; the value is read as JSON when possible."""
+    key, sep, value = item.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {item!r}")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
 def _ensure_configured():
     """Ensure Django is configured."""
     import django
@@ -46,6 +74,10 @@ def _ensure_configured():
     if not django.apps.apps.ready:
         django.setup()
 
+    from sqlorm.base import materialize_deferred
+
+    materialize_deferred()
+
 
 def makemigrations(app_label: str = "sqlorm_app", name: str = None, verbosity: int = 1):
     """Create new migrations."""
@@ -79,6 +111,177 @@ def migrate(app_label: str = None, verbosity: int = 1):
         return False
 
 
+def export(
+    model_name: str,
+    format: str = "ndjson",
+    output: str = None,
+    where: dict = None,
+    fields: list = None,
+    exclude: list = None,
+    compress: bool = False,
+    chunk_size: int = None,
+    verbosity: int = 1,
+):
+    """Stream a model's rows to NDJSON or CSV."""
+    _ensure_configured()
+    from sqlorm.export import DEFAULT_CHUNK_SIZE, Progress, export_queryset, open_output
+
+    try:
+        model = _get_model(model_name)
+        queryset = model.objects.filter(**(where or {}))
+        progress = Progress("rows exported") if verbosity else None
+
+        out = open_output(output, compress)
+        try:
+            export_queryset(
+                queryset,
+                out,
+                format=format,
+                fields=fields,
+                exclude=exclude,
+                chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+                progress=progress,
+            )
+        finally:
+            if out is sys.stdout:
+                out.flush()
+            else:
+                out.close()
+        return True
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return False
+
+
+def import_data(
+    model_name: str,
+    format: str = "ndjson",
+    input: str = None,
+    batch_size: int = None,
+    start: int = 0,
+    verbosity: int = 1,
+):
+    """Bulk load NDJSON or CSV rows into a model's table."""
+    _ensure_configured()
+    from sqlorm.bulk import (
+        DEFAULT_BATCH_SIZE,
+        bulk_load,
+        open_input,
+        read_csv,
+        read_ndjson,
+    )
+    from sqlorm.exceptions import BulkLoadError
+    from sqlorm.export import Progress
+
+    try:
+        model = _get_model(model_name)
+        progress = Progress("rows loaded") if verbosity else None
+        reader = read_csv if format == "csv" else read_ndjson
+
+        stream = open_input(input)
+        try:
+            bulk_load(
+                model,
+                reader(stream),
+                batch_size=batch_size or DEFAULT_BATCH_SIZE,
+                start=start,
+                progress=progress,
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        if progress is not None:
+            progress.finish()
+        return True
+    except BulkLoadError as e:
+        if verbosity:
+            sys.stderr.write("\n")
+        print(f"Error: {e}", file=sys.stderr)
+        print(f"Resume with: --skip-rows {e.committed}", file=sys.stderr)
+        return False
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return False
+
+
+def backfill(
+    model_name: str,
+    values: dict,
+    where: dict = None,
+    batch_size: int = None,
+    sleep: float = 0.0,
+    checkpoint: str = None,
+    verbosity: int = 1,
+):
+    """Update a model's rows in checkpointed, primary-key ordered batches."""
+    _ensure_configured()
+    from sqlorm.backfill import DEFAULT_BATCH_SIZE, run_backfill
+    from sqlorm.exceptions import BackfillError
+    from sqlorm.export import Progress
+
+    try:
+        model = _get_model(model_name)
+        checkpoint = checkpoint or f".backfill-{model._meta.model_name}.json"
+        progress = Progress("rows updated") if verbosity else None
+        run_backfill(
+            model,
+            values=values,
+            where=where,
+            batch_size=batch_size or DEFAULT_BATCH_SIZE,
+            sleep=sleep,
+            checkpoint=checkpoint,
+            progress=progress,
+        )
+        if progress is not None:
+            progress.finish()
+        return True
+    except BackfillError as e:
+        if verbosity:
+            sys.stderr.write("\n")
+        print(f"Error: {e}", file=sys.stderr)
+        print(
+            f"Run the same command again to resume from {checkpoint}", file=sys.stderr
+        )
+        return False
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return False
+
+
+def snapshot(
+    model_name: str,
+    key: str,
+    output: str = None,
+    fields: list = None,
+    where: dict = None,
+    verbosity: int = 1,
+):
+    """Write a model's rows to a memory-mappable snapshot file."""
+    _ensure_configured()
+    from sqlorm.snapshot import build_snapshot
+
+    try:
+        model = _get_model(model_name)
+        queryset = model._default_manager.filter(**(where or {}))
+        result = build_snapshot(model, key, output, fields, queryset)
+        if verbosity:
+            state = "written" if result.changed else "unchanged"
+            print(
+                f"{result.path}: {result.rows} rows, version {result.version} "
+                f"({state})",
+                file=sys.stderr,
+            )
+        return True
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return False
+
+
+def _split_names(value: str) -> list:
+    """Parse a comma-separated list of field names."""
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
 def main():
     """CLI entry point."""
     # Parent parser for common arguments
@@ -111,6 +314,98 @@ def main():
         "showmigrations", help="Show migrations", parents=[parent_parser]
     )
 
+    # export
+    ex = subparsers.add_parser(
+        "export", help="Stream model rows as NDJSON or CSV", parents=[parent_parser]
+    )
+    ex.add_argument("--model", required=True, help="Model class name")
+    ex.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    ex.add_argument(
+        "--where",
+        action="append",
+        type=_parse_assignment,
+        metavar="LOOKUP=VALUE",
+        help="Filter, e.g. --where priority=1 --where title__icontains=book",
+    )
+    ex.add_argument("--fields", type=_split_names, help="Comma-separated fields")
+    ex.add_argument("--exclude", type=_split_names, help="Comma-separated fields")
+    ex.add_argument("-o", "--output", help="Output file (default: stdout)")
+    ex.add_argument("--gzip", action="store_true", help="Gzip-compress the output")
+    ex.add_argument("--chunk-size", type=int, help="Rows fetched per round trip")
+
+    # import
+    im = subparsers.add_parser(
+        "import", help="Bulk load NDJSON or CSV rows", parents=[parent_parser]
+    )
+    im.add_argument("--model", required=True, help="Model class name")
+    im.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    im.add_argument("-i", "--input", help="Input file (default: stdin)")
+    im.add_argument("--batch-size", type=int, help="Rows per batch/transaction")
+    im.add_argument(
+        "--skip-rows",
+        type=int,
+        default=0,
+        metavar="N",
+        help=(
+            "Skip the first N input rows, as reported by a failed run (rows, "
+            "not lines: the CSV header and blank NDJSON lines don't count)"
+        ),
+    )
+
+    # backfill
+    bf = subparsers.add_parser(
+        "backfill",
+        help="Update rows in small, resumable batches",
+        parents=[parent_parser],
+    )
+    bf.add_argument("--model", required=True, help="Model class name")
+    bf.add_argument(
+        "--set",
+        action="append",
+        required=True,
+        type=_parse_assignment,
+        metavar="FIELD=VALUE",
+        help="Value to write, e.g. --set priority=2 --set description='\"\"'",
+    )
+    bf.add_argument(
+        "--where",
+        action="append",
+        type=_parse_assignment,
+        metavar="LOOKUP=VALUE",
+        help="Only update matching rows, e.g. --where priority__isnull=true",
+    )
+    bf.add_argument("--batch-size", type=int, help="Rows per batch/transaction")
+    bf.add_argument(
+        "--sleep",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Pause between batches to let other writers in",
+    )
+    bf.add_argument(
+        "--checkpoint",
+        help="Checkpoint file for resuming (default: .backfill-<model>.json)",
+    )
+
+    # snapshot
+    sn = subparsers.add_parser(
+        "snapshot",
+        help="Build a read-only, memory-mapped lookup snapshot",
+        parents=[parent_parser],
+    )
+    sn.add_argument("action", choices=["build"])
+    sn.add_argument("--model", required=True, help="Model class name")
+    sn.add_argument("--key", required=True, help="Unique field to look rows up by")
+    sn.add_argument("--fields", type=_split_names, help="Comma-separated fields")
+    sn.add_argument(
+        "--where",
+        action="append",
+        type=_parse_assignment,
+        metavar="LOOKUP=VALUE",
+        help="Only include matching rows",
+    )
+    sn.add_argument("-o", "--output", help="Snapshot file (default: <model>.snapshot)")
+
     args = parser.parse_args()
 
     if not args.command:
@@ -130,6 +425,46 @@ def main():
 
         call_command("showmigrations", verbosity=args.verbosity)
         success = True
+    elif args.command == "export":
+        success = export(
+            args.model,
+            format=args.format,
+            output=args.output,
+            where=dict(args.where or []),
+            fields=args.fields,
+            exclude=args.exclude,
+            compress=args.gzip,
+            chunk_size=args.chunk_size,
+            verbosity=args.verbosity,
+        )
+    elif args.command == "import":
+        success = import_data(
+            args.model,
+            format=args.format,
+            input=args.input,
+            batch_size=args.batch_size,
+            start=args.skip_rows,
+            verbosity=args.verbosity,
+        )
+    elif args.command == "backfill":
+        success = backfill(
+            args.model,
+            values=dict(args.set),
+            where=dict(args.where or []),
+            batch_size=args.batch_size,
+            sleep=args.sleep,
+            checkpoint=args.checkpoint,
+            verbosity=args.verbosity,
+        )
+    elif args.command == "snapshot":
+        success = snapshot(
+            args.model,
+            args.key,
+            output=args.output,
+            fields=args.fields,
+            where=dict(args.where or []),
+            verbosity=args.verbosity,
+        )
     else:
         parser.print_help()
         success = False
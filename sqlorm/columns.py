@@ -0,0 +1,270 @@
+"""
+SQLORM Columns
+==============
+
+Pull whole columns out of a queryset as typed arrays.
+
+``to_columns()`` (also ``QuerySet.to_columns()``) reads ``values_list()``
+rows from the cursor in large chunks and copies each column into a typed
+buffer: a NumPy array, or a stdlib ``array.array`` when NumPy isn't wanted.
+No model instances or per-row dicts are built. The buffer type comes from
+the field class:
+
+    Field                        NumPy dtype         array typecode
+    Integer, AutoField, FK       int64               q
+    Float, Decimal               float64             d
+    Boolean                      bool                b
+    DateTime                     datetime64[us]      q (us since epoch, UTC)
+    Date                         datetime64[D]       q (days since epoch)
+    Duration                     timedelta64[us]     q (us)
+    anything else                object              (not supported)
+
+NULLs are stored as 0, ``False``, NaN or NaT (``-2**63`` in ``array``
+buffers), and every nullable column gets a boolean mask (``True`` where NULL)
+in the result's ``masks``.
+
+Example:
+    >>> cols = Task.objects.filter(is_completed=False).to_columns(
+    ...     ["priority", "due_date"]
+    ... )
+    >>> cols["priority"].mean()
+    2.4
+    >>> numpy.ma.array(cols["due_date"], mask=cols.masks["due_date"]).min()
+"""
+
+import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .exceptions import ConfigurationError
+
+DEFAULT_CHUNK_SIZE = 10_000
+BACKENDS = ("numpy", "array")
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MICROSECOND = timedelta(microseconds=1)
+# numpy's NaT, so NULL datetimes read back as NaT
+_NAT = -(2**63)
+
+
+def _datetime_us(value: datetime) -> int:
+    epoch = _EPOCH if value.tzinfo is None else _EPOCH_UTC
+    return (value - epoch) // _MICROSECOND
+
+
+def _date_days(value: date) -> int:
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def _duration_us(value: timedelta) -> int:
+    return value // _MICROSECOND
+
+
+class _ColumnType:
+    """How one field's values are stored."""
+
+    __slots__ = ("dtype", "typecode", "convert", "fill", "view")
+
+    def __init__(
+        self,
+        dtype: str,
+        typecode: Optional[str],
+        convert: Optional[Callable[[Any], Any]] = None,
+        fill: Any = 0,
+        view: Optional[str] = None,
+    ):
+        self.dtype = dtype
+        self.typecode = typecode
+        self.convert = convert
+        self.fill = fill
+        # NumPy dtype the int64 buffer is reinterpreted as at the end
+        self.view = view
+
+
+_INTEGER = _ColumnType("int64", "q")
+_FLOAT = _ColumnType("float64", "d", fill=float("nan"))
+_DECIMAL = _ColumnType("float64", "d", float, float("nan"))
+_BOOLEAN = _ColumnType("bool", "b", fill=False)
+_DATETIME = _ColumnType("int64", "q", _datetime_us, _NAT, "datetime64[us]")
+_DATE = _ColumnType("int64", "q", _date_days, _NAT, "datetime64[D]")
+_DURATION = _ColumnType("int64", "q", _duration_us, _NAT, "timedelta64[us]")
+_OBJECT = _ColumnType("object", None, fill=None)
+
+
+def _column_type(field) -> _ColumnType:
+    """Pick the storage for a field from its class."""
+    from django.db import models
+
+    if field.is_relation:
+        return _column_type(field.target_field)
+    if isinstance(field, models.BooleanField):
+        return _BOOLEAN
+    if isinstance(field, models.IntegerField):
+        return _INTEGER
+    if isinstance(field, models.FloatField):
+        return _FLOAT
+    if isinstance(field, models.DecimalField):
+        return _DECIMAL
+    if isinstance(field, models.DateTimeField):
+        return _DATETIME
+    if isinstance(field, models.DateField):
+        return _DATE
+    if isinstance(field, models.DurationField):
+        return _DURATION
+    return _OBJECT
+
+
+class Columns(dict):
+    """
+    Arrays by field name, all of the same length.
+
+    ``masks`` maps each nullable column to a boolean array that is ``True``
+    where the value was NULL.
+    """
+
+    def __init__(self, data=(), masks=None, length=0):
+        super().__init__(data)
+        self.masks: Dict[str, Any] = masks or {}
+        self.length = length
+
+    def __repr__(self):
+        return f"<Columns {list(self)} length={self.length}>"
+
+
+class _NumpyBuffer:
+    """Growable preallocated NumPy array."""
+
+    def __init__(self, numpy, dtype: str, capacity: int):
+        self.numpy = numpy
+        self.data = numpy.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def extend(self, values) -> None:
+        end = self.size + len(values)
+        if end > len(self.data):
+            # Rows were added since the count
+            grown = self.numpy.empty(max(end, 2 * len(self.data)), self.data.dtype)
+            grown[: self.size] = self.data[: self.size]
+            self.data = grown
+        self.data[self.size : end] = values
+        self.size = end
+
+    def result(self, view: Optional[str] = None):
+        data = self.data[: self.size]
+        return data.view(view) if view else data
+
+
+class _ArrayBuffer:
+    def __init__(self, typecode: str):
+        self.data = array.array(typecode)
+
+    def extend(self, values) -> None:
+        self.data.extend(values)
+
+    def result(self, view: Optional[str] = None):
+        return self.data
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ConfigurationError(
+            "to_columns(backend='numpy') needs NumPy. Run: pip install numpy"
+        ) from e
+    return numpy
+
+
+def to_columns(
+    queryset,
+    fields: Iterable[str],
+    backend: str = "numpy",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Columns:
+    """
+    Read columns of a queryset into typed arrays.
+
+    Args:
+        queryset: Rows to read; its filters and ordering apply
+        fields: Field names (``"pk"`` and foreign keys, as ids, included)
+        backend: ``"numpy"`` for NumPy arrays or ``"array"`` for stdlib
+            ``array.array`` buffers (numeric, date and duration fields only)
+        chunk_size: Rows fetched from the cursor at a time
+
+    Returns a ``Columns`` dict of arrays keyed by the given names.
+    Raises ``ConfigurationError`` if NumPy is requested but not installed.
+    """
+    from django.db import connections
+    from django.db.models.sql.constants import MULTI
+
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown backend {backend!r}. Choose from: {', '.join(BACKENDS)}"
+        )
+    names = list(fields)
+    if not names:
+        raise ValueError("to_columns() needs at least one field")
+    meta = queryset.model._meta
+    model_fields = [meta.pk if name == "pk" else meta.get_field(name) for name in names]
+    types = [_column_type(field) for field in model_fields]
+    if backend == "array":
+        for name, kind in zip(names, types):
+            if kind.typecode is None:
+                raise ValueError(
+                    f"{queryset.model.__name__}.{name} has no array typecode; "
+                    "use backend='numpy'"
+                )
+
+    qs = queryset.values_list(*[field.attname for field in model_fields])
+    if backend == "numpy":
+        numpy = _import_numpy()
+        # One COUNT query sizes every buffer up front
+        capacity = qs.count()
+        buffers = [_NumpyBuffer(numpy, kind.dtype, capacity) for kind in types]
+        masks = {
+            name: _NumpyBuffer(numpy, "bool", capacity)
+            for name, field in zip(names, model_fields)
+            if field.null
+        }
+    else:
+        buffers = [_ArrayBuffer(kind.typecode) for kind in types]
+        masks = {
+            name: _ArrayBuffer("b")
+            for name, field in zip(names, model_fields)
+            if field.null
+        }
+
+    connection = connections[qs.db]
+    compiler = qs.query.get_compiler(using=qs.db)
+    chunks = compiler.execute_sql(
+        MULTI,
+        chunked_fetch=connection.features.can_use_chunked_reads,
+        chunk_size=chunk_size,
+    )
+    length = 0
+    for chunk in chunks or ():
+        rows = list(compiler.results_iter([chunk]))
+        if not rows:
+            continue
+        length += len(rows)
+        for name, kind, buffer, values in zip(names, types, buffers, zip(*rows)):
+            mask = masks.get(name)
+            if mask is not None:
+                mask.extend([value is None for value in values])
+            convert, fill = kind.convert, kind.fill
+            if convert is not None:
+                values = [fill if value is None else convert(value) for value in values]
+            elif mask is not None and None in values:
+                values = [fill if value is None else value for value in values]
+            buffer.extend(values)
+
+    return Columns(
+        {
+            name: buffer.result(kind.view)
+            for name, kind, buffer in zip(names, types, buffers)
+        },
+        {name: mask.result() for name, mask in masks.items()},
+        length,
+    )
@@ -12,20 +12,28 @@ Example:
     ... }, migrations_dir='./migrations')
 """
 
+import copy
 import json
 import logging
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 from .exceptions import ConfigurationError
+from .mirror import apply_mirror_settings, close_mirrors
+from .pool import apply_pool_settings, close_pools
+from .routers import READ_STRATEGIES, ROLES, configure_routing
+from .sqlite import resolve_pragmas, set_pragmas
 
 logger = logging.getLogger("sqlorm")
 
 # Global state
 _django_configured = False
 _current_settings = {}
+# Arguments of the last configure() call, replayed by worker processes
+_configure_args: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
 _migrations_dir = None
+_database_roles: Dict[str, str] = {}
 
 DEFAULT_SETTINGS = {
     "DEBUG": False,
@@ -34,11 +42,21 @@ DEFAULT_SETTINGS = {
         "sqlorm.app",
     ],
     "DATABASES": {},
+    "DATABASE_ROUTERS": ["sqlorm.routers.DatabaseRouter"],
     "DEFAULT_AUTO_FIELD": "django.db.models.BigAutoField",
     "USE_TZ": True,
     "TIME_ZONE": "UTC",
 }
 
+# configure(minimal=True): only SQLORM's app, given as its AppConfig so no
+# app module discovery is needed, no translation catalogs and no logging
+# setup. Contenttypes (and generic relations) are unavailable.
+MINIMAL_SETTINGS = {
+    "INSTALLED_APPS": ["sqlorm.app.apps.SqlormAppConfig"],
+    "USE_I18N": False,
+    "LOGGING_CONFIG": None,
+}
+
 
 def _validate_database_config(database: Dict[str, Any]) -> None:
     """Validate database configuration."""
@@ -50,7 +68,46 @@ def _validate_database_config(database: Dict[str, Any]) -> None:
         raise ConfigurationError("Database config must include 'NAME'")
 
 
-def _setup_django():
+def _normalize_databases(
+    database: Dict[str, Any],
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """
+    Split a single config or an alias mapping into DATABASES and roles.
+
+    Returns ``(databases, roles)``. Without explicit roles, ``default`` is
+    the primary and other aliases are only used explicitly (``analytics``).
+    """
+    if not isinstance(database, dict):
+        raise ConfigurationError("Database configuration must be a dictionary")
+
+    if "ENGINE" in database or not all(isinstance(v, dict) for v in database.values()):
+        database = {"default": database}
+    if "default" not in database:
+        raise ConfigurationError("Database mapping must include a 'default' alias")
+
+    databases = {}
+    roles = {}
+    for alias, config in database.items():
+        _validate_database_config(config)
+        config = dict(config)
+        role = config.pop("ROLE", "primary" if alias == "default" else "analytics")
+        if role not in ROLES:
+            raise ConfigurationError(
+                f"Unknown role {role!r} for database {alias!r}. "
+                f"Choose from: {', '.join(ROLES)}"
+            )
+        databases[alias] = config
+        roles[alias] = role
+
+    primaries = [alias for alias, role in roles.items() if role == "primary"]
+    if len(primaries) != 1:
+        raise ConfigurationError(
+            f"Exactly one database must have ROLE 'primary', got {len(primaries)}"
+        )
+    return databases, roles
+
+
+def _setup_django(minimal: bool = False):
     """Initialize Django with current settings."""
     global _django_configured
 
@@ -64,7 +121,16 @@ def _setup_django():
         if not settings.configured:
             settings.configure(**_current_settings)
 
-        django.setup()
+        if minimal:
+            # django.setup() minus logging configuration and the URL script
+            # prefix, neither of which the ORM uses. The app registry is
+            # still populated the regular way: with one app it takes ~2 ms,
+            # too little to justify writing Django's private registry state
+            from django.apps import apps
+
+            apps.populate(settings.INSTALLED_APPS)
+        else:
+            django.setup()
         _django_configured = True
         logger.debug("Django ORM configured")
 
@@ -81,17 +147,47 @@ def configure(
     debug: bool = False,
     time_zone: str = "UTC",
     use_tz: bool = True,
+    sqlite_profile: Optional[str] = None,
+    sqlite_pragmas: Optional[Dict[str, Any]] = None,
+    read_strategy: str = "round-robin",
+    sticky_window: float = 2.0,
+    pool: Optional[Dict[str, Any]] = None,
+    sqlite_in_memory_mirror: Union[bool, Dict[str, Any]] = False,
+    minimal: bool = False,
+    lazy_models: bool = False,
     **extra_settings,
 ) -> None:
     """
     Configure SQLORM with a database connection.
 
     Args:
-        database: Database configuration dict with ENGINE and NAME keys
+        database: Database configuration dict with ENGINE and NAME keys, or a
+            mapping of aliases to such dicts. Each may set ``ROLE`` to
+            "primary" (exactly one; writes), "replica" (reads) or "analytics"
+            (explicit ``.using()`` only)
         migrations_dir: Path to store migrations (required for makemigrations)
         debug: Enable debug mode
         time_zone: Timezone string (default: UTC)
         use_tz: Use timezone-aware datetimes
+        sqlite_profile: SQLite pragma profile for every new connection: "safe",
+            "fast-wal", "bulk-load" or "read-only-analytics"
+        sqlite_pragmas: Extra SQLite pragmas, applied on top of the profile
+        read_strategy: How reads pick a replica: "round-robin" or "latency"
+            (lowest recent query latency)
+        sticky_window: Seconds after a write during which reads from the
+            same thread go to the primary
+        pool: Connection pool settings for every database: min_size,
+            max_size, timeout, idle_timeout, max_lifetime, health_check
+        sqlite_in_memory_mirror: Run SQLite file databases from an in-memory
+            copy, flushed back to the file periodically, on ``flush()`` and at
+            exit; ``True`` or a dict of ``flush_interval``/``pages_per_step``
+            (see ``sqlorm.mirror`` for the crash-safety tradeoffs)
+        minimal: Faster start-up for short-lived scripts: install only
+            SQLORM's app (no contenttypes), disable translations and skip
+            Django's logging setup. The app registry is populated as usual,
+            not restored from a precomputed state
+        lazy_models: Build models defined before ``configure()`` on first
+            use instead of all at once now
         **extra_settings: Additional Django settings
 
     Example:
@@ -100,16 +196,53 @@ def configure(
         ...     'NAME': 'mydb.sqlite3',
         ... }, migrations_dir='./migrations')
     """
-    global _current_settings, _django_configured, _migrations_dir
+    global _current_settings, _database_roles, _django_configured, _migrations_dir
+    global _configure_args
 
-    _validate_database_config(database)
+    _configure_args = (
+        copy.deepcopy(database),
+        {
+            "migrations_dir": migrations_dir,
+            "debug": debug,
+            "time_zone": time_zone,
+            "use_tz": use_tz,
+            "sqlite_profile": sqlite_profile,
+            "sqlite_pragmas": sqlite_pragmas,
+            "read_strategy": read_strategy,
+            "sticky_window": sticky_window,
+            "pool": pool,
+            "sqlite_in_memory_mirror": sqlite_in_memory_mirror,
+            "minimal": minimal,
+            "lazy_models": lazy_models,
+            **extra_settings,
+        },
+    )
+    databases, roles = _normalize_databases(database)
+    if read_strategy not in READ_STRATEGIES:
+        raise ConfigurationError(
+            f"Unknown read strategy {read_strategy!r}. "
+            f"Choose from: {', '.join(READ_STRATEGIES)}"
+        )
+    pragmas = resolve_pragmas(sqlite_profile, sqlite_pragmas)
+    close_pools()
+    # Write back (and drop) the previous configuration's mirrors first
+    close_mirrors()
+    databases = {
+        alias: apply_mirror_settings(alias, config, sqlite_in_memory_mirror)
+        for alias, config in databases.items()
+    }
+    databases = {
+        alias: apply_pool_settings(alias, config, pool)
+        for alias, config in databases.items()
+    }
 
     _current_settings = {
         **DEFAULT_SETTINGS,
+        **(MINIMAL_SETTINGS if minimal else {}),
         "DEBUG": debug,
         "TIME_ZONE": time_zone,
         "USE_TZ": use_tz,
-        "DATABASES": {"default": database},
+        "DATABASES": databases,
         **extra_settings,
     }
 
@@ -138,7 +271,17 @@ def configure(
         for key, value in _current_settings.items():
             setattr(settings, key, value)
     else:
-        _setup_django()
+        _setup_django(minimal)
+
+    _database_roles = roles
+    configure_routing(roles, read_strategy, sticky_window)
+    for alias in databases:
+        set_pragmas(alias, pragmas)
+
+    if not lazy_models:
+        from .base import materialize_deferred
+
+        materialize_deferred()
 
 
 def configure_from_file(file_path: Union[str, Path]) -> None:
@@ -176,6 +319,11 @@ def get_migrations_dir() -> Optional[Path]:
     return _migrations_dir
 
 
+def get_database_roles() -> Dict[str, str]:
+    """Get the role of each configured database alias."""
+    return dict(_database_roles)
+
+
 def is_configured() -> bool:
     """Check if SQLORM has been configured."""
     return _django_configured
@@ -23,3 +23,41 @@ class MigrationError(SQLORMError):
     """Migration error."""
 
     pass
+
+
+class BulkLoadError(SQLORMError):
+    """Bulk load failed part way through.
+
+    ``committed`` is the number of input rows (counted from the start of the
+    input, including skipped ones) that were committed before the failure;
+    pass it as ``start`` to resume.
+    """
+
+    def __init__(self, message, committed=0):
+        super().__init__(message)
+        self.committed = committed
+
+
+class BackfillError(SQLORMError):
+    """Backfill failed part way through.
+
+    ``last_pk`` is the primary key of the last committed row (``None`` if no
+    batch was committed). Batches up to it are recorded in the checkpoint,
+    so running the backfill again resumes after it.
+    """
+
+    def __init__(self, message, last_pk=None):
+        super().__init__(message)
+        self.last_pk = last_pk
+
+
+class PoolTimeout(SQLORMError):
+    """No pooled connection became available in time."""
+
+    pass
+
+
+class SnapshotError(SQLORMError):
+    """A snapshot file is missing, truncated or not a snapshot."""
+
+    pass
@@ -0,0 +1,217 @@
+"""
+SQLORM Export
+=============
+
+Stream a queryset to NDJSON or CSV with constant memory.
+
+Rows are read with a server-side cursor where the backend has one
+(PostgreSQL), or with primary-key ordered keyset scans otherwise, and are
+written out as they arrive.
+
+Example:
+    >>> from sqlorm.export import export_queryset
+    >>> with open("tasks.ndjson", "w") as f:
+    ...     export_queryset(Task.objects.filter(is_completed=False), f)
+"""
+
+import csv
+import gzip
+import io
+import json
+import sys
+import time
+from typing import IO, Any, Iterable, Iterator, Optional, Sequence, Tuple
+
+from .serializers import get_plan
+
+FORMATS = ("ndjson", "csv")
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def supports_server_side_cursors(connection) -> bool:
+    """Whether ``QuerySet.iterator()`` streams from a server-side cursor."""
+    return connection.vendor == "postgresql" and not connection.settings_dict.get(
+        "DISABLE_SERVER_SIDE_CURSORS"
+    )
+
+
+def iter_rows(
+    queryset, attnames: Sequence[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Yield ``values_list(*attnames)`` tuples without loading the whole table.
+
+    Uses a server-side cursor when available, otherwise walks the table in
+    ``WHERE pk > last ORDER BY pk LIMIT chunk_size`` pages.
+    """
+    from django.db import connections
+
+    from .queryset import iter_chunks
+
+    if supports_server_side_cursors(connections[queryset.db]):
+        yield from queryset.values_list(*attnames).iterator(chunk_size=chunk_size)
+        return
+
+    for chunk in iter_chunks(queryset.values_list(*attnames), size=chunk_size):
+        yield from chunk
+
+
+def format_duration(seconds: float) -> str:
+    """Short human duration, e.g. ``45s``, ``3m05s``, ``2h10m``."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m{seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m"
+
+
+class Progress:
+    """
+    Periodic row count and rows/sec report on a stream (stderr by default).
+
+    With a ``total``, reports also show the percentage done and an ETA.
+    """
+
+    def __init__(
+        self,
+        label: str = "rows",
+        stream: Optional[IO] = None,
+        interval: float = 1.0,
+        total: Optional[int] = None,
+    ):
+        self.label = label
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self.total = total
+        self.count = 0
+        self.started = time.monotonic()
+        self._next_report = self.started + interval
+        self._width = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        elapsed = self.elapsed
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds left at the current rate (``None`` without a total or rate)."""
+        rate = self.rate
+        if self.total is None or rate <= 0:
+            return None
+        return max(self.total - self.count, 0) / rate
+
+    def status(self) -> str:
+        if self.total is None:
+            return f"{self.count:,} {self.label} ({self.rate:,.0f}/s)"
+        done = min(self.count / self.total, 1.0) if self.total else 1.0
+        eta = self.eta
+        return (
+            f"{self.count:,}/{self.total:,} {self.label} ({done:.0%}, "
+            f"{self.rate:,.0f}/s, ETA {'?' if eta is None else format_duration(eta)})"
+        )
+
+    def update(self, count: int = 1) -> None:
+        self.count += count
+        now = time.monotonic()
+        if now >= self._next_report:
+            self._next_report = now + self.interval
+            status = self.status()
+            self._width = len(status)
+            self.stream.write(f"\r{status}")
+            self.stream.flush()
+
+    def finish(self) -> None:
+        # Padded to overwrite the last (possibly longer) status line
+        summary = (
+            f"{self.count:,} {self.label} in {self.elapsed:.2f}s ({self.rate:,.0f}/s)"
+        )
+        self.stream.write(f"\r{summary.ljust(self._width)}\n")
+        self.stream.flush()
+
+
+def open_output(path: Optional[str] = None, compress: bool = False) -> IO[str]:
+    """
+    Open a text stream for export output.
+
+    ``None`` or ``"-"`` writes to stdout. ``compress`` (or a ``.gz`` suffix)
+    gzip-compresses the output.
+    """
+    to_stdout = path in (None, "-")
+    compress = compress or (not to_stdout and str(path).endswith(".gz"))
+
+    if to_stdout:
+        if not compress:
+            return sys.stdout
+        return io.TextIOWrapper(
+            gzip.GzipFile(fileobj=sys.stdout.buffer, mode="wb"),
+            encoding="utf-8",
+            newline="",
+        )
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def export_queryset(
+    queryset,
+    out: IO[str],
+    format: str = "ndjson",
+    fields: Optional[Iterable[str]] = None,
+    exclude: Optional[Iterable[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Progress] = None,
+) -> int:
+    """
+    Write every row of a queryset to ``out``.
+
+    Args:
+        queryset: Rows to export (keyset scans are ordered by primary key)
+        out: Text stream to write to
+        format: ``"ndjson"`` or ``"csv"`` (with a header row)
+        fields: Only export these field names
+        exclude: Field names to leave out
+        chunk_size: Rows fetched per round trip
+        progress: Optional progress reporter
+
+    Returns the number of rows written.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format: {format!r}")
+
+    plan = get_plan(queryset.model, fields, exclude)
+    rows = iter_rows(queryset, plan.attnames, chunk_size)
+
+    from_row = plan.from_row
+    if format == "csv":
+        writer = csv.writer(out)
+        writer.writerow(plan.names)
+
+        def write(row):
+            writer.writerow(from_row(row).values())
+
+    else:
+        encode = json.JSONEncoder(default=str).encode
+
+        def write(row):
+            out.write(encode(from_row(row)) + "\n")
+
+    count = 0
+    for row in rows:
+        write(row)
+        count += 1
+        if progress is not None and not count % 1000:
+            progress.update(1000)
+
+    if progress is not None:
+        progress.update(count % 1000)
+        progress.finish()
+    return count
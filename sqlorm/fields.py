@@ -29,3 +29,11 @@ class FieldsProxy:
 
 
 fields = FieldsProxy()
+
+
+def __getattr__(name):
+    # ``sqlorm.fields`` may be this module rather than the proxy, depending
+    # on import order, so the module proxies field lookups too
+    if name.startswith("__"):
+        raise AttributeError(name)
+    return getattr(fields, name)
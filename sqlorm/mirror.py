@@ -0,0 +1,215 @@
+"""
+SQLORM In-Memory SQLite Mirror
+==============================
+
+Run a SQLite file database from memory and write it back periodically.
+
+With ``configure(..., sqlite_in_memory_mirror=True)`` each SQLite file
+database is copied into a shared in-memory database with SQLite's backup API
+at start-up, and every connection SQLORM opens for that alias goes to the
+copy. The copy is written back to the file with the backup API, a batch of
+pages at a time:
+
+- every ``flush_interval`` seconds, from a background thread
+- on ``sqlorm.flush()``
+- when the interpreter exits (``atexit``)
+
+Example:
+    >>> configure(
+    ...     {"ENGINE": "django.db.backends.sqlite3", "NAME": "jobs.sqlite3"},
+    ...     sqlite_in_memory_mirror={"flush_interval": 30},
+    ... )
+    >>> run_batch_job()
+    >>> flush()   # make the work so far durable now
+
+Crash safety: the file only holds what was flushed. Work committed since the
+last flush is lost if the process is killed (``SIGKILL``, default ``SIGTERM``
+handling, ``os._exit()``), crashes, or the machine loses power; ``atexit``
+covers normal exits, ``sys.exit()`` and uncaught exceptions. Each flush
+writes the file in one SQLite transaction, so after a crash the file holds
+either the previous flush or the new one, never a mix. The mirror assumes it
+is the file's only writer: a flush overwrites changes other processes made
+to the file.
+"""
+
+import atexit
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Union
+
+from .exceptions import ConfigurationError
+
+logger = logging.getLogger("sqlorm")
+
+MIRROR_DEFAULTS: Dict[str, Any] = {
+    # Seconds between background flushes; 0 or None disables the timer
+    "flush_interval": 60.0,
+    # Pages copied per backup step (-1: all at once); other connections can
+    # use the database between steps, and a write there restarts the copy
+    "pages_per_step": 1024,
+}
+
+_mirrors: Dict[str, "SQLiteMirror"] = {}
+_mirrors_lock = threading.Lock()
+_atexit_registered = False
+
+
+class SQLiteMirror:
+    """An in-memory copy of one SQLite file database."""
+
+    def __init__(self, alias: str, path: str, options: Dict[str, Any]):
+        self.alias = alias
+        self.path = path
+        self.flush_interval = options["flush_interval"]
+        self.pages_per_step = options["pages_per_step"]
+        # Named after the file: connections Django opened before a
+        # reconfigure keep reaching the same in-memory database
+        digest = hashlib.sha1(path.encode()).hexdigest()[:16]
+        self.uri = f"file:sqlorm-{alias}-{digest}?mode=memory&cache=shared"
+        self.flushes = 0
+        self.last_flush: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Keeps the in-memory database alive and is the source of flushes
+        self._keeper = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+
+    def load(self) -> None:
+        """Copy the file into memory (an absent file starts empty)."""
+        if not os.path.exists(self.path):
+            logger.debug(f"{self.path} doesn't exist yet; mirror starts empty")
+            return
+        started = time.monotonic()
+        source = sqlite3.connect(self.path)
+        try:
+            source.backup(self._keeper)
+        finally:
+            source.close()
+        logger.debug(
+            f"Loaded {self.path} into memory in {time.monotonic() - started:.3f}s"
+        )
+
+    def flush(self) -> float:
+        """Write the in-memory database to the file; returns the seconds taken."""
+        with self._lock:
+            started = time.monotonic()
+            target = sqlite3.connect(self.path)
+            try:
+                self._keeper.backup(target, pages=self.pages_per_step, sleep=0)
+            finally:
+                target.close()
+            elapsed = time.monotonic() - started
+            self.flushes += 1
+            self.last_flush = time.time()
+        logger.debug(f"Flushed {self.alias} to {self.path} in {elapsed:.3f}s")
+        return elapsed
+
+    def start(self) -> None:
+        if not self.flush_interval or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=f"sqlorm-mirror-{self.alias}", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Background flush of {self.alias} failed: {e}")
+
+    def close(self, flush: bool = True) -> None:
+        """Stop the timer, optionally flush, and release the memory copy."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.flush()
+        self._keeper.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "flushes": self.flushes,
+            "last_flush": self.last_flush,
+            "flush_interval": self.flush_interval,
+        }
+
+
+def _mirror_options(option: Union[bool, Dict[str, Any]]) -> Dict[str, Any]:
+    if option is True:
+        return dict(MIRROR_DEFAULTS)
+    unknown = set(option) - set(MIRROR_DEFAULTS)
+    if unknown:
+        raise ConfigurationError(
+            f"Unknown sqlite_in_memory_mirror option(s): {', '.join(sorted(unknown))}"
+        )
+    return {**MIRROR_DEFAULTS, **option}
+
+
+def apply_mirror_settings(
+    alias: str, database: Dict[str, Any], option: Union[bool, Dict[str, Any], None]
+) -> Dict[str, Any]:
+    """
+    Point one DATABASES entry at an in-memory mirror of its SQLite file.
+
+    Returns the database settings to hand to Django.
+    """
+    global _atexit_registered
+
+    if not option or database["ENGINE"] != "django.db.backends.sqlite3":
+        return database
+    name = str(database["NAME"])
+    if name == ":memory:" or "mode=memory" in name:
+        return database
+
+    mirror = SQLiteMirror(alias, os.path.abspath(name), _mirror_options(option))
+    mirror.load()
+    mirror.start()
+    with _mirrors_lock:
+        _mirrors[alias] = mirror
+    if not _atexit_registered:
+        atexit.register(close_mirrors)
+        _atexit_registered = True
+    return {**database, "NAME": mirror.uri}
+
+
+def flush(alias: Optional[str] = None) -> None:
+    """
+    Write in-memory mirrors back to their files now.
+
+    Args:
+        alias: Only this database (default: every mirrored database)
+    """
+    with _mirrors_lock:
+        mirrors = list(_mirrors.values())
+    if alias is not None:
+        mirrors = [mirror for mirror in mirrors if mirror.alias == alias]
+        if not mirrors:
+            raise ConfigurationError(f"Database {alias!r} is not mirrored in memory")
+    for mirror in mirrors:
+        mirror.flush()
+
+
+def close_mirrors() -> None:
+    """Flush and close every mirror (run at exit and on reconfigure)."""
+    with _mirrors_lock:
+        mirrors = list(_mirrors.values())
+        _mirrors.clear()
+    for mirror in mirrors:
+        try:
+            mirror.close()
+        except Exception as e:
+            logger.error(f"Final flush of {mirror.alias} to {mirror.path} failed: {e}")
+
+
+def mirror_stats() -> Dict[str, Dict[str, Any]]:
+    """Flush counts and times per mirrored database alias."""
+    with _mirrors_lock:
+        return {alias: mirror.stats() for alias, mirror in _mirrors.items()}
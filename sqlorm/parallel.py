@@ -0,0 +1,232 @@
+"""
+SQLORM Parallel Map
+===================
+
+Spread CPU-heavy per-row work over a pool of processes.
+
+``parallel_map()`` splits a queryset into primary-key ranges and hands them
+to worker processes, which read their range with their own database
+connections and stream ``fn``'s results back to the caller:
+
+    >>> from sqlorm import parallel_map
+    >>> def score(doc):
+    ...     return doc.pk, expensive_score(doc.body)
+    >>> for pk, value in parallel_map(Document.objects.filter(lang="en"), score):
+    ...     scores[pk] = value
+
+Workers never use connections inherited from the parent. With the ``fork``
+start method the parent closes its connections before the pool starts and
+children drop any inherited handles unused. With ``spawn``/``forkserver``
+children replay the parent's ``configure()`` call and import the modules
+that define its models. Keep writes in the caller (or pass ``batch=True``
+and return write batches from ``fn``): on SQLite a single writer avoids
+lock contention.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from .exceptions import ConfigurationError
+
+logger = logging.getLogger("sqlorm")
+
+DEFAULT_CHUNK_SIZE = 5000
+CHUNK_STRATEGIES = ("pk-range",)
+
+# Set in each worker by _init_worker(): (queryset, fn, batch)
+_worker_state: Optional[Tuple[Any, Callable, bool]] = None
+
+
+def _dump_queryset(queryset) -> tuple:
+    """
+    Picklable description of a queryset (pickling one evaluates it).
+
+    Only the model label and alias are plain values: the query refers to
+    model classes, which a spawned worker can't resolve until it has called
+    ``configure()`` and imported their modules, so it stays a pickled blob.
+    """
+    return (
+        queryset.model._meta.label,
+        queryset.db,
+        pickle.dumps(
+            (
+                queryset.query,
+                queryset._iterable_class,
+                queryset._fields,
+                queryset._prefetch_related_lookups,
+            )
+        ),
+    )
+
+
+def _load_queryset(spec: tuple):
+    from django.apps import apps
+
+    label, alias, blob = spec
+    query, iterable_class, fields, prefetch = pickle.loads(blob)
+    queryset = apps.get_model(label)._base_manager.db_manager(alias).all()
+    queryset.query = query
+    queryset._iterable_class = iterable_class
+    queryset._fields = fields
+    queryset._prefetch_related_lookups = prefetch
+    return queryset
+
+
+def _pk_ranges(queryset, chunk_size: int) -> List[Tuple[Any, Any]]:
+    """Inclusive ``(first, last)`` primary keys of consecutive chunks."""
+    from .queryset import iter_chunks
+
+    pks = queryset.order_by().values_list("pk", flat=True)
+    return [(chunk[0], chunk[-1]) for chunk in iter_chunks(pks, size=chunk_size)]
+
+
+def _available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _drop_inherited_connections() -> None:
+    """Forget connections copied from the parent by ``fork``, unclosed."""
+    from django.db import connections
+
+    from . import pool
+
+    for connection in connections.all(initialized_only=True):
+        # Closing would end the parent's session on shared sockets
+        connection.connection = None
+        connection.in_atomic_block = False
+        connection.savepoint_ids = []
+        # psycopg's native pools (Django 5.1+), whose threads didn't survive
+        getattr(type(connection), "_connection_pools", {}).clear()
+    with pool._pools_lock:
+        pool._pools.clear()
+
+
+def _init_worker(configure_args, modules, spec, fn, batch) -> None:
+    global _worker_state
+
+    from . import config
+
+    if config.is_configured():
+        # Forked: settings and models came along
+        _drop_inherited_connections()
+    else:
+        database, options = configure_args
+        config.configure(database, **options)
+    for name in modules:
+        if name not in sys.modules:
+            importlib.import_module(name)
+    if isinstance(fn, bytes):
+        # Unpickled only now, as it may refer to the models
+        fn = pickle.loads(fn)
+    _worker_state = (_load_queryset(spec), fn, batch)
+
+
+def _run_chunk(bounds: Tuple[Any, Any]) -> list:
+    queryset, fn, batch = _worker_state
+    first, last = bounds
+    rows = list(queryset.filter(pk__gte=first, pk__lte=last).order_by("pk"))
+    if batch:
+        return list(fn(rows) or ())
+    return [fn(row) for row in rows]
+
+
+def parallel_map(
+    queryset,
+    fn: Callable,
+    workers: Optional[int] = None,
+    chunk: str = "pk-range",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    batch: bool = False,
+    ordered: bool = False,
+    start_method: Optional[str] = None,
+) -> Iterator[Any]:
+    """
+    Apply ``fn`` to every row of a queryset in worker processes.
+
+    Args:
+        queryset: Rows to process (instances, ``values()`` or
+            ``values_list()``); prefetches run per chunk in the workers
+        fn: Called with each row; must be picklable (a module-level
+            function) unless the start method is ``fork``
+        workers: Number of processes (default: CPUs available)
+        chunk: How rows are split; ``"pk-range"``: consecutive primary-key
+            ranges of ``chunk_size`` rows
+        chunk_size: Rows per chunk, read by a worker in one query
+        batch: Call ``fn`` once per chunk with the list of rows instead;
+            it returns an iterable of results (e.g. rows to write)
+        ordered: Yield results in primary-key order instead of as chunks
+            finish
+        start_method: ``multiprocessing`` start method (default: the
+            platform's)
+
+    Yields ``fn``'s results as worker chunks complete. Leaving the loop
+    early terminates the workers.
+    """
+    from django.db import connections
+
+    from . import config
+    from .base import get_models
+
+    if chunk not in CHUNK_STRATEGIES:
+        raise ValueError(
+            f"Unknown chunk strategy {chunk!r}. Choose from: "
+            f"{', '.join(CHUNK_STRATEGIES)}"
+        )
+    if config._configure_args is None:
+        raise ConfigurationError("parallel_map() needs sqlorm.configure() first")
+    connection = connections[queryset.db]
+    if connection.vendor == "sqlite" and connection.is_in_memory_db():
+        raise ConfigurationError(
+            "parallel_map() workers can't see an in-memory SQLite database"
+        )
+    if any(conn.in_atomic_block for conn in connections.all(initialized_only=True)):
+        raise ConfigurationError("parallel_map() can't run inside a transaction")
+
+    ranges = _pk_ranges(queryset, chunk_size)
+    if not ranges:
+        return
+    workers = min(workers or _available_cpus(), len(ranges))
+    modules = sorted(
+        {
+            model._sqlorm_module
+            for model in get_models().values()
+            if getattr(model, "_sqlorm_module", None)
+            and model._sqlorm_module not in ("__main__", "__mp_main__")
+        }
+    )
+
+    # Children must not share the parent's connections
+    connections.close_all()
+    context = multiprocessing.get_context(start_method)
+    # fork passes initargs as they are, so fn may be a lambda or closure;
+    # other start methods unpickle initargs before _init_worker() runs
+    fork = context.get_start_method() == "fork"
+    pool = context.Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(
+            config._configure_args,
+            modules,
+            _dump_queryset(queryset),
+            fn if fork else pickle.dumps(fn),
+            batch,
+        ),
+    )
+    logger.debug(
+        f"parallel_map: {len(ranges)} chunks on {workers} "
+        f"{context.get_start_method()} workers"
+    )
+    try:
+        run = pool.imap if ordered else pool.imap_unordered
+        for results in run(_run_chunk, ranges):
+            yield from results
+    finally:
+        pool.terminate()
+        pool.join()
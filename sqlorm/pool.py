@@ -0,0 +1,381 @@
+"""
+SQLORM Connection Pooling
+=========================
+
+Connection pooling and lifecycle helpers for long-running standalone
+processes, which never run Django's per-request connection cleanup.
+
+``configure(pool={...})`` picks the best pool per database:
+
+- PostgreSQL with psycopg 3 (Django 5.1+): psycopg's native pool
+- SQLite (file databases): a thread-safe ``ConnectionPool`` shared by all
+  threads of the process
+- Anything else: persistent per-thread connections (``CONN_MAX_AGE``) with
+  health checks
+
+Example:
+    >>> configure({...}, pool={"max_size": 8, "idle_timeout": 60})
+    >>>
+    >>> def worker():
+    ...     while True:
+    ...         with connection_scope():
+    ...             handle(next_job())
+    >>>
+    >>> pool_stats()
+    {'default': {'size': 3, 'idle': 3, 'checkouts': 1200, 'creations': 3, ...}}
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .exceptions import ConfigurationError, PoolTimeout
+
+logger = logging.getLogger("sqlorm")
+
+POOL_DEFAULTS = {
+    "min_size": 0,
+    "max_size": 10,
+    "timeout": 30.0,
+    "idle_timeout": 300.0,
+    "max_lifetime": 3600.0,
+    "health_check": True,
+}
+
+# Pool settings per database alias, set by configure()
+_pool_configs: Dict[str, Dict[str, Any]] = {}
+# Live sqlorm pools per database alias
+_pools: Dict[str, "ConnectionPool"] = {}
+_pools_lock = threading.Lock()
+
+
+class _Entry:
+    __slots__ = ("connection", "created", "last_used")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created = self.last_used = time.monotonic()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections.
+
+    Args:
+        factory: Callable that opens a new connection
+        min_size: Connections opened up front and kept when idle
+        max_size: Upper bound on open connections
+        timeout: Seconds ``getconn()`` waits for a free connection
+        idle_timeout: Close connections idle for longer than this
+        max_lifetime: Close connections older than this
+        check: Callable run on a connection at checkout; raising discards it
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        min_size: int = 0,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        idle_timeout: Optional[float] = 300.0,
+        max_lifetime: Optional[float] = 3600.0,
+        check: Optional[Callable[[Any], None]] = None,
+    ):
+        if max_size < 1 or min_size > max_size:
+            raise ConfigurationError(
+                "Pool needs 1 <= max_size and min_size <= max_size"
+            )
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.check = check
+
+        self._idle: List[_Entry] = []
+        self._in_use: Dict[int, _Entry] = {}
+        self._opening = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "creations": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "expired": 0,
+        }
+
+        for _ in range(min_size):
+            self._idle.append(_Entry(self.factory()))
+        self._stats["creations"] = min_size
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        if self.max_lifetime is not None and now - entry.created >= self.max_lifetime:
+            return True
+        if (
+            self.idle_timeout is not None
+            and now - entry.last_used >= self.idle_timeout
+            and len(self._idle) + len(self._in_use) > self.min_size
+        ):
+            return True
+        return False
+
+    @staticmethod
+    def _discard(entry: _Entry) -> None:
+        try:
+            entry.connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+
+    def getconn(self):
+        """Check out a connection, waiting up to ``timeout`` seconds."""
+        deadline = None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise ConfigurationError("Connection pool is closed")
+                now = time.monotonic()
+                while self._idle:
+                    entry = self._idle.pop()
+                    if self._expired(entry, now):
+                        self._stats["expired"] += 1
+                        self._discard(entry)
+                        continue
+                    if self.check is not None:
+                        try:
+                            self.check(entry.connection)
+                        except Exception:
+                            self._stats["health_check_failures"] += 1
+                            self._discard(entry)
+                            continue
+                    return self._checkout(entry)
+
+                if len(self._in_use) + self._opening < self.max_size:
+                    self._opening += 1
+                    break
+
+                if deadline is None:
+                    deadline = now + self.timeout
+                    self._stats["waits"] += 1
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No connection available within {self.timeout}s "
+                        f"(max_size={self.max_size})"
+                    )
+                started = time.monotonic()
+                self._cond.wait(remaining)
+                self._stats["wait_time"] += time.monotonic() - started
+
+        # Open outside the lock so slow connects don't block checkins
+        try:
+            entry = _Entry(self.factory())
+        finally:
+            with self._cond:
+                self._opening -= 1
+        with self._cond:
+            self._stats["creations"] += 1
+            return self._checkout(entry)
+
+    def _checkout(self, entry: _Entry):
+        self._stats["checkouts"] += 1
+        self._in_use[id(entry.connection)] = entry
+        return entry.connection
+
+    def putconn(self, connection, discard: bool = False) -> None:
+        """Return a connection to the pool (or close it if ``discard``)."""
+        with self._cond:
+            entry = self._in_use.pop(id(connection), None)
+            if entry is None:
+                discard = True
+                entry = _Entry(connection)
+            if not discard and not self._closed:
+                if getattr(connection, "in_transaction", False):
+                    try:
+                        connection.rollback()
+                    except Exception:
+                        discard = True
+            if discard or self._closed or self._expired(entry, time.monotonic()):
+                self._discard(entry)
+            else:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Close idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool counters plus current size, idle and checked-out counts."""
+        with self._cond:
+            return {
+                "size": len(self._idle) + len(self._in_use),
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                **self._stats,
+            }
+
+
+def check_sqlite_connection(connection) -> None:
+    """Health check run on pooled SQLite connections at checkout."""
+    connection.execute("SELECT 1").fetchone()
+
+
+def get_pool(
+    alias: str, factory: Optional[Callable[[], Any]] = None
+) -> Optional["ConnectionPool"]:
+    """
+    Get the sqlorm pool of a database alias.
+
+    Creates it with ``factory`` if there is none; without a factory returns
+    ``None`` instead (e.g. after ``close_pools()``).
+    """
+    pool = _pools.get(alias)
+    if pool is None and factory is not None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                config = {**POOL_DEFAULTS, **_pool_configs.get(alias, {})}
+                pool = _pools[alias] = ConnectionPool(
+                    factory,
+                    min_size=config["min_size"],
+                    max_size=config["max_size"],
+                    timeout=config["timeout"],
+                    idle_timeout=config["idle_timeout"],
+                    max_lifetime=config["max_lifetime"],
+                    check=check_sqlite_connection if config["health_check"] else None,
+                )
+    return pool
+
+
+def close_pools() -> None:
+    """Close every sqlorm-managed pool."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+def _psycopg_pool_available() -> bool:
+    try:
+        import django
+        import psycopg  # noqa: F401
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        return False
+    return django.VERSION >= (5, 1)
+
+
+def apply_pool_settings(
+    alias: str, database: Dict[str, Any], pool: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Rewrite one DATABASES entry to use the best available pool.
+
+    Returns the database settings to hand to Django.
+    """
+    _pool_configs.pop(alias, None)
+    if not pool:
+        return database
+
+    unknown = set(pool) - set(POOL_DEFAULTS)
+    if unknown:
+        raise ConfigurationError(
+            f"Unknown pool option(s): {', '.join(sorted(unknown))}"
+        )
+    config = {**POOL_DEFAULTS, **pool}
+    database = dict(database)
+    engine = database["ENGINE"]
+
+    if engine == "django.db.backends.sqlite3":
+        name = str(database["NAME"])
+        if name == ":memory:" or "mode=memory" in name:
+            # Every connection to an in-memory database is a separate database
+            return database
+        database["ENGINE"] = "sqlorm.backends.sqlite3"
+        _pool_configs[alias] = config
+    elif engine == "django.db.backends.postgresql" and _psycopg_pool_available():
+        from psycopg_pool import ConnectionPool as PsycopgPool
+
+        options = dict(database.get("OPTIONS", {}))
+        options["pool"] = {
+            "min_size": config["min_size"],
+            "max_size": config["max_size"],
+            "timeout": config["timeout"],
+            "max_idle": config["idle_timeout"],
+            "max_lifetime": config["max_lifetime"],
+        }
+        if config["health_check"]:
+            options["pool"]["check"] = PsycopgPool.check_connection
+        database["OPTIONS"] = options
+        database["CONN_MAX_AGE"] = 0
+    else:
+        logger.debug(
+            f"No native pool for {engine}; using persistent connections for {alias}"
+        )
+        database.setdefault("CONN_MAX_AGE", config["max_lifetime"])
+        database.setdefault("CONN_HEALTH_CHECKS", config["health_check"])
+    return database
+
+
+def pool_stats(alias: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Pool statistics per database alias.
+
+    Includes ``checkouts``, ``creations``, ``waits`` and the current
+    ``size``/``idle`` counts. Aliases without a pool are omitted.
+    """
+    from django.db import connections
+
+    aliases = [alias] if alias else list(connections.settings)
+    result = {}
+    for name in aliases:
+        if name in _pools:
+            result[name] = _pools[name].stats()
+            continue
+        native = getattr(connections[name], "pool", None)
+        if native is not None and hasattr(native, "get_stats"):
+            stats = native.get_stats()
+            result[name] = {
+                "size": stats.get("pool_size", 0),
+                "idle": stats.get("pool_available", 0),
+                "min_size": stats.get("pool_min", 0),
+                "max_size": stats.get("pool_max", 0),
+                "checkouts": stats.get("requests_num", 0),
+                "creations": stats.get("connections_num", 0),
+                "waits": stats.get("requests_queued", 0),
+                "wait_time": stats.get("requests_wait_ms", 0) / 1000.0,
+                "timeouts": stats.get("requests_errors", 0),
+            }
+    return result
+
+
+@contextmanager
+def connection_scope() -> Iterator[None]:
+    """
+    Unit-of-work boundary for workers and daemons.
+
+    Mirrors what Django does around each web request: connections that are
+    broken or past their lifetime are closed on entry and exit, and pooled
+    connections are handed back to their pool on exit.
+    """
+    from django.db import close_old_connections
+
+    close_old_connections()
+    try:
+        yield
+    finally:
+        close_old_connections()
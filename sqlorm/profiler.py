@@ -0,0 +1,333 @@
+"""
+SQLORM Query Profiler
+=====================
+
+Record every query run inside a block, group them by shape and flag N+1
+patterns, without ``debug=True``.
+
+Example:
+    >>> import sqlorm
+    >>> with sqlorm.profile() as p:
+    ...     for task in Task.objects.all():
+    ...         print(task.owner.name)
+    >>> print(p.report())
+    101 queries in 0.048s, 2 shapes
+    ...
+    N+1 suspects:
+      100x at jobs.py:12 in main
+           SELECT ... FROM "sqlorm_app_user" WHERE "sqlorm_app_user"."id" = %s ...
+
+Queries are captured with ``connection.execute_wrapper()`` on the current
+thread's connection for every configured alias. The per-query cost is two
+clock reads, a short walk up the stack to the first frame outside Django and
+SQLORM, and folding the query into its shape's group. Only the most recent
+``max_records`` queries are kept individually, and parameters only with
+``record_params=True``, so memory stays flat over a long batch job.
+"""
+
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack
+from typing import IO, Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+# Query groups issued from one call site at least this often are N+1 suspects
+N_PLUS_ONE_THRESHOLD = 10
+
+# Individual queries kept by a profile; older ones only count in their group
+MAX_RECORDS = 1000
+
+# Raw SQL strings remembered with their shape before the memo is cleared
+_SHAPE_MEMO_SIZE = 4096
+
+_IN_LIST_RE = re.compile(r"IN \((?:%s, )*%s\)")
+_VALUES_LIST_RE = re.compile(r"VALUES (?:\((?:%s, )*%s\), )*\((?:%s, )*%s\)")
+
+CallSite = Tuple[str, int, str]
+
+
+def normalize_sql(sql: str) -> str:
+    """Query shape: ``IN (...)`` and multi-row ``VALUES`` lists collapsed."""
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    return _VALUES_LIST_RE.sub("VALUES (...)", sql)
+
+
+def _package_dir(module_name: str) -> Optional[str]:
+    module = sys.modules.get(module_name)
+    path = getattr(module, "__file__", None)
+    return os.path.dirname(path) + os.sep if path else None
+
+
+class QueryRecord:
+    """One executed query."""
+
+    __slots__ = ("alias", "sql", "params", "many", "duration", "rowcount", "site")
+
+    def __init__(self, alias, sql, params, many, duration, rowcount, site):
+        self.alias = alias
+        self.sql = sql
+        self.params = params
+        self.many = many
+        self.duration = duration
+        self.rowcount = rowcount
+        self.site = site
+
+    def __repr__(self):
+        return (
+            f"<QueryRecord {self.alias} {self.duration * 1000:.2f}ms {self.sql[:60]!r}>"
+        )
+
+
+class QueryGroup:
+    """
+    Queries that share a shape.
+
+    ``sites`` counts queries per call site and ``site_time`` sums their
+    duration; ``sample`` is the slowest query of the group.
+    """
+
+    def __init__(self, shape: str):
+        self.shape = shape
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # Rows reported by the driver (None when it reports none, e.g. SQLite
+        # SELECTs)
+        self.rows: Optional[int] = None
+        self.sites: Counter = Counter()
+        self.site_time: Dict[CallSite, float] = defaultdict(float)
+        self.sample: Optional[QueryRecord] = None
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, record: QueryRecord) -> None:
+        self.count += 1
+        self.total += record.duration
+        if self.sample is None or record.duration > self.max:
+            self.max = record.duration
+            self.sample = record
+        if record.rowcount is not None:
+            self.rows = (self.rows or 0) + record.rowcount
+        self.sites[record.site] += 1
+        self.site_time[record.site] += record.duration
+
+    def __repr__(self):
+        return (
+            f"<QueryGroup count={self.count} total={self.total:.4f}s "
+            f"{self.shape[:60]!r}>"
+        )
+
+
+class Profile:
+    """
+    Queries recorded by ``profile()``.
+
+    Attributes:
+        queries: The most recent ``max_records`` ``QueryRecord``s, in
+            execution order
+        count: Number of queries run, including those no longer in
+            ``queries``
+        elapsed: Wall time of the profiled block in seconds
+    """
+
+    def __init__(
+        self,
+        using: Optional[Sequence[str]] = None,
+        record_params: bool = False,
+        n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD,
+        output: Optional[IO[str]] = None,
+        max_records: int = MAX_RECORDS,
+    ):
+        self.using = using
+        self.record_params = record_params
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.output = output
+        self.queries: Deque[QueryRecord] = deque(maxlen=max_records)
+        self.count = 0
+        self.elapsed = 0.0
+        self._total = 0.0
+        self._groups: Dict[str, QueryGroup] = {}
+        self._shapes: Dict[str, str] = {}
+        self._aliases: Counter = Counter()
+        self._stack: Optional[ExitStack] = None
+        self._started = 0.0
+        self._internal: Dict[Any, bool] = {}
+        self._skip_dirs = tuple(
+            d for d in (_package_dir("django"), _package_dir("sqlorm")) if d
+        )
+
+    def __enter__(self) -> "Profile":
+        from django.db import connections
+
+        aliases = self.using or list(connections.settings)
+        self._stack = ExitStack()
+        for alias in aliases:
+            self._stack.enter_context(
+                connections[alias].execute_wrapper(self._wrapper(alias))
+            )
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.perf_counter() - self._started
+        self._stack.close()
+        self._stack = None
+        if self.output is not None:
+            self.output.write(self.report() + "\n")
+        return False
+
+    def _call_site(self) -> CallSite:
+        frame = sys._getframe(2)
+        internal = self._internal
+        while frame is not None:
+            code = frame.f_code
+            skip = internal.get(code)
+            if skip is None:
+                skip = internal[code] = code.co_filename.startswith(self._skip_dirs)
+            if not skip:
+                return (code.co_filename, frame.f_lineno, code.co_name)
+            frame = frame.f_back
+        return ("<unknown>", 0, "")
+
+    def _add(self, record: QueryRecord) -> None:
+        self.count += 1
+        self._total += record.duration
+        self._aliases[record.alias] += 1
+        self.queries.append(record)
+
+        shapes = self._shapes
+        shape = shapes.get(record.sql)
+        if shape is None:
+            if len(shapes) >= _SHAPE_MEMO_SIZE:
+                shapes.clear()
+            shape = shapes[record.sql] = normalize_sql(record.sql)
+        group = self._groups.get(shape)
+        if group is None:
+            group = self._groups[shape] = QueryGroup(shape)
+        group.add(record)
+
+    def _wrapper(self, alias: str):
+        add = self._add
+        record_params = self.record_params
+        call_site = self._call_site
+        perf_counter = time.perf_counter
+
+        def wrapper(execute, sql, params, many, context):
+            started = perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                duration = perf_counter() - started
+                rowcount = getattr(context["cursor"], "rowcount", -1)
+                add(
+                    QueryRecord(
+                        alias,
+                        sql,
+                        params if record_params else None,
+                        many,
+                        duration,
+                        rowcount if rowcount >= 0 else None,
+                        call_site(),
+                    )
+                )
+
+        return wrapper
+
+    @property
+    def total_time(self) -> float:
+        """Seconds spent executing queries."""
+        return self._total
+
+    def groups(self) -> List[QueryGroup]:
+        """Query groups by shape, slowest total time first."""
+        return sorted(self._groups.values(), key=lambda g: g.total, reverse=True)
+
+    def n_plus_one(
+        self, threshold: Optional[int] = None
+    ) -> List[Tuple[QueryGroup, CallSite, int]]:
+        """
+        N+1 suspects: SELECT shapes issued at least ``threshold`` times from
+        one call site, as ``(group, site, count)`` with the most repeated first.
+        """
+        threshold = threshold or self.n_plus_one_threshold
+        suspects = []
+        for group in self.groups():
+            if not group.shape.lstrip().upper().startswith("SELECT"):
+                continue
+            for site, count in group.sites.items():
+                if count >= threshold:
+                    suspects.append((group, site, count))
+        return sorted(suspects, key=lambda s: s[2], reverse=True)
+
+    def by_alias(self) -> Dict[str, int]:
+        """Number of queries per database alias."""
+        return dict(self._aliases)
+
+    def report(self, limit: int = 10, width: int = 100) -> str:
+        """Ranked text report of the slowest shapes and N+1 suspects."""
+
+        def short(sql):
+            return sql if len(sql) <= width else sql[: width - 3] + "..."
+
+        def where(site):
+            filename, lineno, function = site
+            return f"{os.path.relpath(filename)}:{lineno} in {function}"
+
+        groups = self.groups()
+        lines = [
+            f"{self.count} queries in {self.total_time:.3f}s "
+            f"({self.elapsed:.3f}s elapsed), {len(groups)} shapes",
+            "",
+            f"{'#':>3} {'count':>6} {'total ms':>10} {'mean ms':>9} "
+            f"{'max ms':>9} {'rows':>7}  query",
+        ]
+        for rank, group in enumerate(groups[:limit], 1):
+            site, _ = group.sites.most_common(1)[0]
+            lines.append(
+                f"{rank:>3} {group.count:>6} {group.total * 1000:>10.2f} "
+                f"{group.mean * 1000:>9.2f} {group.max * 1000:>9.2f} "
+                f"{'-' if group.rows is None else group.rows:>7}  "
+                f"{short(group.shape)}"
+            )
+            lines.append(f"{'':>50}  at {where(site)}")
+        if len(groups) > limit:
+            lines.append(f"... {len(groups) - limit} more shapes")
+
+        suspects = self.n_plus_one()
+        if suspects:
+            lines += ["", "N+1 suspects:"]
+            for group, site, count in suspects:
+                lines.append(f"  {count}x at {where(site)}")
+                lines.append(f"       {short(group.shape)}")
+        return "\n".join(lines)
+
+
+def profile(
+    using: Optional[Sequence[str]] = None,
+    record_params: bool = False,
+    n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD,
+    output: Optional[IO[str]] = None,
+    max_records: int = MAX_RECORDS,
+) -> Profile:
+    """
+    Profile the queries run in a ``with`` block on the current thread.
+
+    Args:
+        using: Database aliases to watch (default: all configured)
+        record_params: Keep query parameters on each record (off by
+            default, since they may hold sensitive values)
+        n_plus_one_threshold: Repeats from one call site that count as N+1
+        output: Stream to write the report to when the block exits
+        max_records: Individual queries to keep in ``Profile.queries``;
+            groups and totals cover every query regardless
+
+    Example:
+        >>> with profile(output=sys.stderr) as p:
+        ...     run_job()
+        >>> p.n_plus_one()
+    """
+    return Profile(using, record_params, n_plus_one_threshold, output, max_records)
@@ -0,0 +1,297 @@
+"""
+SQLORM QuerySet
+===============
+
+QuerySet and Manager installed as ``objects`` on every SQLORM model.
+
+Adds bulk serialization helpers and ``records()``, which read
+``values_list()`` tuples in chunks and never build model instances. Results
+are served from the model's query cache when ``Meta.cache`` is set (see
+``sqlorm.cache``).
+
+``iter_chunks()`` (also ``Model.iter_chunks()``) walks a queryset in keyset
+pages, ``WHERE key > last ORDER BY key LIMIT size``, so every page costs the
+same however deep into the table it is.
+
+Example:
+    >>> for row in Task.objects.filter(is_completed=False).to_dicts():
+    ...     print(row["title"])
+    >>> for chunk in Task.iter_chunks(size=5000, prefetch=["tags"]):
+    ...     process(chunk)
+    >>> with open("tasks.ndjson", "w") as f:
+    ...     f.writelines(line + "\\n" for line in Task.objects.to_json_lines())
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from django.db import models
+from django.db.models.query import (
+    FlatValuesListIterable,
+    ModelIterable,
+    ValuesIterable,
+    ValuesListIterable,
+)
+
+from . import cache
+from .serializers import get_plan
+
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_PAGE_SIZE = 5000
+
+_json_encoder = json.JSONEncoder(default=str)
+
+
+class SqlormQuerySet(models.QuerySet):
+    """QuerySet with bulk serialization helpers and query caching."""
+
+    def _fetch_all(self):
+        model_cache = cache.get_cache(self.model)
+        if self._result_cache is None and model_cache is not None:
+            key = cache.cache_key(self)
+            if key is not None:
+                rows = model_cache.get(key)
+                if rows is not cache._MISS:
+                    self._result_cache = rows
+                    return
+                generation = model_cache.generation
+                super()._fetch_all()
+                if len(self._result_cache) <= model_cache.max_rows:
+                    model_cache.set(key, self._result_cache, generation)
+                return
+        super()._fetch_all()
+
+    def update(self, **kwargs):
+        try:
+            return super().update(**kwargs)
+        finally:
+            cache.invalidate(self.model)
+
+    update.alters_data = True
+
+    def _update(self, values):
+        try:
+            return super()._update(values)
+        finally:
+            cache.invalidate(self.model)
+
+    _update.alters_data = True
+    _update.queryset_only = False
+
+    def delete(self):
+        try:
+            return super().delete()
+        finally:
+            cache.invalidate_related(self.model)
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def _raw_delete(self, using):
+        try:
+            return super()._raw_delete(using)
+        finally:
+            cache.invalidate_related(self.model)
+
+    _raw_delete.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        try:
+            return super().bulk_create(objs, *args, **kwargs)
+        finally:
+            cache.invalidate(self.model)
+
+    bulk_create.alters_data = True
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        try:
+            return super().bulk_update(objs, fields, batch_size=batch_size)
+        finally:
+            cache.invalidate(self.model)
+
+    bulk_update.alters_data = True
+
+    def to_dicts(
+        self,
+        fields: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield one dict per row, like ``instance.to_dict()``.
+
+        Rows are read with ``values_list().iterator(chunk_size=...)`` so no
+        model instances are created and memory stays bounded.
+        """
+        plan = get_plan(self.model, fields, exclude)
+        from_row = plan.from_row
+        for row in self.values_list(*plan.attnames).iterator(chunk_size=chunk_size):
+            yield from_row(row)
+
+    def to_json_lines(
+        self,
+        fields: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[str]:
+        """Yield one JSON document per row (without trailing newlines)."""
+        encode = _json_encoder.encode
+        for row in self.to_dicts(fields, exclude, chunk_size):
+            yield encode(row)
+
+    def to_columns(
+        self,
+        fields: Iterable[str],
+        backend: str = "numpy",
+        chunk_size: int = 10_000,
+    ) -> Dict[str, Any]:
+        """Read columns into typed arrays (see ``sqlorm.columns``)."""
+        from .columns import to_columns
+
+        return to_columns(self, fields, backend, chunk_size)
+
+    def records(
+        self,
+        fields: Optional[Iterable[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Any]:
+        """Yield compact read-only records (see ``sqlorm.records``)."""
+        from .records import records
+
+        return records(self, fields, chunk_size)
+
+
+def _key_columns(model, key: Union[str, Sequence[str]]) -> List[Tuple[str, bool]]:
+    """``(attname, descending)`` per key column, ending in a unique column."""
+    names = [key] if isinstance(key, str) else list(key)
+    if not names:
+        raise ValueError("iter_chunks() needs at least one key field")
+    columns = []
+    unique = False
+    for name in names:
+        descending = name.startswith("-")
+        name = name.lstrip("-")
+        field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        if field.null:
+            raise ValueError(f"Key field {field.name!r} must not be nullable")
+        unique = unique or field.unique
+        columns.append((field.attname, descending))
+    if not unique:
+        # Break ties so that rows sharing a key value are not skipped
+        columns.append((model._meta.pk.attname, columns[-1][1]))
+    return columns
+
+
+def _after(columns: List[Tuple[str, bool]], values: tuple) -> models.Q:
+    """Rows after ``values`` in key order."""
+    condition = models.Q()
+    for i, (name, descending) in enumerate(columns):
+        term = models.Q(**{f"{name}__{'lt' if descending else 'gt'}": values[i]})
+        for (prefix, _), value in zip(columns[:i], values[:i]):
+            term &= models.Q(**{prefix: value})
+        condition |= term
+    if len(columns) > 1:
+        # Redundant, but lets the database seek on an index of the first column
+        name, descending = columns[0]
+        condition &= models.Q(
+            **{f"{name}__{'lte' if descending else 'gte'}": values[0]}
+        )
+    return condition
+
+
+def iter_chunks(
+    queryset,
+    key: Union[str, Sequence[str]] = "pk",
+    size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[list]:
+    """
+    Yield a queryset's rows in lists of up to ``size``, paging by keyset.
+
+    Works with querysets of instances, ``values()`` dicts and
+    ``values_list()`` tuples (flat or not). Each page is one
+    ``WHERE key > last ORDER BY key LIMIT size`` query, so pages deep into a
+    table cost the same as the first, and no read stays open between pages.
+    Prefetches set on the queryset run once per page.
+
+    Args:
+        queryset: Queryset to walk; its ordering is replaced by the key
+        key: Field name, or names for a composite key; ``-name`` walks that
+            column in descending order. Key fields must not be nullable. The
+            primary key is appended unless one of them is unique.
+        size: Rows per page
+    """
+    if queryset.query.is_sliced:
+        raise ValueError("Cannot iterate a sliced queryset in chunks")
+    if size < 1:
+        raise ValueError("size must be at least 1")
+
+    model = queryset.model
+    columns = _key_columns(model, key)
+    names = [name for name, _ in columns]
+    iterable = queryset._iterable_class
+    strip = None
+
+    if iterable is ModelIterable:
+
+        def get_key(row):
+            return tuple(getattr(row, name) for name in names)
+
+    elif iterable is ValuesIterable:
+        fields = queryset._fields
+        missing = [name for name in names if fields and name not in fields]
+        if missing:
+            queryset = queryset.values(*fields, *missing)
+
+            def drop_missing(rows):
+                for row in rows:
+                    for name in missing:
+                        del row[name]
+                return rows
+
+            strip = drop_missing
+
+        def get_key(row):
+            return tuple(row[name] for name in names)
+
+    elif iterable in (ValuesListIterable, FlatValuesListIterable):
+        # Read the key from columns appended to each tuple
+        fields = queryset._fields or (
+            *(field.attname for field in model._meta.concrete_fields),
+            *queryset.query.annotation_select,
+        )
+        queryset = queryset.values_list(*fields, *names)
+        width = len(fields)
+        flat = iterable is FlatValuesListIterable
+
+        def get_key(row):
+            return row[width:]
+
+        def drop_key(rows):
+            if flat:
+                return [row[0] for row in rows]
+            return [row[:width] for row in rows]
+
+        strip = drop_key
+
+    else:
+        raise ValueError("iter_chunks() does not support values_list(named=True)")
+
+    queryset = queryset.order_by(
+        *(f"-{name}" if descending else name for name, descending in columns)
+    )
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(_after(columns, last))
+        rows = list(page[:size])
+        if not rows:
+            return
+        last = get_key(rows[-1])
+        yield strip(rows) if strip else rows
+        if len(rows) < size:
+            return
+
+
+class SqlormManager(models.Manager.from_queryset(SqlormQuerySet)):
+    """Default manager for SQLORM models."""
+
+    pass
@@ -0,0 +1,157 @@
+"""
+SQLORM Records
+==============
+
+Compact read-only rows for read-heavy code.
+
+A record is a tuple subclass with one property per column, generated once per
+model (and field selection) and cached on the model class. Records are built
+straight from ``values_list()`` cursor rows: no ``__dict__``, no ``_state``,
+no signals and no deferred-field bookkeeping, so they take a fraction of a
+model instance's memory and are much quicker to create.
+
+Records keep the model's ``__str__``, ``get_FOO_display()`` for fields with
+choices, ``pk``, ``to_dict()`` and ``to_json()``. Foreign keys are exposed by
+their ``attname`` (``author_id``), never as related objects.
+
+Example:
+    >>> for task in Task.records(Task.objects.filter(is_completed=False)):
+    ...     print(task.pk, task.title, task.get_priority_display())
+    >>> Task.objects.filter(priority=3).records(fields=["id", "title"])
+"""
+
+import json
+from functools import partial
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, Optional, Type
+
+from .serializers import get_plan
+
+_RECORD_CACHE_ATTR = "_sqlorm_records"
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class Record(tuple):
+    """Base class of the generated record classes."""
+
+    __slots__ = ()
+
+    # Set on each generated class
+    _model = None
+    _fields: tuple = ()  # attnames, in tuple order
+    _field_names: tuple = ()
+
+    def __repr__(self):
+        values = ", ".join(
+            f"{name}={value!r}" for name, value in zip(self._fields, self)
+        )
+        return f"{type(self).__name__}({values})"
+
+    def __reduce__(self):
+        return (_rebuild, (self._model, self._fields, tuple(self)))
+
+    def to_dict(self, fields=None, exclude=None) -> Dict[str, Any]:
+        """Convert the record to a dictionary, like ``instance.to_dict()``."""
+        if fields is None:
+            fields = self._field_names
+        return get_plan(self._model, fields, exclude).to_dict(self)
+
+    def to_json(self, indent=None) -> str:
+        """Convert the record to a JSON string."""
+        return json.dumps(self.to_dict(), indent=indent, default=str)
+
+
+def _rebuild(model, attnames, values):
+    return tuple.__new__(record_class(model, attnames), values)
+
+
+def _display(attname: str, choices: Dict[Any, Any]):
+    def get_display(self):
+        value = getattr(self, attname)
+        return str(choices.get(value, value))
+
+    return get_display
+
+
+def _resolve_fields(model, fields: Optional[Iterable[str]]) -> tuple:
+    """The concrete fields to select, in model order."""
+    concrete = model._meta.concrete_fields
+    if fields is None:
+        return tuple(concrete)
+    wanted = set()
+    for name in fields:
+        field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        if field not in concrete:
+            raise ValueError(f"{model.__name__}.{name} is not a concrete field")
+        wanted.add(field)
+    return tuple(field for field in concrete if field in wanted)
+
+
+def _build_record_class(model, fields: tuple) -> Type[Record]:
+    attnames = tuple(field.attname for field in fields)
+    attrs = {
+        "__slots__": (),
+        "__module__": model.__module__,
+        "__qualname__": f"{model.__name__}Record",
+        "_model": model,
+        "_fields": attnames,
+        "_field_names": tuple(field.name for field in fields),
+    }
+    for index, field in enumerate(fields):
+        getter = property(itemgetter(index), doc=f"{model.__name__}.{field.name}")
+        attrs[field.attname] = getter
+        if field.primary_key:
+            attrs["pk"] = getter
+        if field.choices:
+            attrs[f"get_{field.name}_display"] = _display(
+                field.attname, dict(field.flatchoices)
+            )
+    # Keep the model's own __str__, which only reads columns in the usual case
+    model_str = model.__dict__.get("__str__")
+    if model_str is not None:
+        attrs["__str__"] = model_str
+    return type(f"{model.__name__}Record", (Record,), attrs)
+
+
+def record_class(model, fields: Optional[Iterable[str]] = None) -> Type[Record]:
+    """
+    Get the cached record class for a model.
+
+    Args:
+        model: Django model class
+        fields: Field names (or attnames) to include (default: all concrete
+            fields)
+    """
+    key = tuple(fields) if fields is not None else None
+    cache = model.__dict__.get(_RECORD_CACHE_ATTR)
+    if cache is None:
+        cache = {}
+        setattr(model, _RECORD_CACHE_ATTR, cache)
+
+    cls = cache.get(key)
+    if cls is None:
+        cls = cache[key] = _build_record_class(model, _resolve_fields(model, key))
+    return cls
+
+
+def records(
+    queryset,
+    fields: Optional[Iterable[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Record]:
+    """
+    Yield one record per row of a queryset.
+
+    Args:
+        queryset: Rows to read; its filters and ordering apply, while any
+            ``values()``/``only()`` selection is replaced by ``fields``
+        fields: Field names to include (default: all concrete fields)
+        chunk_size: Rows fetched from the cursor at a time
+
+    Rows are read with ``values_list().iterator(chunk_size=...)``, so neither
+    model instances nor the queryset's result cache are built.
+    """
+    cls = record_class(queryset.model, fields)
+    rows = queryset.values_list(*cls._fields).iterator(chunk_size=chunk_size)
+    return map(partial(tuple.__new__, cls), rows)
@@ -0,0 +1,160 @@
+"""
+SQLORM Database Router
+======================
+
+Routes queries between the databases passed to ``configure()``.
+
+Each database alias has a role:
+
+- ``primary``: receives all writes (and reads when there are no replicas)
+- ``replica``: receives reads, round-robin or by lowest recent latency
+- ``analytics``: only used explicitly, via ``.using()`` or ``_using``
+
+After a write, reads from the same thread stick to the primary for
+``sticky_window`` seconds so they see their own writes.
+
+Example:
+    >>> configure({
+    ...     "default": {"ENGINE": ..., "NAME": "main", "ROLE": "primary"},
+    ...     "replica1": {"ENGINE": ..., "HOST": "r1", "ROLE": "replica"},
+    ...     "reports": {"ENGINE": ..., "NAME": "dw", "ROLE": "analytics"},
+    ... }, read_strategy="latency", sticky_window=2.0)
+"""
+
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+
+ROLES = ("primary", "replica", "analytics")
+READ_STRATEGIES = ("round-robin", "latency")
+
+# Weight of the newest sample in the per-replica latency average
+LATENCY_SMOOTHING = 0.3
+
+_state = {
+    "primary": None,
+    "replicas": [],
+    "strategy": "round-robin",
+    "sticky_window": 0.0,
+}
+_round_robin = itertools.count()
+_latency: Dict[str, float] = {}
+_local = threading.local()
+_signal_connected = False
+
+
+def configure_routing(
+    roles: Dict[str, str],
+    read_strategy: str = "round-robin",
+    sticky_window: float = 0.0,
+) -> None:
+    """Set the routing table used by ``DatabaseRouter``."""
+    global _round_robin
+
+    primary = [alias for alias, role in roles.items() if role == "primary"]
+    _state["primary"] = primary[0] if primary else None
+    _state["replicas"] = [alias for alias, role in roles.items() if role == "replica"]
+    _state["strategy"] = read_strategy
+    _state["sticky_window"] = sticky_window
+    _round_robin = itertools.count()
+    _latency.clear()
+
+    if read_strategy == "latency" and _state["replicas"]:
+        _install_latency_tracking()
+
+
+def get_replicas() -> List[str]:
+    """Aliases that currently receive reads."""
+    return list(_state["replicas"])
+
+
+def record_latency(alias: str, seconds: float) -> None:
+    """Fold a query duration into the alias's moving latency average."""
+    previous = _latency.get(alias)
+    if previous is None:
+        _latency[alias] = seconds
+    else:
+        _latency[alias] = previous + LATENCY_SMOOTHING * (seconds - previous)
+
+
+def _latency_wrapper(alias):
+    def wrapper(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            record_latency(alias, time.perf_counter() - started)
+
+    wrapper.sqlorm_latency = True
+    return wrapper
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    """Time every query on replica connections."""
+    if connection.alias not in _state["replicas"]:
+        return
+    wrappers = connection.execute_wrappers
+    if not any(getattr(w, "sqlorm_latency", False) for w in wrappers):
+        wrappers.append(_latency_wrapper(connection.alias))
+
+
+def _install_latency_tracking() -> None:
+    global _signal_connected
+
+    if _signal_connected:
+        return
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(
+        _on_connection_created, dispatch_uid="sqlorm.routers.latency"
+    )
+    _signal_connected = True
+
+
+def write_alias(model) -> str:
+    """Alias a model's writes go to, without starting a read-your-writes window."""
+    return getattr(model, "_default_using", None) or _state["primary"] or "default"
+
+
+def _choose_replica() -> Optional[str]:
+    replicas = _state["replicas"]
+    if not replicas:
+        return None
+    if _state["strategy"] == "latency":
+        # Unmeasured replicas count as fastest so every replica gets sampled
+        return min(replicas, key=lambda alias: _latency.get(alias, 0.0))
+    return replicas[next(_round_robin) % len(replicas)]
+
+
+class DatabaseRouter:
+    """Django database router for SQLORM's configured database roles."""
+
+    def db_for_read(self, model, **hints):
+        using = getattr(model, "_default_using", None)
+        if using:
+            return using
+        last_write = getattr(_local, "last_write", None)
+        if (
+            last_write is not None
+            and time.monotonic() - last_write < _state["sticky_window"]
+        ):
+            return _state["primary"]
+        return _choose_replica() or _state["primary"]
+
+    def db_for_write(self, model, **hints):
+        if _state["sticky_window"]:
+            _local.last_write = time.monotonic()
+        return write_alias(model)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        group = {_state["primary"], *_state["replicas"]}
+        if obj1._state.db in group and obj2._state.db in group:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes through replication
+        if db in _state["replicas"]:
+            return False
+        return None
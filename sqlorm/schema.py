@@ -0,0 +1,195 @@
+"""
+SQLORM Schema Fingerprints
+==========================
+
+Skip ``makemigrations``/``migrate`` at start-up when nothing has changed.
+
+``ensure_schema()`` hashes the models' migration state (the same field
+deconstructions Django's autodetector compares) together with the names and
+contents of the migration files. The hash is stored in the database and next
+to the migrations. When both copies match the current hash, the autodetector,
+the migration loader and the executor are skipped; only the model state and
+migration serializer modules are imported to compute the hash.
+
+Example:
+    >>> configure({...}, migrations_dir="./migrations")
+    >>> class Task(Model):
+    ...     title = fields.CharField(max_length=200)
+    >>> ensure_schema()     # first run: makemigrations + migrate
+    True
+    >>> ensure_schema()     # unchanged: one small query and a file read
+    False
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Iterable, List, Optional, Type
+
+from .exceptions import ConfigurationError, MigrationError
+
+logger = logging.getLogger("sqlorm")
+
+FINGERPRINT_TABLE = "sqlorm_schema_fingerprint"
+FINGERPRINT_FILE = ".schema_fingerprint"
+
+
+def _serialize(value) -> str:
+    from django.db.migrations.serializer import serializer_factory
+
+    try:
+        return serializer_factory(value).serialize()[0]
+    except ValueError:
+        # Unserializable values would fail makemigrations anyway; repr() keeps
+        # the hash computable (if not necessarily stable)
+        return repr(value)
+
+
+def _model_state(model) -> str:
+    from django.db.migrations.state import ModelState
+
+    state = ModelState.from_model(model)
+    fields = [(name, field.deconstruct()[1:]) for name, field in state.fields.items()]
+    return _serialize(
+        [
+            state.app_label,
+            state.name_lower,
+            fields,
+            sorted(state.options.items()),
+            [str(base) for base in state.bases],
+            [name for name, _ in state.managers],
+        ]
+    )
+
+
+def _migration_files(migrations_dir: Path) -> List[Path]:
+    return sorted(
+        path for path in migrations_dir.glob("*.py") if path.name != "__init__.py"
+    )
+
+
+def compute_fingerprint(
+    models: Optional[Iterable[Type]] = None, migrations_dir: Optional[Path] = None
+) -> str:
+    """
+    Stable hash of the models' migration state and the migration files.
+
+    Args:
+        models: Models to include (default: every registered model)
+        migrations_dir: Directory whose migration files are included
+            (default: the configured ``migrations_dir``)
+    """
+    import django
+
+    from .base import get_models
+    from .config import get_migrations_dir
+
+    if models is None:
+        models = get_models().values()
+    migrations_dir = migrations_dir or get_migrations_dir()
+
+    digest = hashlib.sha256()
+    digest.update(django.get_version().encode())
+    states = sorted(
+        _model_state(model)
+        for model in models
+        if not model._meta.abstract and not model._meta.proxy
+    )
+    for state in states:
+        digest.update(b"\0" + state.encode())
+    if migrations_dir is not None:
+        # Contents too, so editing an existing migration isn't skipped
+        for path in _migration_files(Path(migrations_dir)):
+            digest.update(b"\1" + path.name.encode() + b"\0")
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def read_db_fingerprint(using: str = "default") -> Optional[str]:
+    """The fingerprint stored in a database, or ``None``."""
+    from django.db import DatabaseError, connections, transaction
+
+    connection = connections[using]
+    table = connection.ops.quote_name(FINGERPRINT_TABLE)
+    try:
+        with transaction.atomic(using=using):
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT fingerprint FROM {table} WHERE id = 1")
+                row = cursor.fetchone()
+    except DatabaseError:
+        # Table doesn't exist yet
+        return None
+    return row[0] if row else None
+
+
+def write_db_fingerprint(fingerprint: str, using: str = "default") -> None:
+    """Store a fingerprint in a database."""
+    from django.db import connections, transaction
+
+    connection = connections[using]
+    table = connection.ops.quote_name(FINGERPRINT_TABLE)
+    with transaction.atomic(using=using):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(id INTEGER PRIMARY KEY, fingerprint VARCHAR(64) NOT NULL)"
+            )
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(
+                f"INSERT INTO {table} (id, fingerprint) VALUES (1, %s)", [fingerprint]
+            )
+
+
+def _fingerprint_file(migrations_dir: Path) -> Path:
+    return migrations_dir / FINGERPRINT_FILE
+
+
+def ensure_schema(
+    using: str = "default", name: Optional[str] = None, verbosity: int = 0
+) -> bool:
+    """
+    Bring migrations and the database up to date with the models, cheaply.
+
+    When the stored fingerprints match the models, returns ``False`` without
+    loading Django's migration machinery. Otherwise runs ``makemigrations``
+    and ``migrate``, stores the new fingerprint and returns ``True``.
+
+    Args:
+        using: Database to migrate and store the fingerprint in
+        name: Name for a new migration (default: Django's automatic name)
+        verbosity: Output level of the migration commands
+
+    Raises ``MigrationError`` if a migration command fails.
+    """
+    from .config import get_migrations_dir
+
+    migrations_dir = get_migrations_dir()
+    if migrations_dir is None:
+        raise ConfigurationError(
+            "ensure_schema() needs migrations_dir to be set in configure()"
+        )
+
+    fingerprint = compute_fingerprint(migrations_dir=migrations_dir)
+    path = _fingerprint_file(migrations_dir)
+    stored_file = path.read_text().strip() if path.exists() else None
+    if stored_file == fingerprint and read_db_fingerprint(using) == fingerprint:
+        logger.debug("Schema fingerprint unchanged; skipping migrations")
+        return False
+
+    from django.core.management import call_command
+
+    logger.debug("Schema fingerprint changed; running makemigrations and migrate")
+    options = {"verbosity": verbosity, "interactive": False}
+    if name:
+        options["name"] = name
+    try:
+        call_command("makemigrations", "sqlorm_app", **options)
+        call_command("migrate", database=using, verbosity=verbosity, interactive=False)
+    except Exception as e:
+        raise MigrationError(f"Failed to migrate the schema: {e}") from e
+
+    # New migration files are part of the fingerprint
+    fingerprint = compute_fingerprint(migrations_dir=migrations_dir)
+    write_db_fingerprint(fingerprint, using)
+    path.write_text(fingerprint + "\n")
+    return True
@@ -0,0 +1,132 @@
+"""
+SQLORM Serializers
+==================
+
+Precompiled serializer plans used by ``to_dict()`` and ``to_json()``.
+
+A plan is built once per model and ``fields``/``exclude`` combination and
+cached on the model class (the default plan as a plain class attribute), so
+serializing a row is a single attribute fetch, one dict build, and the
+converters for the columns that need one.
+
+Example:
+    >>> plan = get_plan(User, exclude=["password"])
+    >>> plan.to_dict(user)
+    {'id': 1, 'name': 'John', 'email': 'john@example.com'}
+"""
+
+from operator import attrgetter, methodcaller
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+_PLAN_CACHE_ATTR = "_sqlorm_serializers"
+_DEFAULT_PLAN_ATTR = "_sqlorm_default_plan"
+
+
+_isoformat = methodcaller("isoformat")
+
+
+def _converter_for(field) -> Optional[Callable[[Any], Any]]:
+    """
+    Pick the value converter for a field, or None to pass values through.
+
+    Converters are only called for non-NULL values.
+    """
+    from django.db import models
+
+    if isinstance(field, (models.DateField, models.TimeField)):
+        return _isoformat
+    return None
+
+
+class SerializerPlan:
+    """Ordered column list with per-column converters for one model."""
+
+    __slots__ = ("names", "attnames", "converters", "_getter", "_positions")
+
+    def __init__(
+        self,
+        names: Tuple[str, ...],
+        attnames: Tuple[str, ...],
+        converters: Tuple[Tuple[str, Callable[[Any], Any]], ...],
+    ):
+        self.names = names
+        self.attnames = attnames
+        self.converters = converters
+        index = {name: i for i, name in enumerate(names)}
+        self._positions = tuple((index[name], convert) for name, convert in converters)
+        if len(attnames) == 1:
+            single = attrgetter(attnames[0])
+            self._getter = lambda obj: (single(obj),)
+        elif attnames:
+            self._getter = attrgetter(*attnames)
+        else:
+            self._getter = lambda obj: ()
+
+    def from_row(self, row: Sequence[Any]) -> Dict[str, Any]:
+        """Build a dict from a row of values ordered like ``attnames``."""
+        if self._positions:
+            row = list(row)
+            for i, convert in self._positions:
+                value = row[i]
+                if value is not None:
+                    row[i] = convert(value)
+        return dict(zip(self.names, row))
+
+    def to_dict(self, obj) -> Dict[str, Any]:
+        """Serialize a model instance."""
+        return self.from_row(self._getter(obj))
+
+
+def get_plan(
+    model,
+    fields: Optional[Iterable[str]] = None,
+    exclude: Optional[Iterable[str]] = None,
+) -> SerializerPlan:
+    """
+    Get the cached serializer plan for a model.
+
+    Args:
+        model: Django model class
+        fields: Only include these field names (default: all concrete fields)
+        exclude: Field names to leave out
+    """
+    if not fields and not exclude:
+        # The common case skips building a key
+        plan = model.__dict__.get(_DEFAULT_PLAN_ATTR)
+        if plan is None:
+            plan = _build_plan(model, None, None)
+            setattr(model, _DEFAULT_PLAN_ATTR, plan)
+        return plan
+
+    key = (
+        tuple(fields) if fields else None,
+        tuple(exclude) if exclude else None,
+    )
+    cache = model.__dict__.get(_PLAN_CACHE_ATTR)
+    if cache is None:
+        cache = {}
+        setattr(model, _PLAN_CACHE_ATTR, cache)
+
+    plan = cache.get(key)
+    if plan is None:
+        plan = cache[key] = _build_plan(model, *key)
+    return plan
+
+
+def _build_plan(model, fields, exclude) -> SerializerPlan:
+    """Build a serializer plan from the model's concrete fields."""
+    names = []
+    attnames = []
+    converters = []
+    for field in model._meta.concrete_fields:
+        if fields and field.name not in fields:
+            continue
+        if exclude and field.name in exclude:
+            continue
+        convert = _converter_for(field)
+        if convert is not None:
+            converters.append((field.name, convert))
+        names.append(field.name)
+        attnames.append(field.attname)
+
+    return SerializerPlan(tuple(names), tuple(attnames), tuple(converters))
@@ -0,0 +1,401 @@
+"""
+SQLORM Snapshots
+================
+
+Read-only, memory-mapped copies of small hot lookup tables.
+
+``build_snapshot()`` (or ``sqlorm snapshot build``) writes a model's rows to
+a compact file with a sorted key index. ``Snapshot.open()`` memory-maps it
+and answers ``get(key)`` and range scans with a binary search over the
+mapped index: nothing is loaded up front, only the pages a lookup touches
+are read, and every process opening the file shares them through the OS
+page cache. Opening a snapshot needs neither Django nor ``configure()``.
+
+Each snapshot carries a version stamp (a hash of its contents). Rebuilding
+writes a temporary file and renames it over the old one, so readers never
+see a half-written file; open snapshots keep reading the old version until
+``refresh()`` picks up the new one.
+
+Example:
+    $ sqlorm snapshot build --models models.py --model Country --key code
+
+    >>> from sqlorm.snapshot import Snapshot
+    >>> countries = Snapshot.open("country.snapshot")
+    >>> countries.get("FR")
+    {'id': 75, 'code': 'FR', 'name': 'France', 'currency': 'EUR'}
+    >>> [key for key, row in countries.range("D", "F")]
+    ['DE', 'DK', 'DZ', 'EC', 'EE', 'EG', 'ES']
+
+File layout (little-endian): 8-byte magic, u32 header length, JSON header,
+then 8-byte aligned sections: the sorted keys (int64s, or u64 offsets into a
+blob of UTF-8 keys), u64 row offsets, and one compact JSON array per row.
+"""
+
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .exceptions import SnapshotError
+
+MAGIC = b"SQLSNAP1"
+FORMAT_VERSION = 1
+
+_HEAD = struct.Struct("<8sI")
+_ALIGN = 8
+
+
+class SnapshotResult:
+    """Outcome of building a snapshot."""
+
+    def __init__(
+        self, path: str, rows: int, version: str, changed: bool, seconds: float
+    ):
+        self.path = path
+        self.rows = rows
+        self.version = version
+        self.changed = changed
+        self.seconds = seconds
+
+    def __repr__(self):
+        return (
+            f"<SnapshotResult path={self.path!r} rows={self.rows} "
+            f"version={self.version} changed={self.changed}>"
+        )
+
+
+def _pad(size: int) -> bytes:
+    return b"\0" * (-size % _ALIGN)
+
+
+def _is_integer_key(field) -> bool:
+    from django.db import models
+
+    if field.is_relation:
+        field = field.target_field
+    return isinstance(field, models.IntegerField) and not isinstance(
+        field, models.BooleanField
+    )
+
+
+def read_version(path: str) -> Optional[str]:
+    """The version stamp of the snapshot at ``path``, or ``None``."""
+    try:
+        with open(path, "rb") as f:
+            return _read_header(f.read(_HEAD.size), f)["version"]
+    except (OSError, SnapshotError):
+        return None
+
+
+def _read_header(head: bytes, f) -> Dict[str, Any]:
+    if len(head) < _HEAD.size:
+        raise SnapshotError("File is too short to be a snapshot")
+    magic, length = _HEAD.unpack(head)
+    if magic != MAGIC:
+        raise SnapshotError("Not a sqlorm snapshot")
+    header = json.loads(f.read(length))
+    if header.get("format") != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format {header.get('format')!r}")
+    return header
+
+
+def build_snapshot(
+    model,
+    key: str,
+    path: Optional[str] = None,
+    fields: Optional[Iterable[str]] = None,
+    queryset=None,
+) -> SnapshotResult:
+    """
+    Write a model's rows to a snapshot file keyed by a unique field.
+
+    Args:
+        model: Model class
+        key: Unique, non-nullable field to look rows up by (``"pk"`` works)
+        path: Output file (default: ``<model_name>.snapshot``)
+        fields: Fields to store (default: all concrete fields)
+        queryset: Rows to include (default: all)
+
+    The file is only replaced when its contents changed, so unchanged
+    snapshots keep their page cache and version. Values are stored as
+    ``to_dict()`` produces them (dates as ISO strings, foreign keys as ids).
+    """
+    from .serializers import get_plan
+
+    started = time.monotonic()
+    meta = model._meta
+    key_field = meta.pk if key == "pk" else meta.get_field(key)
+    if not (key_field.unique or key_field.primary_key) or key_field.null:
+        raise ValueError(
+            f"Snapshot key {model.__name__}.{key_field.name} must be unique "
+            "and not nullable"
+        )
+    path = path or f"{meta.model_name}.snapshot"
+    if queryset is None:
+        queryset = model._default_manager.all()
+
+    plan = get_plan(model, fields)
+    names = list(plan.names)
+    integer_keys = _is_integer_key(key_field)
+    key_column = key_field.attname
+
+    entries: List[Tuple[Any, bytes]] = []
+    dumps = json.JSONEncoder(separators=(",", ":"), default=str).encode
+    columns = queryset.values_list(key_column, *plan.attnames).order_by()
+    for row in columns.iterator(chunk_size=5000):
+        row_key = row[0] if integer_keys else str(row[0]).encode()
+        values = list(plan.from_row(row[1:]).values())
+        entries.append((row_key, dumps(values).encode()))
+    # Byte order for string keys, so lookups compare encoded keys
+    entries.sort(key=lambda entry: entry[0])
+    for previous, current in zip(entries, entries[1:]):
+        if previous[0] == current[0]:
+            raise ValueError(f"Duplicate snapshot key {current[0]!r}")
+
+    if integer_keys:
+        keys = struct.pack(f"<{len(entries)}q", *(k for k, _ in entries))
+        key_blob = b""
+    else:
+        offsets, position = [], 0
+        for entry_key, _ in entries:
+            offsets.append(position)
+            position += len(entry_key)
+        offsets.append(position)
+        keys = struct.pack(f"<{len(offsets)}Q", *offsets)
+        key_blob = b"".join(k for k, _ in entries)
+    row_offsets, position = [], 0
+    for _, data in entries:
+        row_offsets.append(position)
+        position += len(data) + 1
+    row_offsets.append(position)
+    rows_index = struct.pack(f"<{len(row_offsets)}Q", *row_offsets)
+    data = b"".join(data + b"\n" for _, data in entries)
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([meta.label_lower, key_field.name, names]).encode())
+    for section in (keys, key_blob, data):
+        digest.update(section)
+    version = digest.hexdigest()[:16]
+
+    if read_version(path) == version:
+        return SnapshotResult(
+            path, len(entries), version, False, time.monotonic() - started
+        )
+
+    header = {
+        "format": FORMAT_VERSION,
+        "version": version,
+        "model": meta.label_lower,
+        "key": key_field.name,
+        "key_type": "int" if integer_keys else "str",
+        "fields": names,
+        "rows": len(entries),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    # Section offsets depend on the header's own length; widen until stable
+    header_bytes = b""
+    while True:
+        length = len(header_bytes)
+        start = _HEAD.size + length + len(_pad(_HEAD.size + length))
+        header["keys_offset"] = start
+        header["key_blob_offset"] = start + len(keys)
+        blob_end = header["key_blob_offset"] + len(key_blob)
+        header["rows_offset"] = blob_end + len(_pad(blob_end))
+        header["data_offset"] = header["rows_offset"] + len(rows_index)
+        header_bytes = json.dumps(header, separators=(",", ":")).encode()
+        if len(header_bytes) == length:
+            break
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEAD.pack(MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(_pad(_HEAD.size + len(header_bytes)))
+        f.write(keys)
+        f.write(key_blob)
+        f.write(_pad(header["key_blob_offset"] + len(key_blob)))
+        f.write(rows_index)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    # Atomic: readers see either the old or the new snapshot
+    os.replace(tmp_path, path)
+    return SnapshotResult(path, len(entries), version, True, time.monotonic() - started)
+
+
+class _StringKeys:
+    """Sequence view of the encoded keys, for ``bisect``."""
+
+    __slots__ = ("_buffer", "_offsets", "_base")
+
+    def __init__(self, buffer, offsets, base: int):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._base = base
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        base = self._base
+        return self._buffer[
+            base + self._offsets[index] : base + self._offsets[index + 1]
+        ]
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot file.
+
+    Use ``Snapshot.open(path)``. Lookups return dicts of the stored fields;
+    keys are ints or strings, matching the key field.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._open()
+
+    @classmethod
+    def open(cls, path: str) -> "Snapshot":
+        """Memory-map the snapshot at ``path``."""
+        return cls(path)
+
+    def _open(self) -> None:
+        if sys.byteorder != "little":
+            # The index is read in place with native-order casts
+            raise SnapshotError("Snapshots can only be read on little-endian hosts")
+        try:
+            with open(self.path, "rb") as f:
+                header = _read_header(f.read(_HEAD.size), f)
+                stat = os.fstat(f.fileno())
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError as e:
+            raise SnapshotError(f"No snapshot at {self.path}") from e
+        if len(mapped) < header["data_offset"]:
+            mapped.close()
+            raise SnapshotError(f"Snapshot {self.path} is truncated")
+
+        view = memoryview(mapped)
+        rows = header["rows"]
+        keys_offset = header["keys_offset"]
+        self._rows_index = view[
+            header["rows_offset"] : header["rows_offset"] + 8 * (rows + 1)
+        ].cast("Q")
+        if header["key_type"] == "int":
+            self._keys = view[keys_offset : keys_offset + 8 * rows].cast("q")
+        else:
+            offsets = view[keys_offset : keys_offset + 8 * (rows + 1)].cast("Q")
+            self._keys = _StringKeys(mapped, offsets, header["key_blob_offset"])
+        self._mmap = mapped
+        self._view = view
+        self._stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self.header = header
+        self.fields: List[str] = header["fields"]
+        self.version: str = header["version"]
+        self._data_offset = header["data_offset"]
+        self._string_keys = header["key_type"] == "str"
+
+    def _unmap(self) -> None:
+        # Views into the map must go before the map itself
+        keys = self._keys
+        (keys._offsets if isinstance(keys, _StringKeys) else keys).release()
+        self._rows_index.release()
+        self._view.release()
+        self._mmap.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._unmap()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.header["rows"]
+
+    def __repr__(self):
+        return (
+            f"<Snapshot {self.path!r} model={self.header['model']} "
+            f"rows={len(self)} version={self.version}>"
+        )
+
+    def _encode(self, key):
+        if self._string_keys:
+            return str(key).encode()
+        return int(key)
+
+    def _decode(self, key):
+        return key.decode() if self._string_keys else key
+
+    def _row(self, index: int) -> Dict[str, Any]:
+        start = self._data_offset + self._rows_index[index]
+        end = self._data_offset + self._rows_index[index + 1] - 1
+        return dict(zip(self.fields, json.loads(self._mmap[start:end])))
+
+    def _find(self, key) -> int:
+        encoded = self._encode(key)
+        index = bisect.bisect_left(self._keys, encoded)
+        if index < len(self) and self._keys[index] == encoded:
+            return index
+        return -1
+
+    def get(self, key, default=None) -> Optional[Dict[str, Any]]:
+        """The row stored under ``key``, or ``default``."""
+        index = self._find(key)
+        return self._row(index) if index >= 0 else default
+
+    def __getitem__(self, key) -> Dict[str, Any]:
+        index = self._find(key)
+        if index < 0:
+            raise KeyError(key)
+        return self._row(index)
+
+    def __contains__(self, key) -> bool:
+        return self._find(key) >= 0
+
+    def keys(self) -> Iterator[Any]:
+        """All keys in order."""
+        for index in range(len(self)):
+            yield self._decode(self._keys[index])
+
+    __iter__ = keys
+
+    def range(self, start=None, stop=None) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        """
+        Yield ``(key, row)`` for ``start <= key < stop`` in key order.
+
+        String keys compare by their UTF-8 bytes (code point order).
+        """
+        keys = self._keys
+        first = 0 if start is None else bisect.bisect_left(keys, self._encode(start))
+        last = (
+            len(self) if stop is None else bisect.bisect_left(keys, self._encode(stop))
+        )
+        for index in range(first, last):
+            yield self._decode(keys[index]), self._row(index)
+
+    def refresh(self) -> bool:
+        """
+        Reopen the file if it was replaced by a different version.
+
+        Returns ``True`` if a new version was loaded.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if (stat.st_ino, stat.st_mtime_ns, stat.st_size) == self._stat:
+            return False
+        previous = Snapshot.__new__(Snapshot)
+        previous.__dict__.update(self.__dict__)
+        self._open()
+        previous._unmap()
+        return self.version != previous.version
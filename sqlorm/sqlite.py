@@ -0,0 +1,167 @@
+"""
+SQLORM SQLite Tuning
+====================
+
+Named pragma profiles for SQLite connections.
+
+Pragmas are applied to every new connection through Django's
+``connection_created`` signal, and can be switched temporarily with
+``use_sqlite_profile()``.
+
+Example:
+    >>> configure({...}, sqlite_profile="fast-wal", sqlite_pragmas={"cache_size": -1})
+    >>>
+    >>> with use_sqlite_profile("bulk-load"):
+    ...     Task.objects.bulk_create(tasks)
+"""
+
+import logging
+import re
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Union
+
+from .exceptions import ConfigurationError
+
+logger = logging.getLogger("sqlorm")
+
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # SQLite's own durable defaults, stated explicitly
+    "safe": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+    },
+    # Concurrent readers with one writer; survives process crashes, may lose
+    # the last transactions on power loss
+    "fast-wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+    },
+    # Loading data that can be reloaded from its source; not crash safe
+    "bulk-load": {
+        "journal_mode": "MEMORY",
+        "synchronous": "OFF",
+        "temp_store": "MEMORY",
+        "cache_size": -262144,
+    },
+    # Large read-only scans and aggregations; writes are rejected
+    "read-only-analytics": {
+        "query_only": "ON",
+        "temp_store": "MEMORY",
+        "cache_size": -524288,
+        "mmap_size": 1073741824,
+    },
+}
+
+_VALUE_RE = re.compile(r"-?[\w.]+")
+
+# Pragmas applied to new connections, per database alias
+_alias_pragmas: Dict[str, Dict[str, Any]] = {}
+
+_signal_connected = False
+
+
+def resolve_pragmas(
+    profile: Optional[str] = None, pragmas: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Merge a named profile with explicit pragmas (which take precedence)."""
+    if profile is not None and profile not in SQLITE_PROFILES:
+        raise ConfigurationError(
+            f"Unknown SQLite profile {profile!r}. "
+            f"Choose from: {', '.join(SQLITE_PROFILES)}"
+        )
+    merged = dict(SQLITE_PROFILES[profile]) if profile else {}
+    merged.update(pragmas or {})
+    for name, value in merged.items():
+        if not name.isidentifier() or not _VALUE_RE.fullmatch(str(value)):
+            raise ConfigurationError(f"Invalid SQLite pragma: {name}={value!r}")
+    return merged
+
+
+def _execute_pragmas(cursor, pragmas: Dict[str, Any]) -> None:
+    for name, value in pragmas.items():
+        try:
+            cursor.execute(f"PRAGMA {name} = {value}")
+        except Exception as e:
+            # e.g. journal_mode cannot change inside a transaction
+            logger.warning(f"Could not set PRAGMA {name}={value}: {e}")
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    """Apply the configured pragmas to a new SQLite connection."""
+    if connection.vendor != "sqlite":
+        return
+    pragmas = _alias_pragmas.get(connection.alias)
+    if pragmas:
+        with connection.cursor() as cursor:
+            _execute_pragmas(cursor, pragmas)
+
+
+def set_pragmas(alias: str, pragmas: Dict[str, Any]) -> None:
+    """Set the pragmas applied to new connections of a database alias."""
+    global _signal_connected
+
+    if pragmas:
+        _alias_pragmas[alias] = pragmas
+    else:
+        _alias_pragmas.pop(alias, None)
+
+    if not _signal_connected:
+        from django.db.backends.signals import connection_created
+
+        connection_created.connect(
+            _on_connection_created, dispatch_uid="sqlorm.sqlite.pragmas"
+        )
+        _signal_connected = True
+
+
+def get_pragmas(alias: str = "default") -> Dict[str, Any]:
+    """Get the pragmas applied to new connections of a database alias."""
+    return dict(_alias_pragmas.get(alias, {}))
+
+
+@contextmanager
+def use_sqlite_profile(
+    profile: Union[str, Dict[str, Any]], using: str = "default"
+) -> Iterator[Dict[str, Any]]:
+    """
+    Temporarily switch a SQLite database to another profile.
+
+    The pragmas are applied to the current thread's connection and to
+    connections opened while the block runs. On exit the previous values are
+    restored. Connections already open in other threads are not changed.
+
+    Args:
+        profile: Profile name or a dict of pragmas
+        using: Database alias
+    """
+    from django.db import connections
+
+    if isinstance(profile, str):
+        pragmas = resolve_pragmas(profile)
+    else:
+        pragmas = resolve_pragmas(pragmas=profile)
+
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        yield {}
+        return
+
+    saved_alias_pragmas = _alias_pragmas.get(using)
+    with connection.cursor() as cursor:
+        previous = {}
+        for name in pragmas:
+            cursor.execute(f"PRAGMA {name}")
+            row = cursor.fetchone()
+            if row is not None:
+                previous[name] = row[0]
+        _execute_pragmas(cursor, pragmas)
+    set_pragmas(using, {**(saved_alias_pragmas or {}), **pragmas})
+    try:
+        yield pragmas
+    finally:
+        set_pragmas(using, saved_alias_pragmas or {})
+        with connection.cursor() as cursor:
+            _execute_pragmas(cursor, previous)
@@ -0,0 +1,179 @@
+"""
+SQLORM Testing
+==============
+
+pytest plugin for fast, isolated database tests.
+
+Django is configured and the schema created once per test session; each test
+then runs inside a transaction (one per database) that is rolled back when it
+finishes, so tests see a clean database without re-importing Django or
+re-creating tables. ``transaction.atomic()`` blocks inside a test become
+savepoints.
+
+Enable it in your ``conftest.py`` and point it at your models:
+
+    pytest_plugins = ["sqlorm.testing"]
+
+    # pytest.ini (or [tool.pytest.ini_options] in pyproject.toml)
+    [pytest]
+    sqlorm_models = myapp.models
+    sqlorm_database = test.sqlite3
+    sqlorm_schema = create_tables
+
+``sqlorm_database`` defaults to an in-memory SQLite database and
+``sqlorm_schema`` may also be ``migrate``.
+
+Then request the ``sqlorm_db`` fixture (or mark tests with
+``@pytest.mark.usefixtures("sqlorm_db")``):
+
+    def test_create(sqlorm_db):
+        Task.objects.create(title="x")
+        assert Task.objects.count() == 1
+
+Override the session-scoped ``sqlorm_config`` fixture to configure other
+databases (it returns ``configure()``'s arguments as a dict with a
+``database`` key).
+
+Define models at module level (or in ``sqlorm_models``) so their tables
+exist when the session starts: schema changes can't run inside the test
+transaction on SQLite. Tests that define throwaway models can use the
+``sqlorm_registry`` fixture, which unregisters them afterwards, or call
+``reset_registry()``. ``transaction.on_commit()`` callbacks never run, as
+the test transaction is never committed.
+"""
+
+import importlib
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import pytest
+
+
+def pytest_addoption(parser) -> None:
+    parser.addini(
+        "sqlorm_database",
+        "SQLite database file for tests (default: in-memory)",
+        default=":memory:",
+    )
+    parser.addini(
+        "sqlorm_models", "Modules defining the models to create", type="linelist"
+    )
+    parser.addini(
+        "sqlorm_schema",
+        "How to create the schema once per session: create_tables or migrate",
+        default="create_tables",
+    )
+
+
+def reset_registry(names: Optional[Iterable[str]] = None) -> None:
+    """
+    Unregister SQLORM models without reloading any module.
+
+    Args:
+        names: Model class names to remove (default: every model)
+
+    Removes the models from SQLORM's registry, ``sqlorm.app.models`` and
+    Django's app registry, along with their query caches, so the same names
+    can be defined again. Their tables are left alone.
+    """
+    from django.apps import apps
+    from django.db.models.signals import post_delete, post_save
+
+    from . import base, cache
+    from .app import models as app_models
+
+    if names is None:
+        names = list(base._model_registry) + list(app_models._registry)
+    names = set(names)
+
+    django_models = apps.all_models.get("sqlorm_app", {})
+    for name in names:
+        model = base._model_registry.pop(name, None)
+        app_models._registry.pop(name, None)
+        vars(app_models).pop(name, None)
+        # Same dict as the app config's models
+        django_models.pop(name.lower(), None)
+        if cache._caches.pop(name, None) is not None and model is not None:
+            uid = f"sqlorm.cache.{model._meta.label}"
+            post_save.disconnect(sender=model, dispatch_uid=uid)
+            post_delete.disconnect(sender=model, dispatch_uid=uid)
+    base._deferred_models[:] = [
+        model for model in base._deferred_models if model.__name__ not in names
+    ]
+    apps.clear_cache()
+
+
+@pytest.fixture(scope="session")
+def sqlorm_config(pytestconfig) -> Dict[str, Any]:
+    """``configure()`` arguments for the test session."""
+    return {
+        "database": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": pytestconfig.getini("sqlorm_database"),
+        }
+    }
+
+
+@pytest.fixture(scope="session")
+def sqlorm_db_setup(pytestconfig, sqlorm_config) -> Iterator[None]:
+    """Configure SQLORM and create the schema, once per session."""
+    from .base import create_tables
+    from .config import configure
+
+    options = dict(sqlorm_config)
+    database = options.pop("database")
+    configure(database, **options)
+    for module in pytestconfig.getini("sqlorm_models"):
+        importlib.import_module(module)
+
+    schema = pytestconfig.getini("sqlorm_schema")
+    if schema == "migrate":
+        from django.core.management import call_command
+        from django.db import connections
+
+        for alias in connections:
+            call_command("migrate", database=alias, verbosity=0, interactive=False)
+    elif schema == "create_tables":
+        create_tables(verbosity=0)
+    else:
+        raise pytest.UsageError(
+            f"sqlorm_schema must be create_tables or migrate, not {schema!r}"
+        )
+    yield
+
+    from .mirror import close_mirrors
+
+    close_mirrors()
+
+
+@pytest.fixture
+def sqlorm_db(sqlorm_db_setup) -> Iterator[None]:
+    """Run the test in a transaction per database, rolled back afterwards."""
+    from django.db import connections, transaction
+
+    from . import cache
+    from .base import get_models
+
+    atomics = []
+    for alias in connections:
+        atomic = transaction.atomic(using=alias)
+        atomic.__enter__()
+        atomics.append((alias, atomic))
+    try:
+        yield
+    finally:
+        for alias, atomic in reversed(atomics):
+            transaction.set_rollback(True, using=alias)
+            atomic.__exit__(None, None, None)
+        # Rollbacks send no signals; drop results cached during the test
+        for model in get_models().values():
+            cache.invalidate(model)
+
+
+@pytest.fixture
+def sqlorm_registry(sqlorm_db_setup) -> Iterator[None]:
+    """Unregister the models a test defines when it finishes."""
+    from . import base
+
+    before = set(base._model_registry)
+    yield
+    reset_registry(set(base._model_registry) - before)
@@ -0,0 +1,154 @@
+"""
+SQLORM Multi-Database Tests
+===========================
+
+Tests for database roles and read-replica routing.
+Run with: pytest tests/test_multi_database.py -v
+"""
+
+import os
+import tempfile
+import time
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clean_env():
+    """Reset Django for each test."""
+    import sys
+
+    mods_to_remove = [m for m in sys.modules if m.startswith(("sqlorm", "django"))]
+    for mod in mods_to_remove:
+        del sys.modules[mod]
+
+    yield
+
+
+@pytest.fixture
+def db_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+def _sqlite(path, role=None):
+    config = {"ENGINE": "django.db.backends.sqlite3", "NAME": path}
+    if role:
+        config["ROLE"] = role
+    return config
+
+
+class TestRouting:
+    """Test read/write routing between database roles."""
+
+    def test_roles(self, db_dir):
+        from sqlorm import configure, get_database_roles
+
+        primary = os.path.join(db_dir, "primary.sqlite3")
+        configure(
+            {
+                "default": _sqlite(primary),
+                "replica": _sqlite(primary, "replica"),
+                "reports": _sqlite(os.path.join(db_dir, "reports.sqlite3")),
+            }
+        )
+
+        assert get_database_roles() == {
+            "default": "primary",
+            "replica": "replica",
+            "reports": "analytics",
+        }
+
+    def test_invalid_roles(self, db_dir):
+        from sqlorm import ConfigurationError, configure
+
+        path = os.path.join(db_dir, "db.sqlite3")
+        with pytest.raises(ConfigurationError):
+            configure({"default": _sqlite(path), "other": _sqlite(path, "primary")})
+        with pytest.raises(ConfigurationError):
+            configure({"default": _sqlite(path, "leader")})
+
+    def test_reads_round_robin_and_stick_after_write(self, db_dir):
+        from django.db import router
+
+        from sqlorm import Model, configure, create_tables, fields
+
+        primary = os.path.join(db_dir, "primary.sqlite3")
+        configure(
+            {
+                "default": _sqlite(primary),
+                "r1": _sqlite(primary, "replica"),
+                "r2": _sqlite(primary, "replica"),
+            },
+            sticky_window=0.2,
+        )
+
+        class Account(Model):
+            name = fields.CharField(max_length=50)
+
+        created = create_tables(verbosity=0)
+        assert created.timings.keys() == {"default"}
+
+        reads = [router.db_for_read(Account) for _ in range(4)]
+        assert reads == ["r1", "r2", "r1", "r2"]
+
+        account = Account.objects.create(name="a")
+        assert account._state.db == "default"
+        assert router.db_for_read(Account) == "default"
+
+        time.sleep(0.25)
+        assert router.db_for_read(Account) in ("r1", "r2")
+        assert Account.objects.get(pk=account.pk).name == "a"
+
+    def test_latency_strategy_prefers_fastest_replica(self, db_dir):
+        from django.db import router
+
+        from sqlorm import Model, configure, fields
+        from sqlorm.routers import record_latency
+
+        primary = os.path.join(db_dir, "primary.sqlite3")
+        configure(
+            {
+                "default": _sqlite(primary),
+                "slow": _sqlite(primary, "replica"),
+                "fast": _sqlite(primary, "replica"),
+            },
+            read_strategy="latency",
+        )
+
+        class Ledger(Model):
+            total = fields.IntegerField(default=0)
+
+        record_latency("slow", 0.050)
+        record_latency("fast", 0.001)
+        assert router.db_for_read(Ledger) == "fast"
+
+        record_latency("fast", 0.5)
+        assert router.db_for_read(Ledger) == "slow"
+
+    def test_explicit_using_and_analytics(self, db_dir):
+        from django.db import router
+
+        from sqlorm import Model, configure, create_tables, fields
+
+        configure(
+            {
+                "default": _sqlite(os.path.join(db_dir, "primary.sqlite3")),
+                "reports": _sqlite(os.path.join(db_dir, "reports.sqlite3")),
+            }
+        )
+
+        class Metric(Model):
+            _using = "reports"
+            value = fields.IntegerField()
+
+        class User(Model):
+            name = fields.CharField(max_length=50)
+
+        created = create_tables(verbosity=0)
+        assert set(created.timings) == {"default", "reports"}
+        assert router.db_for_read(Metric) == router.db_for_write(Metric) == "reports"
+        assert router.db_for_read(User) == "default"
+
+        Metric.objects.create(value=3)
+        assert Metric.objects.get().value == 3
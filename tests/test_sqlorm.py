@@ -63,6 +63,172 @@ class TestConfiguration:
             assert get_migrations_dir() is not None
             assert os.path.exists(migrations_path)
 
+    def test_minimal_mode(self):
+        import sys
+
+        from django.apps import apps
+        from django.conf import settings
+
+        from sqlorm import Model, configure, create_tables, fields
+
+        configure(
+            {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+            minimal=True,
+        )
+        assert [app.label for app in apps.get_app_configs()] == ["sqlorm_app"]
+        assert settings.USE_I18N is False
+        assert "django.contrib.contenttypes" not in sys.modules
+        assert "django.urls" not in sys.modules
+
+        class Event(Model):
+            name = fields.CharField(max_length=50)
+
+        create_tables(verbosity=0)
+        Event.objects.create(name="start")
+        assert Event.objects.get().name == "start"
+
+    def test_sqlite_profile_and_pragmas(self):
+        from django.db import connection
+
+        from sqlorm import configure, use_sqlite_profile
+
+        def pragma(name):
+            with connection.cursor() as cursor:
+                cursor.execute(f"PRAGMA {name}")
+                return cursor.fetchone()[0]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            configure(
+                {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": os.path.join(tmpdir, "db.sqlite3"),
+                },
+                sqlite_profile="fast-wal",
+                sqlite_pragmas={"cache_size": -1024},
+            )
+
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1
+            assert pragma("cache_size") == -1024
+
+            with use_sqlite_profile("bulk-load"):
+                assert pragma("synchronous") == 0
+            assert pragma("synchronous") == 1
+
+            # New connections get the configured pragmas too
+            connection.close()
+            assert pragma("cache_size") == -1024
+            connection.close()
+
+    def test_sqlite_in_memory_mirror(self):
+        import sqlite3
+        import threading
+
+        from django.db import connection
+
+        from sqlorm import Model, configure, create_tables, fields, flush
+        from sqlorm.mirror import close_mirrors
+
+        def rows_on_disk(path):
+            with sqlite3.connect(path) as conn:
+                tables = conn.execute(
+                    "SELECT name FROM sqlite_master WHERE name = 'sqlorm_app_job'"
+                ).fetchall()
+                if not tables:
+                    return None
+                return conn.execute("SELECT COUNT(*) FROM sqlorm_app_job").fetchone()[0]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "jobs.sqlite3")
+            database = {"ENGINE": "django.db.backends.sqlite3", "NAME": path}
+            configure(database, sqlite_in_memory_mirror={"flush_interval": 0})
+            assert connection.is_in_memory_db()
+
+            class Job(Model):
+                name = fields.CharField(max_length=20)
+
+            create_tables(verbosity=0)
+            Job.objects.create(name="a")
+            # Other threads share the in-memory copy
+            counts = []
+            thread = threading.Thread(target=lambda: counts.append(Job.objects.count()))
+            thread.start()
+            thread.join()
+            assert counts == [1]
+            assert rows_on_disk(path) is None
+
+            flush()
+            assert rows_on_disk(path) == 1
+            Job.objects.create(name="b")
+            assert rows_on_disk(path) == 1
+
+            # Reconfiguring writes the old mirror back, then loads the file
+            configure(database, sqlite_in_memory_mirror=True)
+            assert rows_on_disk(path) == 2
+            Job.objects.create(name="c")
+            assert list(Job.objects.values_list("name", flat=True)) == ["a", "b", "c"]
+            close_mirrors()
+            assert rows_on_disk(path) == 3
+            connection.close()
+
+    def test_unknown_sqlite_profile(self):
+        from sqlorm import ConfigurationError, configure
+
+        with pytest.raises(ConfigurationError):
+            configure(
+                {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+                sqlite_profile="turbo",
+            )
+
+
+class TestImport:
+    """Test import cost."""
+
+    @staticmethod
+    def _import_time(module):
+        """Modules imported by ``import module`` and its cumulative time (us)."""
+        import subprocess
+        import sys
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        imported = {}
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                _, cumulative, name = line[len("import time:") :].split("|")
+                if cumulative.strip().isdigit():
+                    imported[name.strip()] = int(cumulative)
+        return imported
+
+    def test_import_sqlorm_does_not_import_django(self):
+        imported = self._import_time("sqlorm")
+        assert "sqlorm" in imported
+        assert not [name for name in imported if name.startswith("django")]
+
+        # Guard against regressions that don't pull in Django: importing
+        # sqlorm should cost a small fraction of importing the ORM itself
+        django_cost = self._import_time("django.db.models")["django.db.models"]
+        assert imported["sqlorm"] < django_cost * 0.25
+
+    def test_lazy_exports(self):
+        import sys
+
+        import sqlorm
+
+        assert "django.db.models" not in sys.modules
+        from django.db.models import Q
+
+        assert sqlorm.Q is Q
+        assert sqlorm.fields.CharField(max_length=5).max_length == 5
+        assert set(sqlorm.__all__) <= set(dir(sqlorm))
+        assert set(sqlorm._LAZY_ATTRS) <= set(sqlorm.__all__)
+        with pytest.raises(AttributeError):
+            sqlorm.does_not_exist
+
 
 class TestModels:
     """Test model definition and operations."""
@@ -83,6 +249,111 @@ class TestModels:
         assert TestModel._meta.app_label == "sqlorm_app"
         assert hasattr(TestModel, "objects")
 
+    def test_models_defined_before_configure(self):
+        from sqlorm import Model, configure, create_tables, fields
+        from sqlorm.base import _deferred_models
+
+        class Author(Model):
+            name = fields.CharField(max_length=50)
+
+        class Book(Model):
+            title = fields.CharField(max_length=50)
+            author = fields.ForeignKey(Author, on_delete=fields.CASCADE)
+
+        assert len(_deferred_models) == 2
+
+        configure({"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"})
+        assert _deferred_models == []
+        create_tables(verbosity=0)
+
+        author = Author.objects.create(name="Ann")
+        book = Book.objects.create(title="Notes", author=author)
+        assert isinstance(book, Book)
+        assert issubclass(type(book), Book)
+        # Field lookups reach the model's descriptors, not the raw fields
+        assert Book.author is type(book).author
+        assert not isinstance(Book.__dict__.get("author"), fields.ForeignKey)
+        assert Book._meta.get_field("author").related_model is type(author)
+        assert list(author.book_set.values_list("title", flat=True)) == ["Notes"]
+
+    def test_lazy_models_materialize_on_first_use(self):
+        from sqlorm import Model, configure, create_tables, fields, get_models
+        from sqlorm.base import _deferred_models
+
+        class Team(Model):
+            name = fields.CharField(max_length=50)
+            captain = fields.ForeignKey(
+                "Player", null=True, on_delete=fields.SET_NULL, related_name="+"
+            )
+
+        class Player(Model):
+            name = fields.CharField(max_length=50)
+            team = fields.ForeignKey(Team, null=True, on_delete=fields.SET_NULL)
+
+        class Unused(Model):
+            value = fields.IntegerField()
+
+        configure(
+            {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+            lazy_models=True,
+        )
+        assert len(_deferred_models) == 3
+
+        # Touching Player builds it and the Team it points to, nothing else
+        Player._meta.get_field("team")
+        assert _deferred_models == [Unused]
+
+        create_tables(verbosity=0)
+        assert _deferred_models == []
+        assert set(get_models()) == {"Team", "Player", "Unused"}
+
+        team = Team.objects.create(name="Reds")
+        player = Player(name="Bo", team=team)
+        player.save()
+        team.captain = player
+        team.save()
+        assert Team.objects.get().captain.team == team
+
+    def test_lazy_models_resolve_string_relations(self):
+        from sqlorm import Model, configure, create_tables, fields
+        from sqlorm.base import _deferred_models
+
+        class Person(Model):
+            name = fields.CharField(max_length=50)
+            company = fields.ForeignKey("Company", null=True, on_delete=fields.SET_NULL)
+            employer = fields.ForeignKey(
+                "sqlorm_app.Company",
+                null=True,
+                on_delete=fields.SET_NULL,
+                related_name="staff",
+            )
+
+        class Company(Model):
+            name = fields.CharField(max_length=50)
+            boss = fields.ForeignKey(
+                Person, null=True, on_delete=fields.SET_NULL, related_name="+"
+            )
+
+        configure(
+            {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+            lazy_models=True,
+        )
+
+        # Building Person alone also builds the Company it names by string,
+        # which points back at Person
+        person = Person(name="a")
+        assert _deferred_models == []
+        for name in ("company", "employer"):
+            assert Person._meta.get_field(name).related_model is Company._meta.model
+        assert Company._meta.get_field("boss").related_model is type(person)
+
+        create_tables(verbosity=0)
+        person.save()
+        company = Company.objects.create(name="Acme", boss=person)
+        person.company = person.employer = company
+        person.save()
+        assert Company.objects.get().boss.company == company
+
     def test_create_tables(self):
         from sqlorm import Model, configure, create_tables, fields
 
@@ -99,6 +370,31 @@ class TestModels:
         created = create_tables(verbosity=0)
         assert "sqlorm_app_item" in created
 
+    def test_create_tables_dependency_order_and_timings(self):
+        from sqlorm import Model, configure, create_tables, fields
+
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+        )
+
+        class Book(Model):
+            title = fields.CharField(max_length=100)
+            author = fields.ForeignKey("Author", on_delete=fields.CASCADE)
+
+        class Author(Model):
+            name = fields.CharField(max_length=100)
+
+        created = create_tables(verbosity=0)
+        assert created.index("sqlorm_app_author") < created.index("sqlorm_app_book")
+        assert set(created.timings["default"]) == {"introspect", "order", "create"}
+        assert created.total >= created.timings["default"]["create"]
+
+        # Existing tables are skipped on the next call
+        assert create_tables(verbosity=0) == []
+
     def test_crud_operations(self):
         from sqlorm import Model, configure, create_tables, fields
 
@@ -177,3 +473,1317 @@ class TestModels:
 
         data = json.loads(j)
         assert data["name"] == "Gadget"
+
+    def test_to_dict_fields_exclude_and_dates(self):
+        import datetime
+
+        from sqlorm import Model, configure, create_tables, fields
+        from sqlorm.serializers import get_plan
+
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+        )
+
+        class Event(Model):
+            name = fields.CharField(max_length=100)
+            day = fields.DateField(null=True)
+            starts_at = fields.DateTimeField(null=True)
+
+        create_tables(verbosity=0)
+
+        starts_at = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+        e = Event.objects.create(
+            name="Launch", day=datetime.date(2024, 1, 2), starts_at=starts_at
+        )
+
+        assert e.to_dict() == {
+            "id": e.id,
+            "name": "Launch",
+            "day": "2024-01-02",
+            "starts_at": starts_at.isoformat(),
+        }
+        assert e.to_dict(fields=["name", "day"]) == {
+            "name": "Launch",
+            "day": "2024-01-02",
+        }
+        assert list(e.to_dict(exclude=["starts_at"])) == ["id", "name", "day"]
+
+        e.day = None
+        assert e.to_dict(fields=["day"]) == {"day": None}
+
+        # Plans are built once per fields/exclude combination
+        assert get_plan(Event, exclude=["starts_at"]) is get_plan(
+            Event, exclude=["starts_at"]
+        )
+        assert get_plan(Event) is get_plan(Event, fields=[], exclude=[])
+
+    def test_queryset_to_dicts_and_json_lines(self):
+        import datetime
+        import json
+
+        from sqlorm import Model, configure, create_tables, fields
+
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+        )
+
+        class Note(Model):
+            body = fields.CharField(max_length=100)
+            day = fields.DateField(null=True)
+
+        create_tables(verbosity=0)
+
+        Note.objects.bulk_create(
+            Note(body=f"note {i}", day=datetime.date(2024, 1, i + 1)) for i in range(5)
+        )
+        qs = Note.objects.filter(day__gte=datetime.date(2024, 1, 3)).order_by("id")
+
+        rows = qs.to_dicts(exclude=["id"], chunk_size=2)
+        assert not isinstance(rows, list)
+        assert list(rows) == [obj.to_dict(exclude=["id"]) for obj in qs]
+
+        lines = list(qs.to_json_lines(fields=["body"]))
+        assert [json.loads(line) for line in lines] == [
+            {"body": "note 2"},
+            {"body": "note 3"},
+            {"body": "note 4"},
+        ]
+
+    def test_iter_chunks_keyset_pages(self):
+        from sqlorm import Model, configure, create_tables, fields, profile
+
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+        )
+
+        class Author(Model):
+            name = fields.CharField(max_length=50)
+
+        class Post(Model):
+            author = fields.ForeignKey(Author, on_delete=fields.CASCADE)
+            rank = fields.IntegerField()
+
+        create_tables(verbosity=0)
+        authors = Author.objects.bulk_create(Author(name=f"a{i}") for i in range(3))
+        Post.objects.bulk_create(
+            Post(author=authors[i % 3], rank=i % 4) for i in range(23)
+        )
+
+        chunks = list(Post.iter_chunks(size=10))
+        assert [len(chunk) for chunk in chunks] == [10, 10, 3]
+        assert [p.pk for chunk in chunks for p in chunk] == list(range(1, 24))
+
+        # Composite, partly descending key with ties broken by pk
+        expected = list(Post.objects.order_by("-rank", "pk").values("pk", "rank"))
+        chunks = list(Post.iter_chunks(key=["-rank"], size=4, values=["rank"]))
+        assert [row for chunk in chunks for row in chunk] == [
+            {"rank": row["rank"]} for row in expected
+        ]
+
+        qs = Post.objects.filter(rank__gt=0).values_list("rank", flat=True)
+        flat = [rank for chunk in Post.iter_chunks(qs, size=5) for rank in chunk]
+        assert sorted(flat) == sorted(qs)
+
+        # Prefetch runs once per chunk: 3 pages + 3 author lookups
+        with profile() as p:
+            for chunk in Post.iter_chunks(size=10, prefetch=["author"]):
+                assert all(post.author.name for post in chunk)
+        assert len(p.queries) == 6
+
+        with pytest.raises(ValueError):
+            next(Post.iter_chunks(Post.objects.all()[:5]))
+
+    def test_records(self):
+        import json
+        import pickle
+        from datetime import date
+
+        from sqlorm import Model, configure, create_tables, fields
+
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+        )
+
+        class Author(Model):
+            name = fields.CharField(max_length=50)
+
+            def __str__(self):
+                return self.name
+
+        class Book(Model):
+            title = fields.CharField(max_length=50)
+            author = fields.ForeignKey(Author, on_delete=fields.CASCADE)
+            kind = fields.IntegerField(choices=[(1, "Novel"), (2, "Essay")])
+            published = fields.DateField(null=True)
+
+        create_tables(verbosity=0)
+        author = Author.objects.create(name="Ann")
+        Book.objects.create(title="B", author=author, kind=2)
+        Book.objects.create(
+            title="A", author=author, kind=1, published=date(2020, 1, 2)
+        )
+
+        books = list(Book.records(Book.objects.order_by("title")))
+        assert [b.title for b in books] == ["A", "B"]
+        book = books[0]
+        assert (book.pk, book.author_id, book.published) == (2, 1, date(2020, 1, 2))
+        assert book.get_kind_display() == "Novel"
+        assert book.to_dict() == Book.objects.get(pk=2).to_dict()
+        assert json.loads(book.to_json())["published"] == "2020-01-02"
+        assert not hasattr(book, "__dict__")
+        with pytest.raises(AttributeError):
+            book.title = "C"
+        assert pickle.loads(pickle.dumps(book)) == book
+        assert str(next(Author.records())) == "Ann"
+
+        # The class is generated once per model and field selection
+        partial = list(Book.objects.filter(kind=2).records(fields=["title", "pk"]))
+        assert partial == [(1, "B")] and partial[0].title == "B"
+        assert type(next(Book.records())) is type(book)
+
+    def test_to_columns(self):
+        from datetime import date, datetime, timezone
+        from decimal import Decimal
+
+        from sqlorm import Model, configure, create_tables, fields
+
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+        )
+
+        class Invoice(Model):
+            priority = fields.IntegerField()
+            amount = fields.DecimalField(max_digits=8, decimal_places=2)
+            paid = fields.BooleanField(default=False)
+            due_date = fields.DateField(null=True)
+            sent_at = fields.DateTimeField(null=True)
+            note = fields.CharField(max_length=20, default="")
+
+        create_tables(verbosity=0)
+        Invoice.objects.create(
+            priority=2,
+            amount=Decimal("9.50"),
+            paid=True,
+            due_date=date(1970, 1, 3),
+            sent_at=datetime(1970, 1, 1, 0, 0, 1, tzinfo=timezone.utc),
+        )
+        Invoice.objects.create(priority=5, amount=Decimal("1.25"))
+        qs = Invoice.objects.order_by("pk")
+
+        cols = qs.to_columns(
+            ["priority", "amount", "paid", "due_date", "sent_at"], backend="array"
+        )
+        assert cols.length == 2 and set(cols.masks) == {"due_date", "sent_at"}
+        assert cols["priority"].typecode == "q" and list(cols["priority"]) == [2, 5]
+        assert list(cols["amount"]) == [9.5, 1.25]
+        assert list(cols["paid"]) == [1, 0]
+        assert cols["due_date"][0] == 2 and cols["sent_at"][0] == 1_000_000
+        assert list(cols.masks["sent_at"]) == [0, 1]
+        with pytest.raises(ValueError):
+            qs.to_columns(["note"], backend="array")
+
+        numpy = pytest.importorskip("numpy")
+        cols = qs.to_columns(["pk", "amount", "due_date", "note"], chunk_size=1)
+        assert cols["pk"].dtype == numpy.int64 and cols["pk"].tolist() == [1, 2]
+        assert cols["amount"].dtype == numpy.float64
+        assert cols["due_date"].dtype == numpy.dtype("datetime64[D]")
+        assert cols["due_date"][0] == numpy.datetime64("1970-01-03")
+        assert numpy.isnat(cols["due_date"][1])
+        assert cols.masks["due_date"].tolist() == [False, True]
+        assert cols["note"].tolist() == ["", ""]
+        assert len(qs.filter(priority=0).to_columns(["priority"])["priority"]) == 0
+
+
+class TestExport:
+    """Test streaming export."""
+
+    def test_export_ndjson_and_csv(self):
+        import csv
+        import io
+        import json
+
+        from sqlorm import Model, configure, create_tables, fields
+        from sqlorm.export import export_queryset
+
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+        )
+
+        class Row(Model):
+            label = fields.CharField(max_length=20)
+            score = fields.IntegerField(default=0)
+
+        create_tables(verbosity=0)
+        Row.objects.bulk_create(Row(label=f"r{i}", score=i % 2) for i in range(25))
+
+        # Keyset pages of 4 rows must still cover every matching row once
+        out = io.StringIO()
+        count = export_queryset(Row.objects.filter(score=1), out, chunk_size=4)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert count == 12
+        assert [r["label"] for r in rows] == [f"r{i}" for i in range(1, 25, 2)]
+
+        out = io.StringIO()
+        export_queryset(Row.objects.all(), out, format="csv", exclude=["id"])
+        lines = list(csv.reader(io.StringIO(out.getvalue())))
+        assert lines[0] == ["label", "score"]
+        assert lines[1] == ["r0", "0"]
+        assert len(lines) == 26
+
+
+class TestBulkLoad:
+    """Test the bulk loader."""
+
+    def test_copy_csv_nulls(self):
+        from sqlorm.bulk import _copy_csv
+
+        buffer = _copy_csv([(1, None, "", True), (2, 'say "hi"', "a,b", None)])
+        # Unquoted empty is NULL to COPY; quoted "" is an empty string
+        assert buffer.getvalue() == ('"1",,"","True"\n' '"2","say ""hi""","a,b",\n')
+
+    def test_copy_csv_formats_values(self):
+        import datetime
+        from decimal import Decimal
+
+        from sqlorm.bulk import _copy_csv
+
+        row = (
+            b"\x00\xff",
+            memoryview(b"ab"),
+            {"a": [1, None]},
+            ["x", None, 'q"'],
+            Decimal("1E+2"),
+            datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc),
+        )
+        assert _copy_csv([row]).getvalue() == (
+            '"\\x00ff","\\x6162","{""a"": [1, null]}","{""x"",NULL,""q\\""""}",'
+            '"100","2024-05-01T12:30:00+00:00"\n'
+        )
+
+    def test_bulk_load_converts_and_resumes(self):
+        import io
+
+        from sqlorm import (
+            BulkLoadError,
+            Model,
+            bulk_load,
+            configure,
+            create_tables,
+            fields,
+        )
+        from sqlorm.bulk import read_csv, read_ndjson
+
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+        )
+
+        class Reading(Model):
+            sensor = fields.CharField(max_length=20, unique=True)
+            value = fields.IntegerField(null=True)
+            note = fields.CharField(max_length=20, default="n/a")
+
+        create_tables(verbosity=0)
+
+        data = "sensor,value\na,1\nb,\nc,3\nd,4\n"
+        result = bulk_load(Reading, read_csv(io.StringIO(data)), batch_size=2)
+        assert (result.rows, result.batches, result.rows_done) == (4, 2, 4)
+        assert list(
+            Reading.objects.order_by("sensor").values_list("value", "note")
+        ) == [
+            (1, "n/a"),
+            (None, "n/a"),
+            (3, "n/a"),
+            (4, "n/a"),
+        ]
+
+        rows = [{"sensor": "e"}, {"sensor": "f"}, {"sensor": "a"}, {"sensor": "g"}]
+        with pytest.raises(BulkLoadError) as exc_info:
+            bulk_load(Reading, rows, batch_size=2)
+        assert exc_info.value.committed == 2
+        assert Reading.objects.count() == 6
+
+        result = bulk_load(Reading, rows[:2] + [{"sensor": "z"}, rows[3]], start=2)
+        assert result.rows == 2
+        assert Reading.objects.count() == 8
+
+        # Resuming counts rows, so blank NDJSON lines don't shift the offset
+        data = '\n{"sensor": "n1"}\n\n{"sensor": "n2"}\n{"sensor": "a"}\n'
+        with pytest.raises(BulkLoadError) as exc_info:
+            bulk_load(Reading, read_ndjson(io.StringIO(data)), batch_size=2)
+        assert exc_info.value.committed == 2
+        data = data.replace('"a"', '"n3"')
+        result = bulk_load(
+            Reading, read_ndjson(io.StringIO(data)), start=exc_info.value.committed
+        )
+        assert (result.rows, result.rows_done) == (1, 3)
+        assert Reading.objects.filter(sensor__startswith="n").count() == 3
+
+        # A misspelt header is an error rather than a column of defaults
+        with pytest.raises(ValueError, match="valeu"):
+            bulk_load(Reading, read_csv(io.StringIO("sensor,valeu\nh,1\n")))
+        with pytest.raises(BulkLoadError, match="colour"):
+            bulk_load(Reading, [{"sensor": "h"}, {"sensor": "i", "colour": "red"}])
+        assert Reading.objects.count() == 11
+
+    def test_upsert_many_inserts_and_updates(self):
+        from sqlorm import (
+            BulkLoadError,
+            Model,
+            configure,
+            create_tables,
+            fields,
+            profile,
+        )
+
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+        )
+
+        class Stock(Model):
+            warehouse = fields.CharField(max_length=10)
+            sku = fields.CharField(max_length=20)
+            qty = fields.IntegerField(default=0)
+            note = fields.CharField(max_length=20, default="")
+            updated_at = fields.DateTimeField(auto_now=True)
+
+            class Meta:
+                unique_together = [("warehouse", "sku")]
+
+        create_tables(verbosity=0)
+        Stock.objects.create(warehouse="ams", sku="a", qty=1, note="keep")
+
+        with profile() as p:
+            result = Stock.upsert_many(
+                [
+                    {"warehouse": "ams", "sku": "a", "qty": 5},
+                    {"warehouse": "ams", "sku": "b", "qty": 2},
+                    {"warehouse": "ams", "sku": "b", "qty": 3},
+                    {"warehouse": "rtm", "sku": "a", "qty": 7},
+                ],
+                unique_fields=["warehouse", "sku"],
+                batch_size=3,
+            )
+        assert (result.inserted, result.updated, result.batches) == (2, 1, 2)
+        # One multi-row statement per batch
+        inserts = [q for q in p.queries if q.sql.startswith("INSERT")]
+        assert [q.many for q in inserts] == [False, False]
+        assert list(
+            Stock.objects.order_by("warehouse", "sku").values_list(
+                "warehouse", "sku", "qty", "note"
+            )
+        ) == [("ams", "a", 5, "keep"), ("ams", "b", 3, ""), ("rtm", "a", 7, "")]
+
+        stock = Stock.objects.get(warehouse="rtm")
+        stock.qty = 0
+        result = Stock.upsert_many(
+            [stock, Stock(warehouse="rtm", sku="c", qty=1)],
+            unique_fields=["warehouse", "sku"],
+        )
+        assert (result.inserted, result.updated) == (1, 1)
+        result = Stock.upsert_many(
+            [("ams", "a", 9)],
+            unique_fields=["warehouse", "sku"],
+            update_fields=["qty"],
+            fields=["warehouse", "sku", "qty"],
+        )
+        assert (result.inserted, result.updated) == (0, 1)
+        assert dict(
+            Stock.objects.values_list("sku", "qty").filter(warehouse="rtm")
+        ) == {
+            "a": 0,
+            "c": 1,
+        }
+        assert Stock.objects.get(warehouse="ams", sku="a").qty == 9
+        assert Stock.objects.count() == 4
+
+        # A row leaving out a field would reset it to its default
+        with pytest.raises(BulkLoadError) as exc_info:
+            Stock.upsert_many(
+                [
+                    {"warehouse": "ams", "sku": "a", "qty": 1, "note": "x"},
+                    {"warehouse": "ams", "sku": "b", "qty": 1},
+                ],
+                unique_fields=["warehouse", "sku"],
+            )
+        assert "differ" in str(exc_info.value)
+        assert exc_info.value.committed == 0
+        assert Stock.objects.get(warehouse="ams", sku="a").note == "keep"
+
+        with pytest.raises(ValueError, match="qyt"):
+            Stock.upsert_many(
+                [{"warehouse": "ams", "sku": "a", "qty": 1}],
+                unique_fields=["warehouse", "sku"],
+                update_fields=["qyt"],
+            )
+        with pytest.raises(ValueError, match="colour"):
+            Stock.upsert_many(
+                [{"warehouse": "ams", "sku": "a", "colour": "red"}],
+                unique_fields=["warehouse", "sku"],
+            )
+
+    def test_upsert_many_with_nothing_to_update(self):
+        from sqlorm import Model, configure, create_tables, fields
+
+        configure({"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"})
+
+        class Tag(Model):
+            name = fields.CharField(max_length=20, unique=True)
+            uses = fields.IntegerField(default=0)
+
+        create_tables(verbosity=0)
+        Tag.objects.create(name="x", uses=5)
+
+        # Rows of only the key insert the new ones and leave the rest alone
+        result = Tag.upsert_many([{"name": "x"}, {"name": "y"}], unique_fields=["name"])
+        assert (result.inserted, result.updated) == (1, 0)
+        result = Tag.upsert_many(
+            [("y",), ("z",)], unique_fields=["name"], fields=["name"]
+        )
+        assert (result.inserted, result.updated) == (1, 0)
+        result = Tag.upsert_many(
+            [{"name": "x", "uses": 1}, {"name": "w", "uses": 1}],
+            unique_fields=["name"],
+            update_fields=[],
+        )
+        assert (result.inserted, result.updated) == (1, 0)
+        assert dict(Tag.objects.values_list("name", "uses")) == {
+            "x": 5,
+            "y": 0,
+            "z": 0,
+            "w": 1,
+        }
+
+
+class TestBackfill:
+    """Test batched backfills."""
+
+    def test_backfill_batches_and_resumes(self):
+        import io
+
+        from sqlorm import (
+            BackfillError,
+            Model,
+            configure,
+            create_tables,
+            fields,
+            run_backfill,
+        )
+        from sqlorm.export import Progress
+
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+        )
+
+        class Ticket(Model):
+            status = fields.CharField(max_length=20, null=True)
+            score = fields.IntegerField(default=0)
+
+        create_tables(verbosity=0)
+        Ticket.objects.bulk_create(
+            [Ticket(status=None if i % 2 else "open", score=i) for i in range(25)]
+        )
+
+        stream = io.StringIO()
+        progress = Progress("rows", stream=stream, interval=0)
+        result = run_backfill(
+            Ticket,
+            values={"status": "new"},
+            where={"status__isnull": True},
+            batch_size=5,
+            progress=progress,
+        )
+        assert (result.rows, result.batches) == (12, 3)
+        assert progress.total == 12
+        assert "12/12 rows (100%" in stream.getvalue()
+        assert Ticket.objects.filter(status="new").count() == 12
+
+        def double(batch):
+            if batch.filter(score=17).exists():
+                raise RuntimeError("boom")
+            for ticket in batch:
+                ticket.score *= 2
+                ticket.save(update_fields=["score"])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            checkpoint = os.path.join(tmpdir, "ticket.json")
+            with pytest.raises(BackfillError) as exc_info:
+                run_backfill(
+                    Ticket, function=double, batch_size=5, checkpoint=checkpoint
+                )
+            assert exc_info.value.last_pk == 15
+            assert os.path.exists(checkpoint)
+            assert Ticket.objects.get(pk=15).score == 28
+            assert Ticket.objects.get(pk=16).score == 15
+
+            # Resume after the last committed batch
+            result = run_backfill(
+                Ticket,
+                values={"score": 0},
+                batch_size=5,
+                checkpoint=checkpoint,
+            )
+            assert (result.resumed_from, result.rows, result.last_pk) == (15, 10, 25)
+            assert not os.path.exists(checkpoint)
+            assert Ticket.objects.filter(score=0).count() == 11
+
+    def test_run_backfill_operation(self):
+        from django.core.management import call_command
+
+        from sqlorm import Model, configure, fields
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            migrations_dir = os.path.join(tmpdir, "migrations")
+            configure(
+                {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": os.path.join(tmpdir, "test.db"),
+                },
+                migrations_dir=migrations_dir,
+            )
+
+            class Article(Model):
+                title = fields.CharField(max_length=50)
+
+            call_command("makemigrations", "sqlorm_app", verbosity=0)
+            call_command("migrate", verbosity=0)
+            Article.objects.bulk_create([Article(title=f"a{i}") for i in range(7)])
+
+            with open(os.path.join(migrations_dir, "0002_backfill.py"), "w") as f:
+                f.write(
+                    "from django.db import migrations, models\n"
+                    "from sqlorm.backfill import RunBackfill\n\n\n"
+                    "class Migration(migrations.Migration):\n"
+                    "    atomic = False\n"
+                    "    dependencies = [('sqlorm_app', '0001_initial')]\n"
+                    "    operations = [\n"
+                    "        RunBackfill(\n"
+                    "            'article',\n"
+                    "            values={'title': models.functions.Upper('title')},\n"
+                    "            batch_size=3,\n"
+                    "        )\n"
+                    "    ]\n"
+                )
+            call_command("migrate", verbosity=0)
+            assert list(Article.objects.values_list("title", flat=True)) == [
+                f"A{i}" for i in range(7)
+            ]
+
+    def test_backfill_invalidates_cache(self):
+        from django.db import connection
+
+        from sqlorm import Model, configure, create_tables, fields, run_backfill
+
+        configure({"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"})
+
+        class Cfg(Model):
+            value = fields.IntegerField()
+
+            class Meta:
+                cache = {"ttl": 300}
+
+        create_tables(verbosity=0)
+        cfg = Cfg.objects.create(value=1)
+        assert Cfg.objects.get(pk=cfg.pk).value == 1
+
+        run_backfill(Cfg, values={"value": 99})
+        assert Cfg.objects.get(pk=cfg.pk).value == 99
+
+        def raw_update(batch):
+            with connection.cursor() as cursor:
+                cursor.execute(f"UPDATE {Cfg._meta.db_table} SET value = 7")
+
+        run_backfill(Cfg, function=raw_update)
+        assert Cfg.objects.get(pk=cfg.pk).value == 7
+
+
+class TestParallelMap:
+    """Test the process-pool parallel map."""
+
+    @pytest.mark.skipif(
+        "fork" not in __import__("multiprocessing").get_all_start_methods(),
+        reason="needs the fork start method",
+    )
+    def test_parallel_map_pk_ranges(self):
+        from django.db import transaction
+
+        from sqlorm import (
+            ConfigurationError,
+            Model,
+            configure,
+            create_tables,
+            fields,
+            parallel_map,
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            configure(
+                {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": os.path.join(tmpdir, "test.db"),
+                }
+            )
+
+            class Doc(Model):
+                body = fields.CharField(max_length=20)
+
+            create_tables(verbosity=0)
+            Doc.objects.bulk_create(Doc(body=f"doc {i}") for i in range(50))
+            Doc.objects.filter(pk__in=[3, 4, 5]).delete()
+
+            def work(doc):
+                return doc.pk, os.getpid(), doc.body.upper()
+
+            results = list(
+                parallel_map(
+                    Doc.objects.filter(pk__gt=1),
+                    work,
+                    workers=2,
+                    chunk_size=7,
+                    ordered=True,
+                    start_method="fork",
+                )
+            )
+            assert [pk for pk, _, _ in results] == list(
+                Doc.objects.filter(pk__gt=1).values_list("pk", flat=True)
+            )
+            assert os.getpid() not in {pid for _, pid, _ in results}
+            assert results[0][2] == "DOC 1"
+
+            batches = list(
+                parallel_map(
+                    Doc.objects.values("pk", "body"),
+                    lambda rows: [len(rows)],
+                    chunk_size=20,
+                    batch=True,
+                    start_method="fork",
+                )
+            )
+            assert sorted(batches) == [7, 20, 20]
+            # The parent's connection still works after the workers are gone
+            assert Doc.objects.count() == 47
+
+            with transaction.atomic():
+                with pytest.raises(ConfigurationError):
+                    next(parallel_map(Doc.objects.all(), work, start_method="fork"))
+
+    def test_parallel_map_spawn(self):
+        import sys
+        import textwrap
+        import threading
+
+        from sqlorm import configure, create_tables, parallel_map
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "spawn_docs.py"), "w") as f:
+                f.write(textwrap.dedent("""
+                        from sqlorm import Model, fields
+
+                        class Doc(Model):
+                            body = fields.CharField(max_length=20)
+
+                        def work(doc):
+                            return doc.pk, doc.body.upper()
+                        """))
+            configure(
+                {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": os.path.join(tmpdir, "test.db"),
+                }
+            )
+            sys.path.insert(0, tmpdir)
+            try:
+                from spawn_docs import Doc, work
+
+                create_tables(verbosity=0)
+                Doc.objects.bulk_create(Doc(body=f"doc {i}") for i in range(30))
+
+                results = []
+                queryset = Doc.objects.filter(pk__gt=10)
+                runner = threading.Thread(
+                    target=lambda: results.extend(
+                        parallel_map(
+                            queryset,
+                            work,
+                            workers=2,
+                            chunk_size=8,
+                            ordered=True,
+                            start_method="spawn",
+                        )
+                    ),
+                    daemon=True,
+                )
+                runner.start()
+                runner.join(timeout=60)
+                assert not runner.is_alive(), "parallel_map hung with spawn"
+                assert results == [(pk, f"DOC {pk - 1}") for pk in range(11, 31)]
+            finally:
+                sys.path.remove(tmpdir)
+                sys.modules.pop("spawn_docs", None)
+
+
+class TestSnapshot:
+    """Test memory-mapped lookup snapshots."""
+
+    def test_build_open_and_refresh(self):
+        from datetime import date
+
+        from sqlorm import (
+            Model,
+            Snapshot,
+            SnapshotError,
+            build_snapshot,
+            configure,
+            create_tables,
+            fields,
+        )
+
+        configure(
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            }
+        )
+
+        class Country(Model):
+            code = fields.CharField(max_length=3, unique=True)
+            name = fields.CharField(max_length=50)
+            joined = fields.DateField(null=True)
+
+        create_tables(verbosity=0)
+        for code in ["FR", "DE", "ÉS", "DK", "AT"]:
+            Country.objects.create(
+                code=code, name=code.lower(), joined=date(1995, 1, 1)
+            )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "country.snapshot")
+            result = build_snapshot(Country, "code", path)
+            assert result.rows == 5 and result.changed
+            assert not build_snapshot(Country, "code", path).changed
+
+            snapshot = Snapshot.open(path)
+            assert snapshot.version == result.version and len(snapshot) == 5
+            assert snapshot.get("FR") == {
+                "id": 1,
+                "code": "FR",
+                "name": "fr",
+                "joined": "1995-01-01",
+            }
+            assert snapshot.get("XX") is None and "DK" in snapshot
+            assert list(snapshot) == ["AT", "DE", "DK", "FR", "ÉS"]
+            assert [key for key, _ in snapshot.range("D", "F")] == ["DE", "DK"]
+
+            # A rebuild replaces the file; the open snapshot picks it up
+            Country.objects.filter(code="FR").update(name="France")
+            assert build_snapshot(Country, "code", path).changed
+            assert snapshot["FR"]["name"] == "fr"
+            assert snapshot.refresh() and snapshot["FR"]["name"] == "France"
+            assert not snapshot.refresh()
+            snapshot.close()
+
+            ids = os.path.join(tmpdir, "ids.snapshot")
+            build_snapshot(Country, "pk", ids, fields=["code"])
+            with Snapshot.open(ids) as by_id:
+                assert by_id[2] == {"code": "DE"}
+                assert [key for key, _ in by_id.range(4)] == [4, 5]
+
+            with pytest.raises(ValueError):
+                build_snapshot(Country, "name", path)
+            with pytest.raises(SnapshotError):
+                Snapshot.open(os.path.join(tmpdir, "missing.snapshot"))
+
+
+class TestConnectionPool:
+    """Test connection pooling."""
+
+    def test_pool_limits_and_timeout(self):
+        import sqlite3
+
+        from sqlorm import PoolTimeout
+        from sqlorm.pool import ConnectionPool
+
+        pool = ConnectionPool(
+            lambda: sqlite3.connect(":memory:", check_same_thread=False),
+            max_size=2,
+            timeout=0.05,
+        )
+        a = pool.getconn()
+        b = pool.getconn()
+        with pytest.raises(PoolTimeout):
+            pool.getconn()
+
+        pool.putconn(a)
+        assert pool.getconn() is a
+
+        pool.putconn(b, discard=True)
+        stats = pool.stats()
+        assert stats["creations"] == 2
+        assert stats["checkouts"] == 3
+        assert stats["waits"] == 1
+        assert stats["timeouts"] == 1
+        assert (stats["size"], stats["in_use"]) == (1, 1)
+
+    def test_sqlite_pool_shared_across_threads(self):
+        import threading
+
+        from django.db import connection
+
+        from sqlorm import (
+            Model,
+            configure,
+            connection_scope,
+            create_tables,
+            fields,
+            pool_stats,
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            configure(
+                {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": os.path.join(tmpdir, "db.sqlite3"),
+                },
+                pool={"max_size": 2},
+            )
+
+            class Job(Model):
+                n = fields.IntegerField()
+
+            create_tables(verbosity=0)
+            connection.close()
+
+            def work(i):
+                for _ in range(10):
+                    with connection_scope():
+                        Job.objects.create(n=i)
+
+            threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            assert Job.objects.count() == 40
+            stats = pool_stats()["default"]
+            assert stats["creations"] <= 2
+            assert stats["checkouts"] >= 40
+            connection.close()
+
+    def test_sqlite_pool_survives_reconfigure(self):
+        from django.db import connection
+
+        from sqlorm import Model, configure, create_tables, fields
+        from sqlorm.pool import get_pool
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            database = {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": os.path.join(tmpdir, "db.sqlite3"),
+            }
+            configure(database, pool={"max_size": 2})
+
+            class P(Model):
+                n = fields.IntegerField()
+
+            create_tables(verbosity=0)
+            assert P.objects.count() == 0
+
+            # Closes the pool while this thread's connection is still open
+            configure(database, pool={"max_size": 2})
+            connection.close()
+            assert get_pool("default") is None
+            P.objects.create(n=1)
+            assert P.objects.count() == 1
+            assert get_pool("default").stats()["checkouts"] >= 1
+            connection.close()
+
+
+class TestAsync:
+    """Test the asyncio API."""
+
+    def test_aio_queries_atomic_and_stream(self):
+        import asyncio
+
+        from sqlorm import Model, aio, configure, create_tables, fields
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            configure(
+                {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": os.path.join(tmpdir, "db.sqlite3"),
+                }
+            )
+
+            class Note(Model):
+                title = fields.CharField(max_length=50)
+                rank = fields.IntegerField(default=0)
+
+            create_tables(verbosity=0)
+            aio.set_workers(2)
+
+            async def scenario():
+                await aio.bulk_create([Note(title=f"n{i}", rank=i) for i in range(25)])
+                assert await Note.aio.count() == 25
+                note = await Note.aio.get(title="n3")
+                assert note.rank == 3
+
+                counts = await asyncio.gather(
+                    *(Note.aio.filter(rank__gte=i).count() for i in range(5))
+                )
+                assert counts == [25, 24, 23, 22, 21]
+
+                async with aio.atomic():
+                    await Note.aio.create(title="kept")
+                with pytest.raises(RuntimeError):
+                    async with aio.atomic():
+                        await Note.aio.create(title="rolled back")
+                        raise RuntimeError("abort")
+                assert await Note.aio.filter(title="kept").exists()
+                assert not await Note.aio.filter(title="rolled back").exists()
+
+                ranks = [
+                    n.rank async for n in Note.aio.order_by("rank").stream(chunk_size=4)
+                ]
+                assert ranks[:3] == [0, 0, 1]
+                assert len(ranks) == 26
+
+            try:
+                asyncio.run(scenario())
+            finally:
+                aio.shutdown()
+
+
+class TestProfiler:
+    """Test the query profiler."""
+
+    def test_profile_groups_and_flags_n_plus_one(self):
+        import io
+
+        import sqlorm
+        from sqlorm import Model, configure, create_tables, fields
+
+        configure({"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"})
+
+        class Author(Model):
+            name = fields.CharField(max_length=50)
+
+        class Book(Model):
+            title = fields.CharField(max_length=50)
+            author = fields.ForeignKey(Author, on_delete=fields.CASCADE)
+
+        create_tables(verbosity=0)
+        authors = [Author.objects.create(name=f"a{i}") for i in range(12)]
+        for author in authors:
+            Book.objects.create(title=f"b-{author.name}", author=author)
+
+        out = io.StringIO()
+        with sqlorm.profile(output=out, record_params=True) as p:
+            names = [book.author.name for book in Book.objects.all()]
+            list(Author.objects.filter(pk__in=[1, 2, 3]))
+            list(Author.objects.filter(pk__in=[4, 5]))
+
+        assert len(names) == 12
+        assert len(p.queries) == 15
+        assert all(q.site[0] == __file__ for q in p.queries)
+        assert p.queries[1].params == (1,)
+
+        groups = p.groups()
+        assert sorted(g.count for g in groups) == [1, 2, 12]
+        assert any("IN (...)" in g.shape and g.count == 2 for g in groups)
+
+        suspects = p.n_plus_one()
+        assert len(suspects) == 1
+        group, site, count = suspects[0]
+        assert count == 12 and "sqlorm_app_author" in group.shape
+        assert "N+1 suspects:" in out.getvalue()
+        assert "15 queries" in out.getvalue()
+
+        # Only the latest records are kept, without parameters by default;
+        # groups still cover every query
+        with sqlorm.profile(max_records=4) as p:
+            for book in Book.objects.all():
+                book.author.name
+        assert p.count == 13 and len(p.queries) == 4
+        assert all(q.params is None for q in p.queries)
+        group = next(g for g in p.groups() if g.count == 12)
+        assert group.sample is not None and group.sample.duration == group.max
+        assert sum(group.site_time.values()) == pytest.approx(group.total)
+        assert p.total_time >= group.total
+        assert p.by_alias() == {"default": 13}
+
+
+class TestQueryCache:
+    """Test the model query cache."""
+
+    def test_cache_hits_invalidation_and_eviction(self):
+        from sqlorm import Model, cache_stats, configure, create_tables, fields, profile
+
+        configure({"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"})
+
+        class Country(Model):
+            code = fields.CharField(max_length=2, unique=True)
+            name = fields.CharField(max_length=50)
+
+            class Meta:
+                cache = {"ttl": 60, "max_entries": 3}
+
+        class City(Model):
+            name = fields.CharField(max_length=50)
+            country = fields.ForeignKey(Country, on_delete=fields.CASCADE)
+
+        create_tables(verbosity=0)
+        # Only cached models route Django's base manager through SQLORM, so
+        # other models' migration state is untouched
+        assert Country._meta.base_manager_name == "objects"
+        assert City._meta.base_manager_name is None
+        nl = Country.objects.create(code="NL", name="Netherlands")
+        Country.objects.create(code="BE", name="Belgium")
+        City.objects.create(name="Utrecht", country=nl)
+
+        with profile() as p:
+            first = Country.objects.get(code="NL")
+            first.name = "changed locally"
+            second = Country.objects.get(code="NL")
+        assert len(p.queries) == 1
+        assert second.name == "Netherlands"
+        stats = cache_stats()["Country"]
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+        Country.objects.filter(code="NL").update(name="Holland")
+        assert Country.objects.get(code="NL").name == "Holland"
+        # Writes through Django's base manager invalidate as well
+        Country._base_manager.filter(code="NL").update(name="Holland!")
+        assert Country.objects.get(code="NL").name == "Holland!"
+        second.name = "Nederland"
+        second.save()
+        assert Country.objects.get(code="NL").name == "Nederland"
+        Country.objects.bulk_create([Country(code="DE", name="Germany")])
+        assert Country.objects.count() == 3
+        assert [c.code for c in Country.objects.order_by("code")] == ["BE", "DE", "NL"]
+
+        # Joins are never cached
+        with profile() as p:
+            for _ in range(2):
+                list(Country.objects.filter(city__name="Utrecht"))
+        assert len(p.queries) == 2
+
+        for code in ("BE", "DE", "NL", "BE"):
+            Country.objects.get(code=code)
+        stats = cache_stats()["Country"]
+        assert stats["evictions"] >= 1
+        assert stats["size"] == 3
+        assert stats["invalidations"] >= 3
+
+    def test_sqlite_file_backend(self, monkeypatch):
+        import stat
+
+        from sqlorm import Model, cache_stats, configure, create_tables, fields
+        from sqlorm.cache import cache_key
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monkeypatch.setenv("XDG_CACHE_HOME", tmpdir)
+            db_path = os.path.join(tmpdir, "db.sqlite3")
+            configure({"ENGINE": "django.db.backends.sqlite3", "NAME": db_path})
+
+            class Flag(Model):
+                name = fields.CharField(max_length=50)
+
+                class Meta:
+                    cache = {"backend": "sqlite-file"}
+
+            # The default file is private to the user
+            default = os.path.join(tmpdir, "sqlorm", "cache.sqlite3")
+            assert stat.S_IMODE(os.stat(default).st_mode) == 0o600
+            assert stat.S_IMODE(os.stat(os.path.dirname(default)).st_mode) == 0o700
+            # Entries are tied to the database file, not just the model name
+            assert db_path in cache_key(Flag.objects.filter(name="x"))[1]
+
+            class Setting(Model):
+                key = fields.CharField(max_length=50, unique=True)
+                value = fields.CharField(max_length=50)
+
+                class Meta:
+                    cache = {
+                        "backend": "sqlite-file",
+                        "path": os.path.join(tmpdir, "cache.sqlite3"),
+                    }
+
+            create_tables(verbosity=0)
+            Setting.objects.create(key="mode", value="fast")
+            assert Setting.objects.get(key="mode").value == "fast"
+            assert Setting.objects.get(key="mode").value == "fast"
+            assert list(Setting.objects.values_list("value", flat=True)) == ["fast"]
+            Setting.objects.filter(key="mode").delete()
+            assert not list(Setting.objects.filter(key="mode"))
+            stats = cache_stats(Setting)["Setting"]
+            assert stats["hits"] == 1
+            assert stats["backend"] == "sqlite-file"
+
+
+class TestSchemaFingerprint:
+    """Test ensure_schema()."""
+
+    def test_ensure_schema_skips_when_unchanged(self):
+        import sys
+
+        from sqlorm import Model, configure, ensure_schema, fields
+        from sqlorm.schema import (
+            FINGERPRINT_FILE,
+            compute_fingerprint,
+            read_db_fingerprint,
+            write_db_fingerprint,
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            migrations = os.path.join(tmpdir, "schema_migrations")
+            configure(
+                {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": os.path.join(tmpdir, "db.sqlite3"),
+                },
+                migrations_dir=migrations,
+            )
+
+            class Ticket(Model):
+                title = fields.CharField(max_length=50)
+
+            try:
+                assert ensure_schema() is True
+                assert os.path.exists(os.path.join(migrations, "0001_initial.py"))
+                fingerprint = compute_fingerprint()
+                assert read_db_fingerprint() == fingerprint
+                with open(os.path.join(migrations, FINGERPRINT_FILE)) as f:
+                    assert f.read().strip() == fingerprint
+
+                Ticket.objects.create(title="t")
+                assert ensure_schema() is False
+
+                # A new model changes the fingerprint and gets a migration
+                class Comment(Model):
+                    ticket = fields.ForeignKey(Ticket, on_delete=fields.CASCADE)
+
+                assert compute_fingerprint() != fingerprint
+                assert ensure_schema() is True
+                assert (
+                    len([n for n in os.listdir(migrations) if n.startswith("000")]) == 2
+                )
+                Comment.objects.create(ticket=Ticket.objects.get())
+
+                # A stale database copy alone forces the full path
+                write_db_fingerprint("stale")
+                assert ensure_schema() is True
+                assert ensure_schema() is False
+
+                # So does editing an existing migration
+                with open(os.path.join(migrations, "0001_initial.py"), "a") as f:
+                    f.write("# edited\n")
+                assert ensure_schema() is True
+                assert ensure_schema() is False
+            finally:
+                sys.path.remove(tmpdir)
+                sys.modules.pop("schema_migrations", None)
+
+
+class TestTestingPlugin:
+    """Test the sqlorm.testing pytest plugin."""
+
+    def test_plugin_rolls_back_and_resets_registry(self):
+        import subprocess
+        import sys
+        import textwrap
+
+        files = {
+            "pytest.ini": """
+                [pytest]
+                sqlorm_models = shop_models
+            """,
+            "conftest.py": """
+                pytest_plugins = ["sqlorm.testing"]
+            """,
+            "shop_models.py": """
+                from sqlorm import Model, fields
+
+                class Item(Model):
+                    name = fields.CharField(max_length=20)
+            """,
+            "test_shop.py": """
+                import pytest
+                from django.db import transaction
+                from shop_models import Item
+
+                @pytest.mark.parametrize("n", range(3))
+                def test_rollback(sqlorm_db, n):
+                    assert Item.objects.count() == 0
+                    Item.objects.create(name=str(n))
+                    with pytest.raises(ValueError):
+                        with transaction.atomic():
+                            Item.objects.create(name="inner")
+                            raise ValueError
+                    assert list(Item.objects.values_list("name", flat=True)) == [
+                        str(n)
+                    ]
+
+                @pytest.mark.parametrize("field", ["a", "b"])
+                def test_registry(sqlorm_registry, field):
+                    from sqlorm import Model, fields
+                    from sqlorm.base import get_models
+
+                    assert "Temp" not in get_models()
+                    Temp = type(
+                        "Temp",
+                        (Model,),
+                        {"__module__": __name__, field: fields.IntegerField()},
+                    )
+                    assert [f.name for f in Temp._meta.fields] == ["id", field]
+
+                def test_reset_registry():
+                    from sqlorm.app import models
+                    from sqlorm.base import get_models
+                    from sqlorm.testing import reset_registry
+
+                    reset_registry(["Item"])
+                    assert "Item" not in get_models()
+                    assert not hasattr(models, "Item")
+            """,
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, content in files.items():
+                with open(os.path.join(tmpdir, name), "w") as f:
+                    f.write(textwrap.dedent(content))
+            repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            result = subprocess.run(
+                [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider"],
+                cwd=tmpdir,
+                env={**os.environ, "PYTHONPATH": os.pathsep.join([repo, tmpdir])},
+                capture_output=True,
+                text=True,
+            )
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "6 passed" in result.stdout